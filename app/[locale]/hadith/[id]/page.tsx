@@ -1,8 +1,10 @@
 import fs from 'fs';
 import path from 'path';
+import { createHash } from 'crypto';
+import { cache } from 'react';
 import { Metadata } from 'next';
 import { notFound } from 'next/navigation';
-import { Book, Network, ChevronDown, Share2, Copy } from 'lucide-react';
+import { Book, Network, ChevronDown, Share2, Copy, Layers, Sparkles } from 'lucide-react';
 import { Button } from '@/components/ui/button';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
@@ -16,6 +18,14 @@ interface Narrator {
   death_year: string;
 }
 
+// Near-duplicate matns found by scripts/hadith_parallels.py
+interface Parallel {
+  id: string;
+  source: string;
+  hadith_no: string;
+  similarity: number;
+}
+
 interface Hadith {
   id: string;
   book: string;
@@ -25,11 +35,71 @@ interface Hadith {
   matn: string;
   matn_en: string;
   narrators: Narrator[];
+  parallel_cluster?: string | null;
+  parallels?: Parallel[];
+  related?: string[];
+}
+
+// Binary id -> (offset, length) table over hadith-records.ndjson, written by
+// scripts/hadith_lookup.py. Loaded once per server process (~16 bytes/hadith).
+interface HadithLookupTable {
+  keys: BigUint64Array;
+  offsets: Uint32Array;
+  lengths: Uint32Array;
+}
+
+let lookupTable: HadithLookupTable | null = null;
+
+function loadLookupTable(): HadithLookupTable | null {
+  if (lookupTable) return lookupTable;
+  const tablePath = path.join(process.cwd(), 'public/data/hadith-records.idx');
+  if (!fs.existsSync(tablePath)) return null;
+
+  const buf = fs.readFileSync(tablePath);
+  if (buf.toString('latin1', 0, 4) !== 'HDX1') return null;
+  const count = buf.readUInt32LE(4);
+  // Copy the arrays into a fresh, 8-byte aligned ArrayBuffer
+  const body = new Uint8Array(buf.buffer, buf.byteOffset + 8, count * 16).slice();
+  lookupTable = {
+    keys: new BigUint64Array(body.buffer, 0, count),
+    offsets: new Uint32Array(body.buffer, count * 8, count),
+    lengths: new Uint32Array(body.buffer, count * 12, count),
+  };
+  return lookupTable;
 }
 
-async function getHadithData(id: string): Promise<Hadith | null> {
-  const filePath = path.join(process.cwd(), 'public/data/hadith-index.json');
+function lookupHadith(id: string): Hadith | null | undefined {
+  const table = loadLookupTable();
+  if (!table) return undefined;
+
+  const key = createHash('sha256').update(id).digest().readBigUInt64LE(0);
+  let lo = 0;
+  let hi = table.keys.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (table.keys[mid] < key) lo = mid + 1;
+    else hi = mid;
+  }
+  if (lo === table.keys.length || table.keys[lo] !== key) return null;
+
+  const record = Buffer.alloc(table.lengths[lo]);
+  const fd = fs.openSync(path.join(process.cwd(), 'public/data/hadith-records.ndjson'), 'r');
   try {
+    fs.readSync(fd, record, 0, record.length, table.offsets[lo]);
+  } finally {
+    fs.closeSync(fd);
+  }
+  const hadith: Hadith = JSON.parse(record.toString('utf8'));
+  return hadith.id === id ? hadith : null;
+}
+
+const getHadithData = cache(async (id: string): Promise<Hadith | null> => {
+  try {
+    const indexed = lookupHadith(id);
+    if (indexed !== undefined) return indexed;
+
+    // Fallback when the lookup artifacts have not been generated
+    const filePath = path.join(process.cwd(), 'public/data/hadith-index.json');
     if (fs.existsSync(filePath)) {
         const fileContents = fs.readFileSync(filePath, 'utf8');
         const hadiths: Hadith[] = JSON.parse(fileContents);
@@ -39,7 +109,7 @@ async function getHadithData(id: string): Promise<Hadith | null> {
     console.error("Failed to load hadith index", e);
   }
   return null;
-}
+});
 
 interface PageProps {
   params: Promise<{ id: string; locale: string }>;
@@ -108,6 +178,11 @@ export default async function HadithPage({ params }: PageProps) {
 
   if (!data) notFound();
 
+  // TF-IDF neighbours from scripts/hadith_related.py, each an O(1) record lookup
+  const related = (data.related || [])
+    .map((relatedId) => lookupHadith(relatedId))
+    .filter((hadith): hadith is Hadith => Boolean(hadith));
+
   // JSON-LD Structured Data for SEO
   const jsonLd = {
     "@context": "https://schema.org",
@@ -182,6 +257,64 @@ export default async function HadithPage({ params }: PageProps) {
                 )}
               </CardContent>
             </Card>
+
+            {data.parallels && data.parallels.length > 0 && (
+              <Card className="mb-8">
+                <CardHeader>
+                  <CardTitle className="flex items-center gap-2 text-lg">
+                    <Layers className="w-4 h-4 text-amber-500" />
+                    Parallel Narrations ({data.parallels.length})
+                  </CardTitle>
+                </CardHeader>
+                <CardContent>
+                  <div className="max-h-[400px] overflow-y-auto pr-2 space-y-2">
+                    {data.parallels.map((parallel) => (
+                      <Link
+                        key={parallel.id}
+                        href={`/${locale}/hadith/${parallel.id}`}
+                        className="flex items-center justify-between p-3 rounded-lg transition-all duration-200 group border border-transparent hover:border-border hover:bg-accent/50"
+                      >
+                        <span className="font-medium group-hover:text-primary transition-colors">
+                          {parallel.source} #{parallel.hadith_no}
+                        </span>
+                        <Badge variant="outline" className="text-xs font-normal text-muted-foreground">
+                          {Math.round(parallel.similarity * 100)}% similar
+                        </Badge>
+                      </Link>
+                    ))}
+                  </div>
+                </CardContent>
+              </Card>
+            )}
+
+            {related.length > 0 && (
+              <Card className="mb-8">
+                <CardHeader>
+                  <CardTitle className="flex items-center gap-2 text-lg">
+                    <Sparkles className="w-4 h-4 text-blue-500" />
+                    Related Hadiths
+                  </CardTitle>
+                </CardHeader>
+                <CardContent>
+                  <div className="space-y-2">
+                    {related.map((hadith) => (
+                      <Link
+                        key={hadith.id}
+                        href={`/${locale}/hadith/${hadith.id}`}
+                        className="block p-3 rounded-lg transition-all duration-200 group border border-transparent hover:border-border hover:bg-accent/50"
+                      >
+                        <span className="font-medium group-hover:text-primary transition-colors">
+                          {hadith.book} #{hadith.hadith_no}
+                        </span>
+                        <p className="text-sm text-muted-foreground line-clamp-2 mt-1">
+                          {hadith.matn_en || hadith.matn}
+                        </p>
+                      </Link>
+                    ))}
+                  </div>
+                </CardContent>
+              </Card>
+            )}
           </div>
         </div>
       </section>
@@ -5,6 +5,7 @@ import { useTranslations, useLocale } from "next-intl";
 import { useRouter } from "next/navigation";
 import { motion } from "framer-motion";
 import { useScholarLoader } from "@/components/providers/ScholarLoaderProvider";
+import { fetchArtifact } from "@/lib/artifacts";
 import Navigation from "@/components/layout/Navigation";
 import PWAInstallButton from "@/components/PWAInstallButton";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
@@ -38,7 +39,7 @@ export default function Home() {
 
   useEffect(() => {
     // Load pre-calculated statistics
-    fetch("/data/stats.json")
+    fetchArtifact("data/stats.json")
       .then(res => res.json())
       .then((data) => {
         setStats(data);
@@ -2,15 +2,17 @@
 
 import { useEffect, useState } from 'react';
 import Link from 'next/link';
+import { useLocale } from 'next-intl';
 import ScholarProfile from '@/components/features/ScholarProfile';
+import { fetchLocalizedScholar } from '@/lib/localizedData';
 
 interface ScholarClientFallbackProps {
   id: string;
   debugUrl: string;
-  initialSearchIndex: any[];
 }
 
-export default function ScholarClientFallback({ id, debugUrl, initialSearchIndex = [] }: ScholarClientFallbackProps) {
+export default function ScholarClientFallback({ id, debugUrl }: ScholarClientFallbackProps) {
+  const locale = useLocale();
   const [data, setData] = useState<any>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(false);
@@ -21,13 +23,12 @@ export default function ScholarClientFallback({ id, debugUrl, initialSearchIndex
     async function fetchData() {
       try {
         console.log(`[ClientFallback] Fetching scholar ${id} from client...`);
-        const res = await fetch(`/data/scholars/${id}.json`);
+        const jsonData = await fetchLocalizedScholar(id, locale);
         
-        if (!res.ok) {
-           throw new Error(`Failed to fetch: ${res.status}`);
+        if (!jsonData) {
+           throw new Error(`Failed to fetch scholar ${id}`);
         }
         
-        const jsonData = await res.json();
         if (mounted) {
           setData(jsonData);
           setLoading(false);
@@ -44,7 +45,7 @@ export default function ScholarClientFallback({ id, debugUrl, initialSearchIndex
     fetchData();
 
     return () => { mounted = false; };
-  }, [id]);
+  }, [id, locale]);
 
   if (loading) {
     return (
@@ -56,7 +57,7 @@ export default function ScholarClientFallback({ id, debugUrl, initialSearchIndex
   }
 
   if (data) {
-    return <ScholarProfile initialData={data} searchIndex={initialSearchIndex} />;
+    return <ScholarProfile initialData={data} />;
   }
 
   // If both server and client failed, show the detailed troubleshooting UI
@@ -6,18 +6,29 @@ import ScholarProfile from '@/components/features/ScholarProfile';
 import Link from 'next/link';
 import ScholarClientFallback from './ScholarClientFallback';
 import { cache } from 'react';
+import { applyLocaleOverlay, fetchLocalizedScholar } from '@/lib/localizedData';
 
 // Cached data fetcher to deduplicate requests
 // Cached data fetcher to deduplicate requests
-const getScholarData = cache(async (id: string, depth = 0) => {
-  if (depth > 1) return null;
-
+const getScholarData = cache(async (id: string, locale: string) => {
   // 1. Try Filesystem (Fastest for Local Dev & Build Time)
   try {
     // Obfuscate path to avoid Next.js build tracer bundling all files (Vercel 250MB limit)
     // We break the static string analysis by using variables
+    const dataRoot = path.join(process.cwd(), 'public', 'data');
     const dataFolder = 'scholars';
-    const filePath = path.join(process.cwd(), 'public', 'data', dataFolder, `${id}.json`);
+    const coreFolder = `${dataFolder}-core`;
+    const corePath = path.join(dataRoot, coreFolder, `${id}.json`);
+
+    // Locale-neutral core plus this locale's overlay (scripts/split_locales.py)
+    if (fs.existsSync(corePath)) {
+         const core = JSON.parse(fs.readFileSync(corePath, 'utf8'));
+         const overlayPath = path.join(dataRoot, 'locales', locale, dataFolder, `${id}.json`);
+         const overlay = fs.existsSync(overlayPath) ? JSON.parse(fs.readFileSync(overlayPath, 'utf8')) : null;
+         return applyLocaleOverlay(core, overlay, locale);
+    }
+
+    const filePath = path.join(dataRoot, dataFolder, `${id}.json`);
     
     if (fs.existsSync(filePath)) {
          const fileContents = fs.readFileSync(filePath, 'utf8');
@@ -41,16 +52,16 @@ const getScholarData = cache(async (id: string, depth = 0) => {
         baseUrl = `http://localhost:${process.env.PORT || 3000}`;
     }
 
-    console.log(`[ScholarFetch] Attempting fetch for ${id} from: ${baseUrl}/data/scholars/${id}.json`);
+    console.log(`[ScholarFetch] Attempting fetch for ${id} (${locale}) from: ${baseUrl}/data/scholars-core/${id}.json`);
     
-    const res = await fetch(`${baseUrl}/data/scholars/${id}.json`, { 
-        next: { revalidate: 3600 } 
-    });
+    const data = await fetchLocalizedScholar(id, locale, baseUrl, {
+        next: { revalidate: 3600 }
+    } as RequestInit);
     
-    if (res.ok) {
-        return res.json();
+    if (data) {
+        return data;
     } else {
-        console.error(`Fetch failed for scholar ${id}: ${res.status} ${res.statusText}`);
+        console.error(`Fetch failed for scholar ${id}`);
     }
   } catch (e) {
     console.error(`Failed to fetch scholar ${id}:`, e);
@@ -59,28 +70,14 @@ const getScholarData = cache(async (id: string, depth = 0) => {
   return null;
 });
 
-// Cached search index loader
-const getSearchIndex = cache(async () => {
-  try {
-    const searchIndexPath = path.join(process.cwd(), 'public/data/search-index.json');
-    if (fs.existsSync(searchIndexPath)) {
-      const searchIndexData = fs.readFileSync(searchIndexPath, 'utf8');
-      return JSON.parse(searchIndexData);
-    }
-  } catch (error) {
-    console.error('Failed to load search index:', error);
-  }
-  return [];
-});
-
 interface PageProps {
-  params: Promise<{ id: string }>;
+  params: Promise<{ id: string; locale: string }>;
 }
 
 // SEO Metadata Generator
 export async function generateMetadata({ params }: PageProps): Promise<Metadata> {
   const resolvedParams = await params;
-  const data = await getScholarData(resolvedParams.id);
+  const data = await getScholarData(resolvedParams.id, resolvedParams.locale || 'en');
 
   if (!data) {
     return {
@@ -114,15 +111,12 @@ import { setRequestLocale } from 'next-intl/server';
 
 // ... existing imports ...
 
-export default async function ScholarPage({ params }: PageProps & { params: Promise<{ locale: string }> }) {
+export default async function ScholarPage({ params }: PageProps) {
   const resolvedParams = await params;
   setRequestLocale(resolvedParams.locale || 'en');
   
-  // Parallel data fetching
-  const [data, searchIndex] = await Promise.all([
-     getScholarData(resolvedParams.id),
-     getSearchIndex()
-  ]);
+  // Chain narrators are resolved client-side from the id-keyed scholar lookup shards
+  const data = await getScholarData(resolvedParams.id, resolvedParams.locale || 'en');
 
   if (!data) {
      const baseUrl = process.env.NEXT_PUBLIC_BASE_URL || (process.env.VERCEL_URL ? `https://${process.env.VERCEL_URL}` : `http://localhost:${process.env.PORT || 3000}`);
@@ -131,10 +125,9 @@ export default async function ScholarPage({ params }: PageProps & { params: Prom
         <ScholarClientFallback 
             id={resolvedParams.id} 
             debugUrl={`${baseUrl}/data/scholars/${resolvedParams.id}.json`}
-            initialSearchIndex={searchIndex}
         />
      );
   }
   
-  return <ScholarProfile initialData={data} searchIndex={searchIndex} />;
+  return <ScholarProfile initialData={data} />;
 }
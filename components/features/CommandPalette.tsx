@@ -17,6 +17,8 @@ import {
 import { useScholarLoader } from "@/components/providers/ScholarLoaderProvider";
 import { Button } from "@/components/ui/button";
 import { Tabs, TabsList, TabsTrigger } from "@/components/ui/tabs";
+import { HadithSearchResult, sampleHadiths, searchHadiths } from "@/lib/hadithSearch";
+import { fetchSearchIndex } from "@/lib/localizedData";
 
 interface SearchResult {
   id: string;
@@ -26,14 +28,6 @@ interface SearchResult {
   score: number;
 }
 
-interface HadithResult {
-  id: string;
-  book: string;
-  hadith_no: string;
-  matn: string;
-  sanad: string;
-}
-
 type SearchMode = "scholar" | "Sahih Bukhari" | "Sahih Muslim" | "Sunan an-Nasa'i" | "Sunan Abi Da'ud" | "Sunan Ibn Majah" | "Jami' al-Tirmidhi";
 
 const HADITH_BOOKS = [
@@ -56,9 +50,7 @@ export function CommandPalette() {
   const [allScholars, setAllScholars] = React.useState<SearchResult[]>([]);
   const [scholarFuse, setScholarFuse] = React.useState<Fuse<SearchResult> | null>(null);
 
-  const [hadithResults, setHadithResults] = React.useState<HadithResult[]>([]);
-  const [allHadiths, setAllHadiths] = React.useState<HadithResult[]>([]);
-  const [hadithFuse, setHadithFuse] = React.useState<Fuse<HadithResult> | null>(null);
+  const [hadithResults, setHadithResults] = React.useState<HadithSearchResult[]>([]);
 
   const router = useRouter();
   const locale = useLocale();
@@ -82,8 +74,7 @@ export function CommandPalette() {
   React.useEffect(() => {
     if (open && allScholars.length === 0) {
       setIsLoading(true);
-      fetch("/data/search-index.json")
-        .then((res) => res.json())
+      fetchSearchIndex<SearchResult>(locale)
         .then((data) => {
           setAllScholars(data);
           const fuseInstance = new Fuse(data, {
@@ -98,34 +89,31 @@ export function CommandPalette() {
           setIsLoading(false);
         });
     }
-  }, [open, allScholars.length]);
+  }, [open, allScholars.length, locale]);
 
-  // Load Hadith Index (only if mode is a book collection)
+  // Hadith search reads prebuilt postings (see scripts/hadith_search.py), fetching
+  // only the shards for the typed terms instead of indexing every matn here
   React.useEffect(() => {
-    if (open && searchMode !== "scholar" && allHadiths.length === 0) {
-      setIsLoading(true);
-      fetch("/data/hadith-index.json")
-        .then((res) => res.json())
-        .then((data) => {
-          setAllHadiths(data);
-          const fuseInstance = new Fuse(data, {
-            keys: [
-              { name: "book", weight: 0.2 },
-              { name: "hadith_no", weight: 0.3 },
-              { name: "matn", weight: 0.5 },
-            ],
-            threshold: 0.4,
-            ignoreLocation: true,
-          });
-          setHadithFuse(fuseInstance as unknown as Fuse<HadithResult>);
-          setIsLoading(false);
-        })
-        .catch((err) => {
-          console.error("Failed to load hadith index", err);
-          setIsLoading(false);
-        });
-    }
-  }, [open, searchMode, allHadiths.length]);
+    if (!open || searchMode === "scholar") return;
+    let cancelled = false;
+    setIsLoading(true);
+    const bookFilter = searchMode as string;
+    const pending = debouncedQuery
+      ? searchHadiths(debouncedQuery, bookFilter, 50)
+      : sampleHadiths(bookFilter, 20);
+    pending
+      .then((results) => {
+        if (!cancelled) setHadithResults(results);
+      })
+      .catch((err) => console.error("Failed to search hadiths", err))
+      .finally(() => {
+        if (!cancelled) setIsLoading(false);
+      });
+    return () => {
+      cancelled = true;
+      setIsLoading(false);
+    };
+  }, [open, searchMode, debouncedQuery]);
 
   // Perform search
   React.useEffect(() => {
@@ -136,19 +124,8 @@ export function CommandPalette() {
       } else if (allScholars.length > 0) {
         setScholarResults(allScholars.slice(0, 20));
       }
-    } else {
-      // Filter by selected book
-      const bookFilter = searchMode as string;
-      if (hadithFuse && debouncedQuery) {
-        const results = hadithFuse.search(debouncedQuery, { limit: 50 });
-        const filtered = results.map((result) => result.item).filter(h => h.book === bookFilter);
-        setHadithResults(filtered);
-      } else if (allHadiths.length > 0) {
-        const filtered = allHadiths.filter(h => h.book === bookFilter).slice(0, 20);
-        setHadithResults(filtered);
-      }
     }
-  }, [debouncedQuery, searchMode, scholarFuse, hadithFuse, allScholars, allHadiths]);
+  }, [debouncedQuery, searchMode, scholarFuse, allScholars]);
 
   const handleSelectScholar = (id: string) => {
     setOpen(false);
@@ -157,7 +134,7 @@ export function CommandPalette() {
     });
   };
 
-  const handleSelectHadith = (hadith: HadithResult) => {
+  const handleSelectHadith = (hadith: HadithSearchResult) => {
     setOpen(false);
     router.push(`/${locale}/hadith/${hadith.id}`);
   };
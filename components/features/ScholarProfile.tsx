@@ -31,10 +31,9 @@ import { useScholarLoader } from "@/components/providers/ScholarLoaderProvider";
 
 interface ScholarProfileProps {
   initialData: any;
-  searchIndex?: any[];
 }
 
-export default function ScholarProfile({ initialData, searchIndex = [] }: ScholarProfileProps) {
+export default function ScholarProfile({ initialData }: ScholarProfileProps) {
   const router = useRouter();
   const locale = useLocale();
   const { simulateLoading } = useScholarLoader();
@@ -63,7 +62,9 @@ export default function ScholarProfile({ initialData, searchIndex = [] }: Schola
       );
   }
 
-  const { id: scholarId, name, full_name, grade, biography, parents, spouses, siblings, children, teachers, students, hadiths } = initialData;
+  const { id: scholarId, name, full_name, grade, biography, parents, spouses, siblings, children, teachers, students } = initialData;
+  const totalHadiths: number = initialData.total_hadiths ?? 0;
+  const hadithPages: number = initialData.hadith_pages ?? 0;
 
   return (
     <main className="min-h-screen">
@@ -188,7 +189,7 @@ export default function ScholarProfile({ initialData, searchIndex = [] }: Schola
                   </div>
                   <div className="flex items-center justify-between">
                     <span className="text-sm text-muted-foreground">{tHadith('title')}</span>
-                    <Badge variant="outline">{hadiths.length}</Badge>
+                    <Badge variant="outline">{totalHadiths}</Badge>
                   </div>
                 </CardContent>
               </Card>
@@ -462,12 +463,12 @@ export default function ScholarProfile({ initialData, searchIndex = [] }: Schola
               <div>
                 <h2 className="text-4xl font-bold">{tHadith('title')}</h2>
                 <p className="text-muted-foreground">
-                  {tHadith('countSubtitle', { count: hadiths.length })}
+                  {tHadith('countSubtitle', { count: totalHadiths })}
                 </p>
               </div>
             </div>
 
-            <HadithList hadiths={hadiths} searchIndex={searchIndex} />
+            <HadithList scholarId={scholarId} total={totalHadiths} pageCount={hadithPages} />
           </motion.div>
         </div>
       </section>
@@ -495,7 +496,7 @@ export default function ScholarProfile({ initialData, searchIndex = [] }: Schola
               biography={biography}
               teachers={teachers}
               students={students}
-              hadiths={hadiths}
+              totalHadiths={totalHadiths}
             />
           </motion.div>
         </div>
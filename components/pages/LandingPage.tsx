@@ -20,6 +20,7 @@ import { Card, CardContent } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import Fuse from "fuse.js";
 import { useScholarLoader } from "@/components/providers/ScholarLoaderProvider";
+import { fetchSearchIndex } from "@/lib/localizedData";
 
 interface SearchResult {
   id: string;
@@ -40,8 +41,7 @@ export default function LandingPage() {
 
   // Load search index
   useEffect(() => {
-    fetch("/data/search-index.json")
-      .then((res) => res.json())
+    fetchSearchIndex<SearchResult>(locale)
       .then((data) => {
         setAllScholars(data);
         const fuseInstance = new Fuse(data, {
@@ -51,7 +51,7 @@ export default function LandingPage() {
         setFuse(fuseInstance as unknown as Fuse<SearchResult>);
       })
       .catch((err) => console.error("Failed to load search index", err));
-  }, []);
+  }, [locale]);
 
   // Perform search
   useEffect(() => {
@@ -9,11 +9,13 @@ import { Badge } from "@/components/ui/badge";
 import { Button } from "@/components/ui/button";
 import { ScrollArea } from "@/components/ui/scroll-area";
 import { BookOpen, ChevronDown, ChevronUp, Quote } from "lucide-react";
-import { resolveIsnadChainSync } from "@/lib/isnad";
+import { loadScholarLookup, resolveIsnadChainSync, type ScholarLookup } from "@/lib/isnad";
+import { fetchArtifactJson } from "@/lib/artifacts";
 import { useScholarLoader } from "@/components/providers/ScholarLoaderProvider";
 import { translateValue } from "@/lib/translations";
 
 interface Hadith {
+  id: string;
   hadith_no: string;
   source: string;
   chapter: string;
@@ -24,21 +26,81 @@ interface Hadith {
   chain: string[];
 }
 
+// Reference entry in a scholars/{id}/hadiths-{n}.json page file
+interface HadithRef {
+  id: string;
+  source: string;
+  hadith_no: string;
+  chapter: string;
+}
+
 interface HadithListProps {
-  hadiths: Hadith[];
-  searchIndex?: any[];
+  scholarId: string;
+  total: number;
+  pageCount: number;
 }
 
-export default function HadithList({ hadiths, searchIndex = [] }: HadithListProps) {
+export default function HadithList({ scholarId, total, pageCount }: HadithListProps) {
   const t = useTranslations('Hadiths');
   const locale = useLocale();
   const router = useRouter();
   const { simulateLoading } = useScholarLoader();
   const [expandedId, setExpandedId] = useState<string | null>(null);
   const [page, setPage] = useState(1);
+  const [refs, setRefs] = useState<HadithRef[]>([]);
+  const [pagesLoaded, setPagesLoaded] = useState(0);
+  const [records, setRecords] = useState<Record<string, Hadith>>({});
+  const [narrators, setNarrators] = useState<ScholarLookup>({});
   const itemsPerPage = 5;
+  const visibleCount = Math.min(page * itemsPerPage, total);
+
+  // Fetch page files of hadith references until the visible window is covered
+  useEffect(() => {
+    if (refs.length >= visibleCount || pagesLoaded >= pageCount) return;
+    const next = pagesLoaded + 1;
+    fetchArtifactJson<{ hadiths: HadithRef[] }>(`data/scholars/${scholarId}/hadiths-${next}.json`)
+      .then(data => {
+        if (data?.hadiths) setRefs(prev => [...prev, ...data.hadiths]);
+      })
+      .finally(() => setPagesLoaded(next));
+  }, [scholarId, pageCount, visibleCount, refs.length, pagesLoaded]);
+
+  // Fetch the shared per-hadith records (texts + chain) for visible references
+  useEffect(() => {
+    const missing = refs.slice(0, visibleCount).filter(ref => !(ref.id in records));
+    if (missing.length === 0) return;
+    Promise.all(
+      missing.map(ref => fetchArtifactJson<Hadith>(`data/hadiths/${ref.id}.json`))
+    ).then(results => {
+      setRecords(prev => {
+        const next = { ...prev };
+        missing.forEach((ref, i) => {
+          next[ref.id] = results[i] ?? { ...ref, chapter_no: '', text_ar: '', text_en: '', chain: [] };
+        });
+        return next;
+      });
+    });
+  }, [refs, visibleCount, records]);
+
+  // Resolve chain narrators from the id-keyed scholar lookup shards
+  useEffect(() => {
+    const missing = Object.values(records)
+      .flatMap(hadith => hadith.chain || [])
+      .filter(id => !(id in narrators));
+    if (missing.length === 0) return;
+    loadScholarLookup(missing).then(found => {
+      setNarrators(prev => {
+        const next = { ...prev };
+        // Unknown ids are cached too so they are not requested again
+        missing.forEach(id => {
+          next[id] = found[id] ?? { id, name: id, grade: '', reliability_grade: '' };
+        });
+        return next;
+      });
+    });
+  }, [records, narrators]);
 
-  if (!hadiths || hadiths.length === 0) {
+  if (total === 0) {
     return (
       <Card className="bg-muted/5 border-dashed">
         <CardContent className="flex flex-col items-center justify-center py-12 text-center text-muted-foreground">
@@ -49,8 +111,11 @@ export default function HadithList({ hadiths, searchIndex = [] }: HadithListProp
     );
   }
 
-  const displayedHadiths = hadiths.slice(0, page * itemsPerPage);
-  const hasMore = displayedHadiths.length < hadiths.length;
+  const displayedHadiths = refs
+    .slice(0, visibleCount)
+    .map(ref => records[ref.id])
+    .filter((hadith): hadith is Hadith => Boolean(hadith));
+  const hasMore = visibleCount < total;
 
   return (
     <div className="space-y-6">
@@ -59,7 +124,7 @@ export default function HadithList({ hadiths, searchIndex = [] }: HadithListProp
           <Quote className="w-5 h-5 text-amber-500" />
           {t('recordedNarrations')}
           <Badge variant="secondary" className="ml-2">
-            {hadiths.length}
+            {total}
           </Badge>
         </h3>
       </div>
@@ -67,7 +132,7 @@ export default function HadithList({ hadiths, searchIndex = [] }: HadithListProp
       <div className="space-y-4">
         {displayedHadiths.map((hadith, index) => (
           <motion.div
-            key={index}
+            key={hadith.id}
             initial={{ opacity: 0, y: 20 }}
             animate={{ opacity: 1, y: 0 }}
             transition={{ delay: index * 0.1 }}
@@ -124,7 +189,7 @@ export default function HadithList({ hadiths, searchIndex = [] }: HadithListProp
                      {/* Vertical Chain Layout */}
                       <div className="space-y-2">
                         {/* Wrapper for chain resolution to handle types correctly */}
-                        {(searchIndex ? resolveIsnadChainSync(hadith.chain, searchIndex) : hadith.chain.map(id => ({ id, name: id, grade: '', reliability_grade: '', grade_display: undefined }))).slice().reverse().map((narrator, idx, arr) => {
+                        {resolveIsnadChainSync(hadith.chain, narrators).slice().reverse().map((narrator, idx, arr) => {
                           const originalIdx = arr.length - 1 - idx;
                           // Handle string vs object (fallback)
                           const rawName = typeof narrator === 'string' ? narrator : narrator.name;
@@ -28,7 +28,7 @@ interface AnalyticsDashboardProps {
   };
   teachers: any[];
   students: any[];
-  hadiths: any[];
+  totalHadiths: number;
 }
 
 const COLORS = ["#f59e0b", "#3b82f6", "#10b981", "#ef4444", "#8b5cf6", "#ec4899"];
@@ -37,7 +37,7 @@ export default function AnalyticsDashboard({
   biography,
   teachers,
   students,
-  hadiths,
+  totalHadiths,
 }: AnalyticsDashboardProps) {
   const t = useTranslations('Analytics');
   const tNetwork = useTranslations('Network');
@@ -65,7 +65,7 @@ export default function AnalyticsDashboard({
   const stats = [
     {
       title: t('totalHadiths'),
-      value: hadiths.length,
+      value: totalHadiths,
       icon: BookOpen,
       color: "text-amber-500",
       bgColor: "bg-amber-500/10",
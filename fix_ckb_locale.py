@@ -1,18 +1,9 @@
 import os
-import glob
+import sys
 
-data_dir = "public/data/scholars"
-files = glob.glob(os.path.join(data_dir, "*.json"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
 
-count = 0
-for file_path in files:
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    if '"ku":' in content:
-        new_content = content.replace('"ku":', '"ckb":')
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(new_content)
-        count += 1
+from migrate_artifacts import main
 
-print(f"Updated {count} files.")
+# Structural 'ku' -> 'ckb' rename across every scholar file (see scripts/migrate_artifacts.py)
+sys.exit(main(["--migration", "ckb-locale", "--pattern", "scholars/*.json"] + sys.argv[1:]))
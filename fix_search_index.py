@@ -1,17 +1,9 @@
 import os
+import sys
 
-file_path = "public/data/search-index.json"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
 
-if os.path.exists(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    if '"ku":' in content:
-        new_content = content.replace('"ku":', '"ckb":')
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(new_content)
-        print("Updated search-index.json")
-    else:
-        print("No changes needed for search-index.json")
-else:
-    print("search-index.json not found")
+from migrate_artifacts import main
+
+# Structural 'ku' -> 'ckb' rename in the search index (see scripts/migrate_artifacts.py)
+sys.exit(main(["--migration", "ckb-locale", "--pattern", "search-index.json"] + sys.argv[1:]))
@@ -0,0 +1,72 @@
+// Resolve logical artifact names ("data/search-index.json", "scholars.db") to
+// the content-hashed URLs listed in /data-manifest.json (written by
+// scripts/publish_artifacts.py). Hashed URLs are immutable and cached for a
+// year; the manifest itself is revalidated. Without a manifest, or for a name
+// it does not list, the plain /data/... path is used.
+
+interface ArtifactFamily {
+  shard_count: number;
+  shards: string[];
+}
+
+interface ArtifactManifest {
+  version: number;
+  artifacts: Record<string, string>;
+  families: Record<string, ArtifactFamily>;
+}
+
+const manifests = new Map<string, Promise<ArtifactManifest | null>>();
+const familyShards = new Map<string, Promise<Record<string, string>>>();
+
+// FNV-1a (32-bit) over UTF-8 bytes, as term_shard() in scripts/hadith_search.py
+export function fnv1aShard(key: string, shardCount: number): number {
+  let hash = 0x811c9dc5;
+  for (const byte of new TextEncoder().encode(key)) {
+    hash = Math.imul(hash ^ byte, 0x01000193) >>> 0;
+  }
+  return hash % shardCount;
+}
+
+// Parsed JSON, or null when the request fails or the response is not ok
+async function fetchJson<T>(url: string, init?: RequestInit): Promise<T | null> {
+  return fetch(url, init)
+    .then(res => (res.ok ? res.json() : null))
+    .catch(() => null);
+}
+
+function loadManifest(baseUrl: string): Promise<ArtifactManifest | null> {
+  if (!manifests.has(baseUrl)) {
+    manifests.set(baseUrl, fetchJson<ArtifactManifest>(`${baseUrl}/data-manifest.json`, { cache: 'no-cache' }));
+  }
+  return manifests.get(baseUrl)!;
+}
+
+function plainUrl(name: string): string {
+  return '/' + name.split('/').map(encodeURIComponent).join('/');
+}
+
+export async function artifactUrl(name: string, baseUrl = ''): Promise<string> {
+  const manifest = await loadManifest(baseUrl);
+  if (!manifest) return baseUrl + plainUrl(name);
+  if (manifest.artifacts[name]) return baseUrl + manifest.artifacts[name];
+
+  for (const [family, entry] of Object.entries(manifest.families)) {
+    if (!name.startsWith(`${family}/`)) continue;
+    const key = name.slice(family.length + 1);
+    const shardUrl = entry.shards[fnv1aShard(key, entry.shard_count)];
+    if (!familyShards.has(shardUrl)) {
+      familyShards.set(shardUrl, fetchJson<Record<string, string>>(baseUrl + shardUrl).then(shard => shard || {}));
+    }
+    const url = (await familyShards.get(shardUrl)!)[key];
+    if (url) return baseUrl + url;
+  }
+  return baseUrl + plainUrl(name);
+}
+
+export async function fetchArtifact(name: string, init?: RequestInit, baseUrl = ''): Promise<Response> {
+  return fetch(await artifactUrl(name, baseUrl), init);
+}
+
+export async function fetchArtifactJson<T>(name: string, init?: RequestInit, baseUrl = ''): Promise<T | null> {
+  return fetchJson<T>(await artifactUrl(name, baseUrl), init);
+}
@@ -12,6 +12,10 @@ export interface Scholar {
   death_date_gregorian: string;
   death_place: string;
   death_reason: string;
+  birth_year_hijri: number | null;
+  birth_year_gregorian: number | null;
+  death_year_hijri: number | null;
+  death_year_gregorian: number | null;
 }
 
 export interface ScholarRelationship {
@@ -28,8 +32,70 @@ export interface Hadith {
   chapter_no: string;
   text_ar: string;
   text_en: string;
+  parallel_cluster: number | null;
 }
 
+export interface HadithParallel {
+  id: number;
+  public_id: string;
+  source: string;
+  hadith_no: string;
+  similarity: number;
+}
+
+/**
+ * Materialized page data built by convert_to_sqlite.py (scholar_summary)
+ */
+export interface ScholarSummary {
+  scholar_id: number;
+  parent_count: number;
+  child_count: number;
+  spouse_count: number;
+  sibling_count: number;
+  teacher_count: number;
+  student_count: number;
+  hadith_count: number;
+  hadith_counts: Record<string, number>;
+  relations: Record<
+    'parents' | 'children' | 'spouses' | 'siblings' | 'teachers' | 'students',
+    ScholarRelationship[]
+  >;
+  places: string[];
+  interests: string[];
+  tags: string[];
+}
+
+/**
+ * Longest interval in scholar_lifespans: anyone alive in a year started at
+ * most this many years before it. Read once from the data, so it always
+ * matches what convert_to_sqlite.py loaded.
+ */
+let maxLifespan: number | null = null;
+
+function getMaxLifespan(): number {
+  if (maxLifespan === null) {
+    const row = queryOne<{ span: number | null }>(
+      'SELECT MAX(end_year - start_year) AS span FROM scholar_lifespans'
+    );
+    maxLifespan = row?.span ?? 0;
+  }
+  return maxLifespan;
+}
+
+export interface ScholarLifespan extends ScholarRelationship {
+  start_year: number;
+  end_year: number;
+  estimated: number;
+}
+
+type ScholarSummaryRow = Omit<ScholarSummary, 'hadith_counts' | 'relations' | 'places' | 'interests' | 'tags'> & {
+  hadith_counts: string;
+  relations: string;
+  places: string;
+  interests: string;
+  tags: string;
+};
+
 /**
  * Get a scholar by ID with all related information
  */
@@ -72,6 +138,37 @@ export function getAllScholarRelationships(scholarId: number) {
   };
 }
 
+/**
+ * Get the precomputed summary row for a scholar (one query instead of one per relation/list)
+ */
+export function getScholarSummary(scholarId: number): ScholarSummary | null {
+  const row = queryOne<ScholarSummaryRow>(
+    'SELECT * FROM scholar_summary WHERE scholar_id = ?',
+    [scholarId]
+  );
+  if (!row) {
+    return null;
+  }
+
+  // Relations are packed as [id, name, grade] rows
+  const packed = JSON.parse(row.relations) as Record<string, [number, string, string][]>;
+  const relations = Object.fromEntries(
+    Object.entries(packed).map(([key, rows]) => [
+      key,
+      rows.map(([id, name, grade]) => ({ id, name, grade })),
+    ])
+  ) as ScholarSummary['relations'];
+
+  return {
+    ...row,
+    hadith_counts: JSON.parse(row.hadith_counts),
+    relations,
+    places: JSON.parse(row.places),
+    interests: JSON.parse(row.interests),
+    tags: JSON.parse(row.tags),
+  };
+}
+
 /**
  * Get scholar's places of stay
  */
@@ -147,6 +244,53 @@ export function getHadithChain(hadithId: number): ScholarRelationship[] {
   );
 }
 
+/**
+ * Get scholars alive in a Hijri year (lifespan intervals, earliest-born first)
+ */
+export function getScholarsAliveIn(year: number, limit: number = 100): ScholarLifespan[] {
+  return query<ScholarLifespan>(
+    `SELECT s.id, s.name, s.grade, sl.start_year, sl.end_year, sl.estimated
+     FROM scholar_lifespans sl
+     INNER JOIN scholars s ON s.id = sl.scholar_id
+     WHERE sl.start_year BETWEEN ? AND ? AND sl.end_year >= ?
+     ORDER BY sl.start_year, s.id
+     LIMIT ?`,
+    [year - getMaxLifespan(), year, year, limit]
+  );
+}
+
+/**
+ * Get scholars whose lifespan overlaps a scholar's (earliest-born first)
+ */
+export function getContemporaries(scholarId: number, limit: number = 100): ScholarLifespan[] {
+  return query<ScholarLifespan>(
+    `SELECT s.id, s.name, s.grade, other.start_year, other.end_year, other.estimated
+     FROM scholar_lifespans self
+     INNER JOIN scholar_lifespans other
+       ON other.start_year BETWEEN self.start_year - ? AND self.end_year
+       AND other.end_year >= self.start_year
+     INNER JOIN scholars s ON s.id = other.scholar_id
+     WHERE self.scholar_id = ? AND other.scholar_id != self.scholar_id
+     ORDER BY other.start_year, s.id
+     LIMIT ?`,
+    [getMaxLifespan(), scholarId, limit]
+  );
+}
+
+/**
+ * Get parallel narrations of a hadith (near-duplicate matns, most similar first)
+ */
+export function getHadithParallels(hadithId: number): HadithParallel[] {
+  return query<HadithParallel>(
+    `SELECT h.id, h.public_id, h.source, h.hadith_no, hp.similarity
+     FROM hadith_parallels hp
+     INNER JOIN hadiths h ON h.id = hp.parallel_id
+     WHERE hp.hadith_id = ?
+     ORDER BY hp.rank`,
+    [hadithId]
+  );
+}
+
 /**
  * Get complete scholar profile with all related data
  */
@@ -157,10 +301,12 @@ export async function getCompleteScholarProfile(id: number) {
     return null;
   }
 
-  const relationships = getAllScholarRelationships(id);
-  const places = getScholarPlaces(id);
-  const interests = getScholarInterests(id);
-  const tags = getScholarTags(id);
+  // One summary row replaces the per-relation and per-list queries when present
+  const summary = getScholarSummary(id);
+  const relationships = summary ? summary.relations : getAllScholarRelationships(id);
+  const places = summary ? summary.places : getScholarPlaces(id);
+  const interests = summary ? summary.interests : getScholarInterests(id);
+  const tags = summary ? summary.tags : getScholarTags(id);
   const hadiths = getScholarHadiths(id);
 
   return {
@@ -183,5 +329,6 @@ export async function getCompleteScholarProfile(id: number) {
     },
     ...relationships,
     hadiths,
+    hadith_counts: summary?.hadith_counts ?? null,
   };
 }
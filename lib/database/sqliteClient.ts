@@ -1,4 +1,5 @@
 import initSqlJs, { Database } from 'sql.js';
+import { fetchArtifact } from '@/lib/artifacts';
 
 let db: Database | null = null;
 let initPromise: Promise<Database> | null = null;
@@ -23,7 +24,7 @@ export async function initDatabase(): Promise<Database> {
       });
 
       // Fetch the database file
-      const response = await fetch('/scholars.db');
+      const response = await fetchArtifact('scholars.db');
       if (!response.ok) {
         throw new Error(`Failed to fetch database: ${response.statusText}`);
       }
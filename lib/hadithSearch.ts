@@ -0,0 +1,146 @@
+// Client for the prebuilt hadith search index (scripts/hadith_search.py).
+// Tokenizer, shard hash and BM25 scoring mirror the Python reference engine;
+// only the manifest, one doc table and the postings shards for the query
+// terms are fetched.
+
+import { fetchArtifactJson, fnv1aShard } from '@/lib/artifacts';
+
+interface SearchCollection {
+  slug: string;
+  name: string;
+  doc_count: number;
+  avg_len: number;
+  shards: number[];
+}
+
+interface SearchManifest {
+  version: number;
+  shard_count: number;
+  k1: number;
+  b: number;
+  min_token_length: number;
+  stopwords: string[];
+  collections: SearchCollection[];
+}
+
+// [id, hadith_no, token_count, snippet]
+type DocRow = [string, string, number, string];
+
+export interface HadithSearchResult {
+  id: string;
+  book: string;
+  hadith_no: string;
+  matn: string;
+  score: number;
+}
+
+const BASE = 'data/hadith-search';
+
+const ARABIC_MARKS = /[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]/g;
+const ARABIC_FOLD: Record<string, string> = {
+  '\u0623': '\u0627',
+  '\u0625': '\u0627',
+  '\u0622': '\u0627',
+  '\u0671': '\u0627',
+  '\u0649': '\u064a',
+  '\u0629': '\u0647',
+};
+const ARABIC_FOLD_PATTERN = new RegExp(`[${Object.keys(ARABIC_FOLD).join('')}]`, 'g');
+const TOKEN = /[\p{L}\p{N}]+/gu;
+
+let manifestPromise: Promise<SearchManifest | null> | null = null;
+let stopwords: Set<string> | null = null;
+const docTables = new Map<string, Promise<DocRow[]>>();
+const shardCache = new Map<string, Promise<Record<string, number[]>>>();
+
+function loadManifest(): Promise<SearchManifest | null> {
+  if (!manifestPromise) {
+    manifestPromise = fetchArtifactJson<SearchManifest>(`${BASE}/manifest.json`).then(manifest => {
+      if (manifest) stopwords = new Set(manifest.stopwords);
+      return manifest;
+    });
+  }
+  return manifestPromise;
+}
+
+export function tokenizeHadithText(text: string, minLength = 2): string[] {
+  const normalized = (text || '')
+    .replace(ARABIC_MARKS, '')
+    .replace(ARABIC_FOLD_PATTERN, ch => ARABIC_FOLD[ch])
+    .toLowerCase();
+  return (normalized.match(TOKEN) || []).filter(
+    token => token.length >= minLength && !stopwords?.has(token)
+  );
+}
+
+function loadDocs(slug: string): Promise<DocRow[]> {
+  if (!docTables.has(slug)) {
+    docTables.set(slug, fetchArtifactJson<DocRow[]>(`${BASE}/docs/${slug}.json`).then(rows => rows || []));
+  }
+  return docTables.get(slug)!;
+}
+
+function loadShard(slug: string, shard: number): Promise<Record<string, number[]>> {
+  const key = `${slug}/${shard}`;
+  if (!shardCache.has(key)) {
+    shardCache.set(key, fetchArtifactJson<Record<string, number[]>>(`${BASE}/postings/${key}.json`).then(terms => terms || {}));
+  }
+  return shardCache.get(key)!;
+}
+
+function toResult(row: DocRow, book: string, score: number): HadithSearchResult {
+  return { id: row[0], book, hadith_no: row[1], matn: row[3], score };
+}
+
+// First hadiths of a collection, for the palette before anything is typed
+export async function sampleHadiths(collectionName: string, limit = 20): Promise<HadithSearchResult[]> {
+  const manifest = await loadManifest();
+  const collection = manifest?.collections.find(c => c.name === collectionName);
+  if (!collection) return [];
+  const docs = await loadDocs(collection.slug);
+  return docs.slice(0, limit).map(row => toResult(row, collection.name, 0));
+}
+
+export async function searchHadiths(query: string, collectionName: string, limit = 50): Promise<HadithSearchResult[]> {
+  const manifest = await loadManifest();
+  const collection = manifest?.collections.find(c => c.name === collectionName);
+  if (!manifest || !collection) return [];
+
+  const terms = Array.from(new Set(tokenizeHadithText(query, manifest.min_token_length)));
+  const present = new Set(collection.shards);
+  const [docs, postings] = await Promise.all([
+    loadDocs(collection.slug),
+    Promise.all(
+      terms.map(async term => {
+        const shard = fnv1aShard(term, manifest.shard_count);
+        return present.has(shard) ? (await loadShard(collection.slug, shard))[term] || [] : [];
+      })
+    ),
+  ]);
+
+  // BM25 over delta-encoded [doc, tf, ...] lists
+  const scores = new Map<number, number>();
+  const { k1, b } = manifest;
+  for (const packed of postings) {
+    const df = packed.length / 2;
+    const idf = Math.log(1 + (collection.doc_count - df + 0.5) / (df + 0.5));
+    let doc = 0;
+    for (let i = 0; i < packed.length; i += 2) {
+      doc += packed[i];
+      const tf = packed[i + 1];
+      const norm = 1 - b + (b * docs[doc][2]) / (collection.avg_len || 1);
+      scores.set(doc, (scores.get(doc) || 0) + (idf * tf * (k1 + 1)) / (tf + k1 * norm));
+    }
+  }
+  const ranked = Array.from(scores.entries())
+    .sort((x, y) => y[1] - x[1] || x[0] - y[0])
+    .slice(0, limit)
+    .map(([doc, score]) => toResult(docs[doc], collection.name, score));
+
+  // "Bukhari 1"-style lookups: exact hadith numbers go first
+  const number = query.match(/\d+/)?.[0];
+  if (!number) return ranked;
+  const exact = docs.filter(row => row[1] === number).map(row => toResult(row, collection.name, Infinity));
+  const exactIds = new Set(exact.map(r => r.id));
+  return [...exact, ...ranked.filter(r => !exactIds.has(r.id))].slice(0, limit);
+}
@@ -1,10 +1,12 @@
+import { fetchArtifact, fetchArtifactJson } from '@/lib/artifacts';
+
 // Utility to resolve isnad chain IDs to scholar names
 export async function resolveIsnadChain(chainIds: string[]): Promise<string[]> {
   const names: string[] = [];
   
   for (const id of chainIds) {
     try {
-      const response = await fetch(`/data/scholars/${id}.json`);
+      const response = await fetchArtifact(`data/scholars/${id}.json`);
       if (response.ok) {
         const data = await response.json();
         // Extract just the name without the Arabic part for brevity
@@ -23,10 +25,73 @@ export async function resolveIsnadChain(chainIds: string[]): Promise<string[]> {
   return names;
 }
 
-// Synchronous version using search index (more efficient)
-export function resolveIsnadChainSync(chainIds: string[], searchIndex: any[]): Array<{id: string, name: string, grade: string, reliability_grade: string, grade_display?: Record<string, string>}> {
+export interface ScholarLookupEntry {
+  id: string;
+  name: string;
+  grade: string;
+  reliability_grade: string;
+  death_year?: string;
+  grade_display?: Record<string, string>;
+}
+
+export type ScholarLookup = Record<string, ScholarLookupEntry>;
+
+interface ScholarLookupHeader {
+  shard_size: number;
+  fields: string[];
+  shards: number[];
+}
+
+// Shards of /data/scholar-lookup (written by scripts/scholar_lookup.py), cached per session
+let lookupHeader: Promise<ScholarLookupHeader | null> | null = null;
+const lookupShards = new Map<number, Promise<Array<string[] | null>>>();
+
+// Resolve scholar ids by fetching only the id-range shards they fall in
+export async function loadScholarLookup(ids: string[]): Promise<ScholarLookup> {
+  if (!lookupHeader) lookupHeader = fetchArtifactJson<ScholarLookupHeader>('data/scholar-lookup/index.json');
+  const header = await lookupHeader;
+  const lookup: ScholarLookup = {};
+  if (!header) return lookup;
+
+  const present = new Set(header.shards);
+  await Promise.all(
+    Array.from(new Set(ids)).map(async id => {
+      if (!/^\d+$/.test(id)) return;
+      const shard = Math.floor(Number(id) / header.shard_size);
+      if (!present.has(shard)) return;
+      if (!lookupShards.has(shard)) {
+        lookupShards.set(shard, fetchArtifactJson<Array<string[] | null>>(`data/scholar-lookup/${shard}.json`).then(rows => rows || []));
+      }
+      const row = (await lookupShards.get(shard)!)[Number(id) % header.shard_size];
+      if (row) {
+        const entry: Record<string, string> = { id };
+        header.fields.forEach((field, i) => { entry[field] = row[i]; });
+        lookup[id] = entry as unknown as ScholarLookupEntry;
+      }
+    })
+  );
+  return lookup;
+}
+
+// Id -> entry maps built once per search index array
+const searchIndexMaps = new WeakMap<any[], ScholarLookup>();
+
+function toLookup(searchIndex: any[] | ScholarLookup): ScholarLookup {
+  if (!Array.isArray(searchIndex)) return searchIndex;
+  let lookup = searchIndexMaps.get(searchIndex);
+  if (!lookup) {
+    lookup = {};
+    for (const s of searchIndex) lookup[s.id] = s;
+    searchIndexMaps.set(searchIndex, lookup);
+  }
+  return lookup;
+}
+
+// Synchronous version using a scholar lookup (or a full search index)
+export function resolveIsnadChainSync(chainIds: string[], searchIndex: any[] | ScholarLookup): Array<{id: string, name: string, grade: string, reliability_grade: string, grade_display?: Record<string, string>}> {
+  const lookup = toLookup(searchIndex);
   return chainIds.map(id => {
-    const scholar = searchIndex.find((s: any) => s.id === id);
+    const scholar = lookup[id];
     if (scholar) {
       return {
         id,
@@ -0,0 +1,39 @@
+// Locale-partitioned scholar artifacts written by scripts/split_locales.py:
+// a locale-neutral core (scholars-core/{id}.json) plus one overlay per locale
+// (locales/{locale}/scholars/{id}.json) and a per-locale search index.
+// Pages load only their own language; the combined files remain the fallback.
+
+import { fetchArtifactJson } from '@/lib/artifacts';
+
+type OverlayText = string | null | Array<string | null>;
+export type LocaleOverlay = Array<[Array<string | number>, OverlayText]>;
+
+// Put one locale's display objects back into a core record, in the shape the
+// components already read (`grade_display[locale]`). Mirrors apply_overlay().
+export function applyLocaleOverlay<T>(core: T, overlay: LocaleOverlay | null, locale: string): T {
+  if (!overlay || overlay.length === 0) return core;
+  const merged = structuredClone(core) as any;
+  for (const [path, text] of overlay) {
+    let target = merged;
+    for (const key of path.slice(0, -1)) target = target[key];
+    target[path[path.length - 1]] = Array.isArray(text)
+      ? text.map(item => ({ [locale]: item }))
+      : { [locale]: text };
+  }
+  return merged;
+}
+
+export async function fetchLocalizedScholar(id: string, locale: string, baseUrl = '', init?: RequestInit) {
+  const [core, overlay] = await Promise.all([
+    fetchArtifactJson<any>(`data/scholars-core/${id}.json`, init, baseUrl),
+    fetchArtifactJson<LocaleOverlay>(`data/locales/${locale}/scholars/${id}.json`, init, baseUrl),
+  ]);
+  if (core) return applyLocaleOverlay(core, overlay, locale);
+  return fetchArtifactJson<any>(`data/scholars/${id}.json`, init, baseUrl);
+}
+
+export async function fetchSearchIndex<T = any>(locale: string): Promise<T[]> {
+  const localized = await fetchArtifactJson<T[]>(`data/locales/${locale}/search-index.json`);
+  if (localized) return localized;
+  return (await fetchArtifactJson<T[]>('data/search-index.json')) || [];
+}
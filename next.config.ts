@@ -1,10 +1,21 @@
 import type { NextConfig } from "next";
+import fs from 'fs';
 import createNextIntlPlugin from 'next-intl/plugin';
  
 import withPWAInit from "@ducanh2912/next-pwa";
 
 const withNextIntl = createNextIntlPlugin();
 
+// Content-hashed URL of an artifact from scripts/publish_artifacts.py, if published
+function publishedUrl(name: string, fallback: string): string {
+  try {
+    const manifest = JSON.parse(fs.readFileSync('public/data-manifest.json', 'utf8'));
+    return manifest.artifacts[name] || fallback;
+  } catch {
+    return fallback;
+  }
+}
+
 const withPWA = withPWAInit({
   dest: "public",
   // disable: process.env.NODE_ENV === "development",
@@ -15,7 +26,7 @@ const withPWA = withPWAInit({
     maximumFileSizeToCacheInBytes: 500 * 1024 * 1024, // 500MB to accommodate database
     runtimeCaching: [
       {
-        urlPattern: /^https?:\/\/.*\/scholars\.db$/,
+        urlPattern: /^https?:\/\/.*\/scholars(\.[0-9a-f]{16})?\.db$/,
         handler: 'CacheFirst',
         options: {
           cacheName: 'sqlite-database',
@@ -26,7 +37,8 @@ const withPWA = withPWAInit({
       },
     ],
     additionalManifestEntries: [
-      { url: '/scholars.db', revision: null },
+      // A hashed URL changes with the database, so the precache never serves a stale copy
+      { url: publishedUrl('scholars.db', '/scholars.db'), revision: null },
     ],
   },
 });
@@ -37,8 +49,22 @@ const nextConfig: NextConfig = {
     '*': [
       './public/data/scholars/**/*',
       'public/data/scholars/**/*',
+      './public/immutable/**/*',
     ],
   },
+  async headers() {
+    return [
+      {
+        // Content-addressed: a changed artifact gets a new URL
+        source: '/immutable/:path*',
+        headers: [{ key: 'Cache-Control', value: 'public, max-age=31536000, immutable' }],
+      },
+      {
+        source: '/data-manifest.json',
+        headers: [{ key: 'Cache-Control', value: 'public, max-age=0, must-revalidate' }],
+      },
+    ];
+  },
 };
 
 export default withPWA(withNextIntl(nextConfig));
@@ -0,0 +1,78 @@
+"""
+Shared helpers for reading and writing generated artifacts under public/data.
+
+Every writer goes through a temp file in the destination directory followed by
+os.replace(), so a crashed or interrupted build never leaves a half-written
+file where the web app can serve it.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+
+def sha256_bytes(data: bytes) -> str:
+    """Hex SHA-256 digest of a byte string."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hex SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# os.umask() can only be read by setting it, so once, before any writer threads start
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_mode(path: str) -> int:
+    """Mode for a new version of path: the existing file's, else what open() would give."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """Write bytes to path via a temp file + rename in the same directory."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600, which os.replace would carry over
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def dump_json_bytes(data, indent=2) -> bytes:
+    """Serialize data the way the build has always written JSON artifacts."""
+    return json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
+
+
+def atomic_write_json(path: str, data, indent=2) -> bytes:
+    """Atomically write data as UTF-8 JSON and return the bytes written."""
+    payload = dump_json_bytes(data, indent=indent)
+    atomic_write_bytes(path, payload)
+    return payload
+
+
+def load_json(path: str, default=None):
+    """Load a JSON file, returning default if it does not exist."""
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Benchmark the build pipeline on synthetic corpora.
+
+For every requested scale a corpus is generated with
+generate_synthetic_corpus.py, then each stage runs in a fresh Python process
+(cwd = corpus root, as the build scripts expect) so that peak RSS is measured
+per stage:
+
+- load_all_hadiths            CSV -> hadith dicts
+- get_enhanced_scholar_data   per-scholar JSON assembly (no file writes)
+- extract_enhanced_data       full scholar build (search index, scholar files)
+- process_hadiths             hadith-index.json with isnad analytics
+- convert                     ScholarDatabaseConverter.convert -> SQLite
+- text_matching               map_usc_msa_refs + fill_from_duplicates on a copy of the
+                              CSV, against reference files derived from it
+
+Later stages consume the artifacts of earlier ones, so stages always run in
+this order. Results (wall time, items/s, peak RSS) are written to a JSON file
+keyed by commit; --compare prints the change against an earlier results file.
+
+Usage:
+    python scripts/benchmark_pipeline.py --scales 1 10 --output bench.json
+    python scripts/benchmark_pipeline.py --scales 1 --compare bench-before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WORK_DIR = '.benchmarks'
+
+STAGES = [
+    'load_all_hadiths',
+    'get_enhanced_scholar_data',
+    'extract_enhanced_data',
+    'process_hadiths',
+    'convert',
+    'text_matching',
+]
+
+HADITHS_CSV = 'data-processing/data/all_hadiths_clean.csv'
+SCHOLARS_CSV = 'data-processing/data/all_rawis.csv'
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# Each stage returns (callable to time, number of items it processes).
+# Setup done before returning is excluded from the measurement.
+
+def stage_load_all_hadiths():
+    from extract_enhanced_data import load_all_hadiths
+    result = {}
+
+    def run():
+        result['hadiths'] = load_all_hadiths(HADITHS_CSV)
+        return len(result['hadiths'])
+    return run
+
+
+def stage_get_enhanced_scholar_data():
+    from build_transmission_graph import build_transmission_summary
+    from extract_enhanced_data import (
+        build_person_summaries, build_relation_index, get_enhanced_scholar_data,
+        group_hadiths_by_scholar, load_all_hadiths, load_scholars,
+    )
+
+    scholars = load_scholars(SCHOLARS_CSV)
+    hadiths = load_all_hadiths(HADITHS_CSV)
+    hadiths_by_scholar = group_hadiths_by_scholar(hadiths)
+    transmissions, _ = build_transmission_summary([h['chain'] for h in hadiths], scholars.keys())
+
+    def run():
+        summaries = build_person_summaries(scholars)
+        relations = build_relation_index(scholars, summaries)
+        for scholar_id in scholars:
+            get_enhanced_scholar_data(
+                scholar_id, scholars, hadiths_by_scholar, transmissions, summaries, relations
+            )
+        return len(scholars)
+    return run
+
+
+def stage_extract_enhanced_data():
+    import extract_enhanced_data
+
+    def run():
+        extract_enhanced_data.main()
+        return len(os.listdir(extract_enhanced_data.SCHOLARS_DIR))
+    return run
+
+
+def stage_process_hadiths():
+    import generate_hadith_index
+
+    def run():
+        generate_hadith_index.process_hadiths()
+        with open(generate_hadith_index.OUTPUT_PATH, 'r', encoding='utf-8') as f:
+            return len(json.load(f))
+    return run
+
+
+def stage_convert():
+    from convert_to_sqlite import ScholarDatabaseConverter
+    db_path = os.path.join('public', 'scholars.db')
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    converter = ScholarDatabaseConverter('public/data', db_path)
+
+    def run():
+        if not converter.convert():
+            raise RuntimeError("conversion failed")
+        return converter.stats['scholars_processed']
+    return run
+
+
+def stage_text_matching():
+    import csv
+    import fill_from_duplicates
+    import map_usc_msa_refs
+    from build_metrics import BuildRun
+    from text_normalize import remove_tashkeel
+
+    # Scratch copy of the corpus CSV plus fawazahmed0-style reference files,
+    # so both scripts run unchanged without rewriting the corpus itself
+    scratch_dir = os.path.join('data-processing', 'text-matching')
+    json_dir = os.path.join(scratch_dir, 'json_source')
+    os.makedirs(json_dir, exist_ok=True)
+    csv_path = os.path.join(scratch_dir, 'all_hadiths_clean.csv')
+    map_usc_msa_refs.CSV_PATH = fill_from_duplicates.CSV_PATH = csv_path
+    map_usc_msa_refs.JSON_DIR = json_dir
+
+    with open(HADITHS_CSV, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        columns = reader.fieldnames
+        rows = list(reader)
+    # Every 10th hadith repeated without its translation, for fill_from_duplicates
+    for row in rows[::10]:
+        rows.append(dict(row, id=str(len(rows)), hadith_id=str(len(rows)), text_en=''))
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    # Reference texts differ from the CSV the way the real editions do
+    # (no diacritics, markup, "Apostle"); every 7th hadith per book is left
+    # out so that some rows have nothing to match
+    arabic_books = {'Sahih Muslim'} & set(map_usc_msa_refs.ARABIC_SOURCE_MAP)
+    files = {source: map_usc_msa_refs.ARABIC_SOURCE_MAP[source] if source in arabic_books
+             else map_usc_msa_refs.SOURCE_MAP[source]
+             for source in set(map_usc_msa_refs.SOURCE_MAP) | arabic_books}
+    references = {source: {} for source in files}
+    positions = dict.fromkeys(files, 0)
+    for row in rows:
+        source = row['source'].strip()
+        text = row['text_ar' if source in arabic_books else 'text_en'].strip()
+        if source in references and text:
+            positions[source] += 1
+            if positions[source] % 7:
+                references[source].setdefault(text, 100000 + positions[source])
+    for source, refs in references.items():
+        if source in arabic_books:
+            hadiths = [{"hadithnumber": ref, "text": f"<p>{remove_tashkeel(text)}</p>"} for text, ref in refs.items()]
+        else:
+            hadiths = [{"hadithnumber": ref, "text": f"<b>{text.replace('Messenger', 'Apostle')}</b>"}
+                       for text, ref in refs.items()]
+        with open(os.path.join(json_dir, files[source]), 'w', encoding='utf-8') as f:
+            json.dump({"hadiths": hadiths}, f, ensure_ascii=False)
+
+    # Expected matches by raw text, independent of the normalizers under test
+    expected_refs = 0
+    for row in rows:
+        source = row['source'].strip()
+        text = row['text_ar' if source in arabic_books else 'text_en'].strip()
+        if text in references.get(source, {}) and (source == 'Sahih Bukhari' or row['usc_msa_ref'] in ('', '0')):
+            expected_refs += 1
+    translated = {row['text_ar'].strip() for row in rows if row['text_ar'] and row['text_en']}
+    expected_fills = sum(1 for row in rows if not row['text_en'] and row['text_ar'].strip() in translated)
+
+    def run():
+        with BuildRun('map_usc_msa_refs', scratch_dir) as refs_run:
+            map_usc_msa_refs.update_refs(refs_run)
+        with BuildRun('fill_from_duplicates', scratch_dir) as fill_run:
+            fill_from_duplicates.fill_from_duplicates(fill_run)
+        for name, build_run, expected in (('map_usc_msa_refs', refs_run, expected_refs),
+                                          ('fill_from_duplicates', fill_run, expected_fills)):
+            matched = build_run.counters['rows_matched']
+            if matched != expected:
+                raise RuntimeError(f"{name} matched {matched} rows, expected {expected}")
+        return refs_run.counters['rows_read'] + fill_run.counters['rows_read']
+    return run
+
+
+STAGE_FUNCTIONS = {name: globals()[f"stage_{name}"] for name in STAGES}
+
+
+def run_stage_in_process(stage):
+    """Child side: set up, time the stage with its output silenced, print a JSON result."""
+    sys.path.insert(0, SCRIPTS_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        run = STAGE_FUNCTIONS[stage]()
+        start = time.perf_counter()
+        items = run()
+        seconds = time.perf_counter() - start
+    print(json.dumps({"seconds": seconds, "items": items, "peak_rss_mb": peak_rss_mb()}))
+
+
+def run_stage(stage, corpus_dir):
+    """Run one stage in a fresh interpreter rooted at corpus_dir."""
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--run-stage', stage],
+        cwd=corpus_dir, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{stage} failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["throughput"] = result["items"] / result["seconds"] if result["seconds"] else None
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scales, stages, work_dir, seed=0, base_scholars=None, base_hadiths=None):
+    from generate_synthetic_corpus import BASE_HADITHS, BASE_SCHOLARS, generate_corpus
+
+    results = []
+    for scale in scales:
+        corpus_dir = os.path.abspath(os.path.join(work_dir, f"corpus-{scale:g}x"))
+        print(f"🧪 Generating {scale:g}x corpus in {corpus_dir}...")
+        corpus = generate_corpus(
+            corpus_dir, scale, seed, base_scholars or BASE_SCHOLARS, base_hadiths or BASE_HADITHS
+        )
+        for stage in stages:
+            result = run_stage(stage, corpus_dir)
+            result.update({"scale": scale, "stage": stage,
+                           "scholars": corpus["scholars"], "hadiths": corpus["hadiths"]})
+            results.append(result)
+            print(f"   - {stage:<28} {result['seconds']:8.2f}s  "
+                  f"{result['throughput'] or 0:10.0f} items/s  {result['peak_rss_mb']:8.1f} MB")
+    return results
+
+
+def compare(results, baseline_path):
+    """Print per-stage wall time and peak RSS changes against an earlier results file."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    before = {(r["scale"], r["stage"]): r for r in baseline["results"]}
+    print(f"\n📊 Compared with {baseline.get('commit') or baseline_path}:")
+    for result in results:
+        old = before.get((result["scale"], result["stage"]))
+        if not old:
+            continue
+        time_change = (result["seconds"] / old["seconds"] - 1) * 100 if old["seconds"] else 0.0
+        rss_change = (result["peak_rss_mb"] / old["peak_rss_mb"] - 1) * 100 if old["peak_rss_mb"] else 0.0
+        print(f"   - {result['scale']:g}x {result['stage']:<28} time {time_change:+6.1f}%  "
+              f"peak RSS {rss_change:+6.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic corpora")
+    parser.add_argument("--scales", type=float, nargs='+', default=[1.0], help="Corpus sizes, e.g. 1 10 100")
+    parser.add_argument("--stages", nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR, help="Where synthetic corpora are built")
+    parser.add_argument("--output", default="benchmark-results.json", help="Results JSON file")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-scholars", type=int, help="Narrators at 1x (default: real corpus size)")
+    parser.add_argument("--base-hadiths", type=int, help="Hadiths at 1x (default: real corpus size)")
+    parser.add_argument("--run-stage", choices=STAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_stage:
+        run_stage_in_process(args.run_stage)
+        return 0
+
+    # Later stages read earlier stages' artifacts, so keep pipeline order
+    stages = [stage for stage in STAGES if stage in args.stages]
+    results = run_benchmarks(args.scales, stages, args.work_dir, args.seed,
+                             args.base_scholars, args.base_hadiths)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Equality check and throughput benchmark for text_normalize.py.
+
+The per-script normalizers text_normalize.py replaced are kept here as
+references: --check runs them and the replacements (per value and through
+normalize_batch) over the build's CSVs plus fuzzed input and reports any
+output that differs; --benchmark reports MB/s for each.
+
+Usage:
+    python scripts/benchmark_text_normalize.py --check        # outputs equal the previous per-script functions
+    python scripts/benchmark_text_normalize.py --benchmark    # MB/s previous vs. per-value vs. batch
+"""
+
+import argparse
+import csv
+import random
+import re
+import sys
+import time
+
+from text_normalize import (MATCH_FOLD_TABLE, clean_field, clean_name, collapse_whitespace, normalize_arabic,
+                            normalize_batch, normalize_english, normalize_search, slugify)
+
+HADITHS_CSV = 'data-processing/data/all_hadiths_clean.csv'
+RAWIS_CSV = 'data-processing/data/all_rawis.csv'
+
+
+# The per-script functions text_normalize.py replaced
+
+
+def _previous_remove_tashkeel(text):
+    tashkeel = re.compile(r'[\u0617-\u061a\u064b-\u0652]')
+    return tashkeel.sub('', text)
+
+
+def _previous_normalize_arabic(text):
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'<[^>]+>', '', text)
+    text = _previous_remove_tashkeel(text)
+    text = re.sub(r'\s+', '', text)
+    text = re.sub(r'[^\w]', '', text)
+    return text
+
+
+def _previous_normalize_text(text):
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'[\ufb50-\ufdff\ufe70-\ufeff]', '', text)
+    text = text.replace('Apostle', 'Messenger')
+    text = text.replace('apostle', 'messenger')
+    text = re.sub(r'\s+', '', text)
+    return re.sub(r'[^\w]', '', text.lower())
+
+
+_previous_marks = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+_previous_fold = str.maketrans({'\u0623': '\u0627', '\u0625': '\u0627', '\u0622': '\u0627', '\u0671': '\u0627',
+                                '\u0649': '\u064a', '\u0629': '\u0647'})
+
+
+def _previous_search_normalize(text):
+    return _previous_marks.sub('', text or '').translate(_previous_fold).lower()
+
+
+def _previous_clean_text(text):
+    if not isinstance(text, str):
+        return ""
+    text = text.replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def _previous_clean_name(name):
+    name = str(name)
+    clean = re.sub(r'\([^)]*\)', '', name)
+    clean = ' '.join(clean.split())
+    return clean.strip()
+
+
+def _previous_slugify(text):
+    text = str(text).lower()
+    text = re.sub(r'[^\w\s-]', '', text)
+    text = re.sub(r'[-\s]+', '-', text).strip('-')
+    return text
+
+
+def _previous_clean_field(text):
+    import pandas as pd
+    if pd.isna(text):
+        return ""
+    return str(text).strip()
+
+
+def _previous_fold_arabic(text):
+    return _previous_normalize_arabic(text).translate(MATCH_FOLD_TABLE)
+
+
+def load_texts(hadiths_csv=HADITHS_CSV, rawis_csv=RAWIS_CSV):
+    """{'arabic': [...], 'english': [...], 'names': [...], 'sources': [...]} from the build's CSVs."""
+    texts = {'arabic': [], 'english': [], 'names': [], 'sources': []}
+    with open(hadiths_csv, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            texts['arabic'].append(row['text_ar'])
+            texts['english'].append(row['text_en'])
+            texts['sources'].append(row['source'])
+    with open(rawis_csv, 'r', encoding='utf-8') as f:
+        texts['names'] = [row['name'] for row in csv.DictReader(f)]
+    return texts
+
+
+# (name, previous function, replacement, keyword options, corpus)
+CASES = [
+    ('normalize_arabic', _previous_normalize_arabic, normalize_arabic, {}, 'arabic'),
+    ('normalize_arabic fold', _previous_fold_arabic, normalize_arabic, {'fold': True}, 'arabic'),
+    ('normalize_english', _previous_normalize_text, normalize_english, {}, 'english'),
+    ('normalize_search', _previous_search_normalize, normalize_search, {}, 'arabic'),
+    ('collapse_whitespace', _previous_clean_text, collapse_whitespace, {}, 'english'),
+    ('clean_name', _previous_clean_name, clean_name, {}, 'names'),
+    ('slugify', _previous_slugify, slugify, {}, 'sources'),
+    ('clean_field', _previous_clean_field, clean_field, {}, 'sources'),
+]
+ACCEPTS_MISSING = {'normalize_arabic', 'normalize_arabic fold', 'normalize_english', 'collapse_whitespace',
+                   'clean_field'}
+
+
+def fuzz_texts(count=20000, seed=0):
+    """Short random strings over the characters each step treats specially."""
+    alphabet = ('ab Z_9<>()-\t\n\r\u00a0\u2003\u0130\u00df'
+                'Apostle apostle \ufdfa\ufefb\ufb50'
+                '\u0627\u0623\u0625\u0622\u0671\u0649\u064a\u0629\u0624\u0626\u0621'
+                '\u064b\u064e\u0650\u0651\u0652\u0617\u0610\u0670\u06d6\u0640\u060c'
+                '\ue000')
+    rng = random.Random(seed)
+    texts = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 24))) for _ in range(count)]
+    return texts + ['Apostle', '<b>Apo<i>stle</i></b>', '<<b>x', '<>', 'a<b', '']
+
+
+def check(texts):
+    """Descriptions of cases whose outputs differ from the previous functions (empty when all agree)."""
+    problems = []
+    fuzz = fuzz_texts()
+    for name, previous, replacement, options, corpus in CASES:
+        inputs = [(corpus, texts[corpus]), ('fuzz', fuzz)]
+        if name in ACCEPTS_MISSING:
+            inputs.append(('missing values', [None, float('nan'), 12, 'x']))
+        for label, values in inputs:
+            expected = [previous(value) for value in values]
+            outputs = [('per-value', [replacement(value, **options) for value in values])]
+            if name != 'clean_field':
+                outputs.append(('batch', normalize_batch(values, replacement, **options)))
+            for kind, actual in outputs:
+                mismatches = sum(1 for a, b in zip(actual, expected) if a != b)
+                if mismatches or len(actual) != len(expected):
+                    problems.append(f"{name} ({kind}) on {label}: {mismatches} of {len(expected)} outputs differ")
+    return problems
+
+
+def _best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(texts, repeat=3):
+    """Throughput of the previous functions, the replacements and normalize_batch, in MB/s of UTF-8 input."""
+    print(f"{'MB/s':22} {'MB':>6} {'previous':>10} {'per-value':>10} {'batch':>10} {'speedup':>8}")
+    for name, previous, replacement, options, corpus in CASES:
+        values = texts[corpus]
+        mb = sum(len(value.encode('utf-8')) for value in values) / 1e6
+        timings = [
+            _best_time(lambda: [previous(value) for value in values], repeat),
+            _best_time(lambda: [replacement(value, **options) for value in values], repeat),
+            _best_time(lambda: normalize_batch(values, replacement, **options), repeat),
+        ]
+        rates = [mb / seconds for seconds in timings]
+        print(f"{name:22} {mb:6.1f} {rates[0]:10.1f} {rates[1]:10.1f} {rates[2]:10.1f} "
+              f"{timings[0] / min(timings[1:]):7.1f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="text_normalize.py: equality check and throughput benchmark")
+    parser.add_argument("--hadiths-csv", default=HADITHS_CSV, help="Hadith CSV (text_ar, text_en, source)")
+    parser.add_argument("--rawis-csv", default=RAWIS_CSV, help="Narrator CSV (name)")
+    parser.add_argument("--check", action="store_true", help="Compare outputs with the previous per-script functions")
+    parser.add_argument("--benchmark", action="store_true", help="MB/s of the previous functions vs. this module")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    args = parser.parse_args(argv)
+
+    texts = load_texts(args.hadiths_csv, args.rawis_csv)
+    if args.check or not args.benchmark:
+        problems = check(texts)
+        for problem in problems:
+            print(f"   - {problem}")
+        if problems:
+            print(f"❌ {len(problems)} normalizers differ from the functions they replaced")
+            return 1
+        print(f"✅ All {len(CASES)} normalizers match the functions they replaced "
+              f"({len(texts['arabic'])} hadiths, {len(texts['names'])} names, fuzzed input)")
+    if args.benchmark:
+        benchmark(texts, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Biography field parsing for all_rawis.csv rows.
+
+The raw dump stores dates as Python list literals ("['28 BH', '596 CE']"),
+bare years in the *_hijri / *_gregorian columns and comma-joined lists in
+places_of_stay / area_of_interest / tags. These are parsed here with compiled
+patterns instead of eval, and each distinct string is parsed once: most
+narrators share a small set of dates, places and grades, so the caches below
+turn ~N parses per field into ~distinct(N).
+
+Besides the display lists the pages already use, every birth/death gets
+numeric years so timeline queries can compare and index them:
+
+    parse_date_parts("['28 BH', '596 CE']")  ->  (-28, 596, False)
+
+Hijri years before the Hijra (BH) and Gregorian years BCE are negative; the
+last element is True when any part was marked approximate ("c. 110 AH").
+"""
+
+import ast
+import re
+from functools import lru_cache
+
+# One quoted item of a list literal; items containing escapes fall back to ast
+_LIST_LITERAL = re.compile(r"""\[\s*(?:(?:'[^'\\]*'|"[^"\\]*")\s*(?:,\s*|(?=\])))*\]""")
+_LIST_ITEM = re.compile(r"""'([^'\\]*)'|"([^"\\]*)\"""")
+
+# "c. 110/111 AH", "596 CE", "28 BH", "182" (bare years are taken as-is)
+_DATE_ITEM = re.compile(
+    r"^\s*(?P<approx>c(?:a|irca)?\.?\s*)?(?P<year>\d{1,4})(?:\s*[/-]\s*\d{1,4})?\s*(?P<era>AH|BH|CE|AD|BCE|BC)?\.?\s*$",
+    re.IGNORECASE,
+)
+
+_GRADE = re.compile(r'Narrator\[Grade:([^\]]+)\]')
+_TAG = re.compile(r'([^,\[]+)\s*\[')
+
+HIJRI_ERAS = {'AH': 1, 'BH': -1}
+GREGORIAN_ERAS = {'CE': 1, 'AD': 1, 'BCE': -1, 'BC': -1}
+
+CACHED_PARSERS = []
+
+
+def _cached(func):
+    """lru_cache a parser on its raw string and register it for cache_stats()."""
+    wrapped = lru_cache(maxsize=None)(func)
+    CACHED_PARSERS.append(wrapped)
+    return wrapped
+
+
+def _missing(value):
+    return not value or value == 'NA'
+
+
+@_cached
+def _parse_date_list(date_str):
+    if _missing(date_str):
+        return None
+    if date_str.startswith('['):
+        if _LIST_LITERAL.fullmatch(date_str):
+            return tuple(m.group(1) if m.group(1) is not None else m.group(2)
+                         for m in _LIST_ITEM.finditer(date_str))
+        try:
+            dates = ast.literal_eval(date_str)
+        except (ValueError, SyntaxError):
+            return (date_str,)
+        if isinstance(dates, list):
+            return tuple(dates)
+    return (date_str,)
+
+
+def parse_date_list(date_str):
+    """Display list for a date field: "['28 BH', '596 CE']" -> ['28 BH', '596 CE'], 'NA' -> None."""
+    dates = _parse_date_list(date_str)
+    return list(dates) if dates is not None else None
+
+
+@_cached
+def parse_date_item(item):
+    """(year, era, approximate) for one date like '28 BH'; None when it is not a year."""
+    if not isinstance(item, str):
+        return None
+    match = _DATE_ITEM.match(item)
+    if not match:
+        return None
+    era = (match.group('era') or '').upper() or None
+    return int(match.group('year')), era, bool(match.group('approx'))
+
+
+@_cached
+def parse_date_parts(date_str):
+    """(year_hijri, year_gregorian, approximate) from a date list literal; years may be None."""
+    year_hijri = year_gregorian = None
+    approximate = False
+    for item in _parse_date_list(date_str) or ():
+        parsed = parse_date_item(item)
+        if parsed is None:
+            continue
+        year, era, approx = parsed
+        approximate = approximate or approx
+        if era in HIJRI_ERAS and year_hijri is None:
+            year_hijri = year * HIJRI_ERAS[era]
+        elif era in GREGORIAN_ERAS and year_gregorian is None:
+            year_gregorian = year * GREGORIAN_ERAS[era]
+    return year_hijri, year_gregorian, approximate
+
+
+def parse_year(value, eras=HIJRI_ERAS):
+    """Signed year from a *_hijri / *_gregorian column ('182', '28 BH'), or None."""
+    if _missing(value):
+        return None
+    parsed = parse_date_item(value)
+    if parsed is None:
+        return None
+    year, era, _ = parsed
+    return year * eras.get(era, 1) if era is None or era in eras else None
+
+
+@_cached
+def _split_list(value):
+    return tuple(value.split(', ')) if value else ()
+
+
+def split_list(value):
+    """Comma-joined CSV list ('Makkah, Basra') as a list; empty strings give []."""
+    return list(_split_list(value))
+
+
+@_cached
+def parse_reliability_grade(area_of_interest):
+    """'Narrator[Grade:Thiqah], Hadith' -> 'Thiqah'."""
+    if _missing(area_of_interest):
+        return None
+    match = _GRADE.search(str(area_of_interest))
+    return match.group(1).strip() if match else None
+
+
+@_cached
+def _parse_tags(tags_str):
+    if _missing(tags_str):
+        return ()
+    return tuple(tag.strip() for tag in _TAG.findall(tags_str) if tag.strip())
+
+
+def parse_tags(tags_str):
+    """Tag names from 'Ansar [https://...], Badr [https://...]'."""
+    return list(_parse_tags(tags_str))
+
+
+def _life_event(person, prefix):
+    hijri_column = person.get(f'{prefix}_date_hijri', '')
+    gregorian_column = person.get(f'{prefix}_date_gregorian', '')
+    year_hijri, year_gregorian, approximate = parse_date_parts(person.get(f'{prefix}_date', ''))
+    # The dedicated columns win; the list literal fills whatever they leave out
+    column_hijri = parse_year(hijri_column, HIJRI_ERAS)
+    column_gregorian = parse_year(gregorian_column, GREGORIAN_ERAS)
+    return {
+        "date_hijri": hijri_column,
+        "date_gregorian": gregorian_column,
+        "date_display": parse_date_list(person.get(f'{prefix}_date', '')),
+        "year_hijri": column_hijri if column_hijri is not None else year_hijri,
+        "year_gregorian": column_gregorian if column_gregorian is not None else year_gregorian,
+        "approximate": approximate,
+        "place": person.get(f'{prefix}_place', ''),
+    }
+
+
+def parse_biography(person):
+    """Biography dict for a raw scholar row (see get_enhanced_scholar_data)."""
+    death = _life_event(person, 'death')
+    death["reason"] = person.get('death_reason', '')
+    return {
+        "birth": _life_event(person, 'birth'),
+        "death": death,
+        "places_of_stay": split_list(person.get('places_of_stay', '')),
+        "area_of_interest": split_list(person.get('area_of_interest', '')),
+        "tags": parse_tags(person.get('tags', '')),
+    }
+
+
+def cache_stats():
+    """(hits, misses) summed over every parser cache."""
+    hits = misses = 0
+    for parser in CACHED_PARSERS:
+        info = parser.cache_info()
+        hits += info.hits
+        misses += info.misses
+    return hits, misses
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Build-to-build delta packages for clients that cache artifacts locally.
+
+publish_artifacts.py gives every build a manifest of content-hashed URLs.
+This step runs after it and compares the manifest with the one the previous
+build published, so a client that cached build N can move to the latest build
+by fetching only what changed:
+
+- public/deltas/changelog.json: {"latest": version, "versions": [...]}, one
+  entry per build with the delta from the build before it (or null when no
+  delta could be made, e.g. the previous build's files were already pruned)
+- public/deltas/manifests/{version}.json: the manifest each version published
+- public/deltas/{from}-{to}.json.gz: {"from", "to", "artifacts": {name: op}}
+
+A version is the first 16 hex digits of the manifest's SHA-256. Artifacts
+whose URL did not change are left out; for the rest the smallest of these
+ops is used:
+
+    {"op": "delete"}
+    {"op": "replace", "text": ...} / {"op": "replace", "base64": ...}
+    {"op": "records", "indent": 2, "upsert": [...], "delete": [ids], "order": [ids]?}
+        JSON arrays of objects keyed by "id" (search indexes, hadith-index.json);
+        "order" is only sent when records moved
+    {"op": "lines", "upsert": [...], "delete": [ids], "order": [ids]?, "newline": true}
+        the same for NDJSON (hadith-records.ndjson)
+    {"op": "pages", "page_size": 4096, "length": n, "pages": {"index": base64}}
+        fixed-size page diff for binaries (and SQLite files that only grew)
+    {"op": "sql", "tables": {table: {"columns", "key", "upsert", "delete"}}, "rebuild": [fts]}
+        row upserts/deletes per table for scholars.db, keyed by rowid or primary
+        key, followed by an FTS5 'rebuild' of external-content indexes
+
+Every op is applied to the old bytes before it is written and must reproduce
+the new file byte for byte; otherwise the artifact is sent whole. The one
+exception is "sql": convert_to_sqlite.py rebuilds the database from scratch,
+so a renamed scholar shifts every later page and a page diff is nearly the
+whole file. Patched databases are instead checked to hold exactly the new
+build's rows in every table, with FTS5 integrity-check passing. --check
+replays the latest delta against the previous build's files.
+
+Usage:
+    python scripts/build_deltas.py
+    python scripts/build_deltas.py --check
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+from artifact_io import atomic_write_bytes, atomic_write_json, load_json, sha256_bytes
+from build_metrics import BuildRun, add_profile_argument
+from publish_artifacts import MANIFEST_NAME, PUBLIC_DIR, resolve_manifest, unquote_url
+
+DELTA_DIR = 'deltas'
+CHANGELOG_NAME = 'changelog.json'
+# Versions a client can be behind and still update with deltas
+MAX_VERSIONS = 20
+DEFAULT_PAGE_SIZE = 4096
+SQLITE_HEADER = b'SQLite format 3\x00'
+
+
+def manifest_version(payload):
+    return sha256_bytes(payload)[:16]
+
+
+def _op_size(op):
+    return len(json.dumps(op, ensure_ascii=False, separators=(',', ':')))
+
+
+def replace_op(new):
+    try:
+        return {"op": "replace", "text": new.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {"op": "replace", "base64": base64.b64encode(new).decode('ascii')}
+
+
+def dump_records(records, indent):
+    """Serialize the way the build writes JSON arrays (indent=2) or NDJSON-style compact JSON."""
+    if indent:
+        return json.dumps(records, ensure_ascii=False, indent=indent).encode('utf-8')
+    return json.dumps(records, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _keyed(items, key_of):
+    """{id: item} for items with unique ids, else None."""
+    keyed = {}
+    for item in items:
+        key = key_of(item)
+        if key is None or key in keyed:
+            return None
+        keyed[key] = item
+    return keyed
+
+
+def _record_id(record):
+    return record.get('id') if isinstance(record, dict) else None
+
+
+def _split_lines(data):
+    # Not str.splitlines(): U+2028 and friends may appear unescaped inside records
+    lines = data.decode('utf-8').split('\n')
+    return lines[:-1] if lines[-1] == '' else lines
+
+
+def _line_id(line):
+    try:
+        return _record_id(json.loads(line))
+    except ValueError:
+        return None
+
+
+def _diff_keyed(old, new):
+    """(upsert ids, delete ids, order or None) between two {id: item} maps in list order."""
+    deleted = [key for key in old if key not in new]
+    upsert = [key for key, item in new.items() if key not in old or old[key] != item]
+    gone = set(deleted)
+    default_order = [key for key in old if key not in gone] + [key for key in new if key not in old]
+    order = list(new) if default_order != list(new) else None
+    return upsert, deleted, order
+
+
+def _merge_keyed(old_keys, old_items, op, key_of):
+    items = dict(zip(old_keys, old_items))
+    for key in op['delete']:
+        items.pop(key, None)
+    for item in op['upsert']:
+        items[key_of(item)] = item
+    order = op.get('order')
+    if order is None:
+        gone = set(op['delete'])
+        old_set = set(old_keys)
+        order = [key for key in old_keys if key not in gone] + [
+            key_of(item) for item in op['upsert'] if key_of(item) not in old_set
+        ]
+    return [items[key] for key in order]
+
+
+def records_op(old, new):
+    """Changed records by id for a JSON array of objects, or None if the file is not one."""
+    try:
+        old_records, new_records = json.loads(old), json.loads(new)
+    except ValueError:
+        return None
+    if not isinstance(old_records, list) or not isinstance(new_records, list):
+        return None
+    old_keyed, new_keyed = _keyed(old_records, _record_id), _keyed(new_records, _record_id)
+    if old_keyed is None or new_keyed is None:
+        return None
+    indent = next((indent for indent in (2, None)
+                   if dump_records(old_records, indent) == old and dump_records(new_records, indent) == new), False)
+    if indent is False:
+        return None
+
+    upsert, deleted, order = _diff_keyed(old_keyed, new_keyed)
+    op = {"op": "records", "indent": indent, "upsert": [new_keyed[key] for key in upsert], "delete": deleted}
+    if order is not None:
+        op["order"] = order
+    return op
+
+
+def lines_op(old, new):
+    """Changed lines by record id for NDJSON, or None if the lines are not id-keyed."""
+    old_lines, new_lines = _split_lines(old), _split_lines(new)
+    old_keyed, new_keyed = _keyed(old_lines, _line_id), _keyed(new_lines, _line_id)
+    if old_keyed is None or new_keyed is None:
+        return None
+    upsert, deleted, order = _diff_keyed(old_keyed, new_keyed)
+    op = {"op": "lines", "upsert": [new_keyed[key] for key in upsert], "delete": deleted,
+          "newline": new.endswith(b'\n')}
+    if order is not None:
+        op["order"] = order
+    return op
+
+
+def page_size_of(data):
+    """SQLite's page size from its header, DEFAULT_PAGE_SIZE for anything else."""
+    if data.startswith(SQLITE_HEADER) and len(data) >= 18:
+        size = int.from_bytes(data[16:18], 'big')
+        return 65536 if size == 1 else size
+    return DEFAULT_PAGE_SIZE
+
+
+def pages_op(old, new):
+    """Pages of new that differ from old (or lie past its end)."""
+    page_size = page_size_of(new)
+    pages = {}
+    for index in range((len(new) + page_size - 1) // page_size):
+        start = index * page_size
+        page = new[start:start + page_size]
+        if old[start:start + page_size] != page:
+            pages[str(index)] = base64.b64encode(page).decode('ascii')
+    return {"op": "pages", "page_size": page_size, "length": len(new), "pages": pages}
+
+
+def _sort_key(value):
+    # SQLite's cross-type order: NULL < numbers < text < blobs
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (2, value) if isinstance(value, str) else (3, value)
+
+
+def _encode_value(value):
+    return {"$b64": base64.b64encode(value).decode('ascii')} if isinstance(value, bytes) else value
+
+
+def _decode_value(value):
+    return base64.b64decode(value["$b64"]) if isinstance(value, dict) else value
+
+
+def _schema(conn):
+    return conn.execute("SELECT type, name, tbl_name, sql FROM sqlite_master ORDER BY type, name").fetchall()
+
+
+def _tables(conn):
+    """{table: (columns, key columns)} for ordinary tables, and the FTS tables with external content."""
+    virtual = [name for name, sql in conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND sql LIKE 'CREATE VIRTUAL TABLE%'")]
+    tables = {}
+    for name, sql in conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' ORDER BY name"):
+        # FTS shadow tables are regenerated by 'rebuild' rather than diffed
+        if name in virtual or any(name.startswith(f"{v}_") for v in virtual):
+            continue
+        info = conn.execute(f'PRAGMA table_info("{name}")').fetchall()
+        columns = [row[1] for row in info]
+        if 'WITHOUT ROWID' in sql.upper():
+            key = [row[1] for row in sorted(info, key=lambda row: row[5]) if row[5] > 0]
+        else:
+            columns, key = ['rowid'] + columns, ['rowid']
+        tables[name] = (columns, key)
+    return tables, virtual
+
+
+def _rows(conn, table, columns, key):
+    quoted = ', '.join(c if c == 'rowid' else f'"{c}"' for c in columns)
+    order = ', '.join(c if c == 'rowid' else f'"{c}"' for c in key)
+    return conn.execute(f'SELECT {quoted} FROM "{table}" ORDER BY {order}')
+
+
+def _diff_table(old_conn, new_conn, table, columns, key):
+    """(upsert rows, deleted keys) from a merge join of both tables in key order."""
+    positions = [columns.index(c) for c in key]
+    upsert, deleted = [], []
+    old_rows, new_rows = _rows(old_conn, table, columns, key), _rows(new_conn, table, columns, key)
+    old_row, new_row = next(old_rows, None), next(new_rows, None)
+    while old_row is not None or new_row is not None:
+        old_key = [_sort_key(old_row[i]) for i in positions] if old_row is not None else None
+        new_key = [_sort_key(new_row[i]) for i in positions] if new_row is not None else None
+        if new_key is None or (old_key is not None and old_key < new_key):
+            deleted.append([_encode_value(old_row[i]) for i in positions])
+            old_row = next(old_rows, None)
+        elif old_key is None or new_key < old_key:
+            upsert.append([_encode_value(v) for v in new_row])
+            new_row = next(new_rows, None)
+        else:
+            if old_row != new_row:
+                upsert.append([_encode_value(v) for v in new_row])
+            old_row, new_row = next(old_rows, None), next(new_rows, None)
+    return upsert, deleted
+
+
+def sql_op(old_path, new_path):
+    """Row-level changes between two SQLite files with the same schema, or None."""
+    old_conn = sqlite3.connect(f"file:{old_path}?mode=ro", uri=True)
+    new_conn = sqlite3.connect(f"file:{new_path}?mode=ro", uri=True)
+    try:
+        if _schema(old_conn) != _schema(new_conn):
+            return None
+        tables, virtual = _tables(new_conn)
+        changes = {}
+        for table, (columns, key) in tables.items():
+            upsert, deleted = _diff_table(old_conn, new_conn, table, columns, key)
+            if upsert or deleted:
+                changes[table] = {"columns": columns, "key": key, "upsert": upsert, "delete": deleted}
+        rebuild = []
+        for name in virtual:
+            sql = new_conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (name,)).fetchone()[0]
+            options = ''.join(c for c in sql if c not in ' \n\'"')
+            if any(f"content={table}," in options or f"content={table})" in options for table in changes):
+                rebuild.append(name)
+    finally:
+        old_conn.close()
+        new_conn.close()
+    return {"op": "sql", "tables": changes, "rebuild": rebuild}
+
+
+def apply_sql(path, op):
+    """Apply an "sql" op to the database file at path, in place."""
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            for table, change in op['tables'].items():
+                where = ' AND '.join(f"{c} = ?" if c == 'rowid' else f'"{c}" = ?' for c in change['key'])
+                conn.executemany(f'DELETE FROM "{table}" WHERE {where}',
+                                 ([_decode_value(v) for v in key] for key in change['delete']))
+                quoted = ', '.join(c if c == 'rowid' else f'"{c}"' for c in change['columns'])
+                placeholders = ', '.join('?' * len(change['columns']))
+                conn.executemany(f'INSERT OR REPLACE INTO "{table}" ({quoted}) VALUES ({placeholders})',
+                                 ([_decode_value(v) for v in row] for row in change['upsert']))
+            for name in op['rebuild']:
+                conn.execute(f'INSERT INTO "{name}"("{name}") VALUES (\'rebuild\')')
+    finally:
+        conn.close()
+
+
+def same_database(patched_path, new_path):
+    """True when both files hold the same schema and rows and every FTS index is consistent."""
+    if sql_op(patched_path, new_path) != {"op": "sql", "tables": {}, "rebuild": []}:
+        return False
+    conn = sqlite3.connect(patched_path)
+    try:
+        _, virtual = _tables(conn)
+        for name in virtual:
+            conn.execute(f'INSERT INTO "{name}"("{name}") VALUES (\'integrity-check\')')
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        conn.close()
+    return True
+
+
+def _patched_copy(old_path, op):
+    """Temp file holding old_path with an "sql" op applied; the caller removes it."""
+    fd, tmp_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    shutil.copyfile(old_path, tmp_path)
+    apply_sql(tmp_path, op)
+    return tmp_path
+
+
+def apply_op(old, op):
+    """New bytes from old bytes (None for a new artifact) and one op."""
+    kind = op['op']
+    if kind == 'replace':
+        return op['text'].encode('utf-8') if 'text' in op else base64.b64decode(op['base64'])
+    if kind == 'records':
+        records = json.loads(old)
+        merged = _merge_keyed([_record_id(r) for r in records], records, op, _record_id)
+        return dump_records(merged, op['indent'])
+    if kind == 'lines':
+        lines = _split_lines(old)
+        merged = _merge_keyed([_line_id(line) for line in lines], lines, op, _line_id)
+        return ('\n'.join(merged) + ('\n' if op['newline'] else '')).encode('utf-8')
+    if kind == 'sql':
+        fd, old_path = tempfile.mkstemp(suffix='.db')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(old)
+        try:
+            apply_sql(old_path, op)
+            with open(old_path, 'rb') as f:
+                return f.read()
+        finally:
+            os.remove(old_path)
+    if kind == 'pages':
+        data = bytearray(old[:op['length']].ljust(op['length'], b'\x00'))
+        for index, page in op['pages'].items():
+            start = int(index) * op['page_size']
+            data[start:start + op['page_size']] = base64.b64decode(page)
+        return bytes(data)
+    raise ValueError(f"Unknown delta op {kind!r}")
+
+
+def diff_artifact(name, old_path, new_path):
+    """Smallest op turning the old file into the new one (byte for byte; row for row for "sql")."""
+    with open(new_path, 'rb') as f:
+        new = f.read()
+    best = replace_op(new)
+    if old_path is None:
+        return best
+    with open(old_path, 'rb') as f:
+        old = f.read()
+
+    if new.startswith(SQLITE_HEADER) and old.startswith(SQLITE_HEADER):
+        op = sql_op(old_path, new_path)
+        if op is not None and _op_size(op) < _op_size(best):
+            patched = _patched_copy(old_path, op)
+            try:
+                if same_database(patched, new_path):
+                    best = op
+            finally:
+                os.remove(patched)
+
+    differs = []
+    if name.endswith('.json'):
+        differs.append(records_op)
+    elif name.endswith('.ndjson'):
+        differs.append(lines_op)
+    if len(new) > DEFAULT_PAGE_SIZE:
+        differs.append(pages_op)
+    for differ in differs:
+        op = differ(old, new)
+        if op is not None and _op_size(op) < _op_size(best) and apply_op(old, op) == new:
+            best = op
+    return best
+
+
+def published_path(url, public_dir=PUBLIC_DIR):
+    path = os.path.join(public_dir, unquote_url(url))
+    if not os.path.exists(path):
+        raise FileNotFoundError(2, 'No such file', path)
+    return path
+
+
+def read_published(url, public_dir=PUBLIC_DIR):
+    with open(published_path(url, public_dir), 'rb') as f:
+        return f.read()
+
+
+def diff_builds(old_urls, new_urls, public_dir=PUBLIC_DIR):
+    """{name: op} for every artifact whose published URL changed between two manifests."""
+    ops = {}
+    for name in sorted(set(old_urls) | set(new_urls)):
+        old_url, new_url = old_urls.get(name), new_urls.get(name)
+        if old_url == new_url:
+            continue
+        if new_url is None:
+            ops[name] = {"op": "delete"}
+            continue
+        old_path = published_path(old_url, public_dir) if old_url else None
+        ops[name] = diff_artifact(name, old_path, published_path(new_url, public_dir))
+    return ops
+
+
+def encode_delta(delta):
+    payload = json.dumps(delta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    # mtime=0 keeps the package bytes reproducible
+    return gzip.compress(payload, mtime=0)
+
+
+def build_delta(public_dir=PUBLIC_DIR):
+    """Record the current manifest as a version and write its delta; returns the changelog entry."""
+    delta_dir = os.path.join(public_dir, DELTA_DIR)
+    changelog_path = os.path.join(delta_dir, CHANGELOG_NAME)
+    with open(os.path.join(public_dir, MANIFEST_NAME), 'rb') as f:
+        manifest_bytes = f.read()
+    version = manifest_version(manifest_bytes)
+    changelog = load_json(changelog_path, default={"latest": None, "versions": []})
+    if changelog['latest'] == version:
+        return None
+
+    atomic_write_bytes(os.path.join(delta_dir, 'manifests', f"{version}.json"), manifest_bytes)
+    previous = changelog['latest']
+    entry = {"version": version, "previous": previous, "delta": None, "bytes": 0, "changed": 0, "full_bytes": 0}
+    previous_manifest = load_json(os.path.join(delta_dir, 'manifests', f"{previous}.json")) if previous else None
+    if previous_manifest:
+        new_urls = resolve_manifest(json.loads(manifest_bytes), public_dir)
+        try:
+            ops = diff_builds(resolve_manifest(previous_manifest, public_dir), new_urls, public_dir)
+        except FileNotFoundError as e:
+            print(f"⚠️  Previous build {previous} is no longer on disk ({e.filename}); no delta")
+            ops = None
+        if ops is not None:
+            payload = encode_delta({"from": previous, "to": version, "artifacts": ops})
+            name = f"{previous}-{version}.json.gz"
+            atomic_write_bytes(os.path.join(delta_dir, name), payload)
+            entry.update({
+                "delta": f"/{DELTA_DIR}/{name}",
+                "bytes": len(payload),
+                "changed": len(ops),
+                "full_bytes": sum(os.path.getsize(os.path.join(public_dir, unquote_url(new_urls[n])))
+                                  for n, op in ops.items() if op['op'] != 'delete'),
+                "ops": {kind: sum(op['op'] == kind for op in ops.values())
+                        for kind in sorted({op['op'] for op in ops.values()})},
+            })
+
+    versions = (changelog['versions'] + [entry])[-MAX_VERSIONS:]
+    atomic_write_json(changelog_path, {"latest": version, "versions": versions})
+
+    # Deltas and manifests of versions that fell off the changelog
+    keep = {f"{v['version']}.json" for v in versions} | {os.path.basename(v['delta']) for v in versions if v['delta']}
+    for directory in (delta_dir, os.path.join(delta_dir, 'manifests')):
+        for filename in os.listdir(directory):
+            path = os.path.join(directory, filename)
+            if os.path.isfile(path) and filename != CHANGELOG_NAME and filename not in keep:
+                os.remove(path)
+    return entry
+
+
+def check(public_dir=PUBLIC_DIR, limit=20):
+    """Apply the latest delta to the previous build's files; list artifacts that differ."""
+    delta_dir = os.path.join(public_dir, DELTA_DIR)
+    changelog = load_json(os.path.join(delta_dir, CHANGELOG_NAME), default=None)
+    if not changelog or not changelog['versions']:
+        return [f"{DELTA_DIR}/{CHANGELOG_NAME} has no versions"]
+    entry = changelog['versions'][-1]
+    if not entry['delta']:
+        return []
+
+    with open(os.path.join(public_dir, entry['delta'].lstrip('/')), 'rb') as f:
+        delta = json.loads(gzip.decompress(f.read()))
+    old_urls = resolve_manifest(load_json(os.path.join(delta_dir, 'manifests', f"{entry['previous']}.json")), public_dir)
+    new_urls = resolve_manifest(load_json(os.path.join(delta_dir, 'manifests', f"{entry['version']}.json")), public_dir)
+
+    problems = []
+    for name in sorted(set(old_urls) | set(new_urls)):
+        op = delta['artifacts'].get(name)
+        if op is None:
+            if old_urls.get(name) != new_urls.get(name):
+                problems.append(f"{name}: changed but missing from the delta")
+        elif op['op'] == 'delete':
+            if name in new_urls:
+                problems.append(f"{name}: deleted by the delta but still published")
+        elif op['op'] == 'sql':
+            patched = _patched_copy(published_path(old_urls[name], public_dir), op)
+            try:
+                if not same_database(patched, published_path(new_urls[name], public_dir)):
+                    problems.append(f"{name}: patched database differs from the new build")
+            finally:
+                os.remove(patched)
+        else:
+            old = read_published(old_urls[name], public_dir) if name in old_urls else None
+            if apply_op(old, op) != read_published(new_urls[name], public_dir):
+                problems.append(f"{name}: patched bytes differ from the new build")
+        if len(problems) >= limit:
+            break
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the delta from the previous published build")
+    parser.add_argument("--public-dir", default=PUBLIC_DIR, help="Web root containing data-manifest.json")
+    parser.add_argument("--check", action="store_true", help="Replay the latest delta and compare bytes")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = check(args.public_dir)
+        for problem in problems:
+            print(f"   - {problem}")
+        if problems:
+            print("❌ Latest delta does not reproduce the current build")
+            return 1
+        print("✅ Latest delta reproduces the current build (byte for byte; row for row for databases)")
+        return 0
+
+    with BuildRun('build_deltas', os.path.join(args.public_dir, 'data'), profile=args.profile) as run:
+        with run.stage('diff'):
+            entry = build_delta(args.public_dir)
+        if entry:
+            run.count('artifacts_changed', entry['changed'])
+            run.count('bytes_written', entry['bytes'])
+            run.metric('full_download_bytes', entry['full_bytes'])
+
+    if entry is None:
+        print("Manifest unchanged since the last recorded version; no delta")
+    elif entry['delta'] is None:
+        print(f"Recorded version {entry['version']} (no previous build to diff against)")
+    else:
+        ops = ', '.join(f"{n} {kind}" for kind, n in entry['ops'].items())
+        print(f"Delta {entry['previous']} -> {entry['version']}: {entry['changed']} artifacts ({ops}), "
+              f"{entry['bytes'] / 1024:.1f} KB instead of {entry['full_bytes'] / 1e6:.1f} MB of full downloads")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
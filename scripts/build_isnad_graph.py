@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Build compressed sparse row (CSR) adjacency artifacts for the scholar graph.
+
+For every relation type (teacher, student, parent, child, spouse, sibling)
+the build emits an offsets array (one entry per node + 1) and a neighbors
+array of node indexes, plus a combined adjacency whose edge types are packed
+as uint8 codes. All arrays are written little-endian into a single binary
+file described by a small JSON header, so the web app can map them straight
+into typed arrays.
+
+Usage:
+    python scripts/build_isnad_graph.py
+    python scripts/build_isnad_graph.py --benchmark
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from artifact_io import atomic_write_bytes, atomic_write_json
+from build_metrics import BuildRun, add_profile_argument
+from extract_enhanced_data import DATA_DIR, OUTPUT_DIR, load_scholars, parse_ids, parse_inds
+
+GRAPH_DIR = os.path.join(OUTPUT_DIR, 'graph')
+GRAPH_BIN = 'isnad-graph.bin'
+GRAPH_HEADER = 'isnad-graph.json'
+
+# Edge type codes. Names match scholar_relationships.relationship_type.
+RELATION_TYPES = ['teacher', 'student', 'parent', 'child', 'spouse', 'sibling']
+RELATION_CODES = {name: code for code, name in enumerate(RELATION_TYPES)}
+
+
+# relation -> (CSV column, parser)
+RELATION_COLUMNS = {
+    'teacher': ('teachers_inds', parse_inds),
+    'student': ('students_inds', parse_inds),
+    'parent': ('parents', parse_ids),
+    'child': ('children', parse_ids),
+    'spouse': ('spouse', parse_ids),
+    'sibling': ('siblings', parse_ids),
+}
+
+
+def build_csr(src, dst, n):
+    """Build (offsets, neighbors) from edge arrays, sorted by source then target."""
+    order = np.lexsort((dst, src))
+    src = src[order]
+    neighbors = dst[order].astype(np.int32)
+    offsets = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+    return offsets, neighbors
+
+
+class IsnadGraph:
+    """CSR adjacency over all scholars with per-relation and combined views."""
+
+    def __init__(self, ids, offsets, neighbors, edge_types):
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int32)
+        self.neighbors = np.asarray(neighbors, dtype=np.int32)
+        self.edge_types = np.asarray(edge_types, dtype=np.uint8)
+        self.index = {int(sid): i for i, sid in enumerate(self.ids)}
+
+    @property
+    def num_nodes(self):
+        return len(self.ids)
+
+    @property
+    def num_edges(self):
+        return len(self.neighbors)
+
+    @classmethod
+    def from_scholars(cls, scholars):
+        """Build the graph from rows loaded by load_scholars()."""
+        ids = np.array(sorted(int(sid) for sid in scholars), dtype=np.int32)
+        index = {str(sid): i for i, sid in enumerate(ids)}
+
+        src, dst, types = [], [], []
+        for sid, person in scholars.items():
+            i = index[sid]
+            for rel, (column, parser) in RELATION_COLUMNS.items():
+                code = RELATION_CODES[rel]
+                for rid in parser(person.get(column, '')):
+                    j = index.get(rid)
+                    if j is not None:
+                        src.append(i)
+                        dst.append(j)
+                        types.append(code)
+
+        src = np.array(src, dtype=np.int64)
+        dst = np.array(dst, dtype=np.int64)
+        types = np.array(types, dtype=np.uint8)
+
+        # Sort by (source, type, target) so each node's edges are grouped by type
+        order = np.lexsort((dst, types, src))
+        offsets = np.zeros(len(ids) + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=len(ids)), out=offsets[1:])
+        return cls(ids, offsets, dst[order], types[order])
+
+    def relation_csr(self, rel):
+        """(offsets, neighbors) restricted to a single relation type."""
+        mask = self.edge_types == RELATION_CODES[rel]
+        src = np.repeat(np.arange(self.num_nodes), np.diff(self.offsets))[mask]
+        return build_csr(src, self.neighbors[mask].astype(np.int64), self.num_nodes)
+
+    def _allowed(self, relations):
+        if relations is None:
+            return None
+        allowed = np.zeros(len(RELATION_TYPES), dtype=bool)
+        allowed[[RELATION_CODES[r] for r in relations]] = True
+        return allowed
+
+    def _expand(self, frontier, allowed):
+        """Return (sources, targets) of every edge leaving the frontier."""
+        starts = self.offsets[frontier]
+        counts = self.offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        # Edge positions for all frontier nodes without a Python loop
+        run_starts = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        positions = run_starts + np.arange(total)
+        sources = np.repeat(frontier, counts)
+        targets = self.neighbors[positions].astype(np.int64)
+        if allowed is not None:
+            keep = allowed[self.edge_types[positions]]
+            sources, targets = sources[keep], targets[keep]
+        return sources, targets
+
+    def neighbors_of(self, scholar_id, relations=None):
+        """Scholar ids directly related to scholar_id."""
+        node = self.index.get(int(scholar_id))
+        if node is None:
+            return []
+        _, targets = self._expand(np.array([node]), self._allowed(relations))
+        return [int(x) for x in self.ids[targets]]
+
+    def k_hop(self, scholar_id, k, relations=('teacher', 'student')):
+        """Map of scholar id -> hop distance for everything within k hops."""
+        node = self.index.get(int(scholar_id))
+        if node is None:
+            return {}
+        allowed = self._allowed(relations)
+        depth = np.full(self.num_nodes, -1, dtype=np.int32)
+        depth[node] = 0
+        frontier = np.array([node], dtype=np.int64)
+        for hop in range(1, k + 1):
+            _, targets = self._expand(frontier, allowed)
+            targets = np.unique(targets)
+            frontier = targets[depth[targets] < 0]
+            if len(frontier) == 0:
+                break
+            depth[frontier] = hop
+        reached = np.flatnonzero(depth >= 0)
+        return dict(zip(self.ids[reached].tolist(), depth[reached].tolist()))
+
+    def shortest_path(self, source_id, target_id, relations=('teacher', 'student'), max_depth=None):
+        """Shortest path of scholar ids from source to target, or None if unreachable."""
+        src = self.index.get(int(source_id))
+        dst = self.index.get(int(target_id))
+        if src is None or dst is None:
+            return None
+        if src == dst:
+            return [int(source_id)]
+
+        allowed = self._allowed(relations)
+        parent = np.full(self.num_nodes, -1, dtype=np.int64)
+        parent[src] = src
+        frontier = np.array([src], dtype=np.int64)
+        depth = 0
+        while len(frontier) and (max_depth is None or depth < max_depth):
+            sources, targets = self._expand(frontier, allowed)
+            fresh = parent[targets] < 0
+            targets, first = np.unique(targets[fresh], return_index=True)
+            parent[targets] = sources[fresh][first]
+            if parent[dst] >= 0:
+                path = [dst]
+                while path[-1] != src:
+                    path.append(int(parent[path[-1]]))
+                return [int(x) for x in self.ids[path[::-1]]]
+            frontier = targets
+            depth += 1
+        return None
+
+    def save(self, output_dir=GRAPH_DIR):
+        """Write the binary arrays plus a JSON header describing their layout."""
+        arrays = [('ids', self.ids.astype('<i4'))]
+        arrays.append(('offsets', self.offsets.astype('<i4')))
+        arrays.append(('neighbors', self.neighbors.astype('<i4')))
+        for rel in RELATION_TYPES:
+            offsets, neighbors = self.relation_csr(rel)
+            arrays.append((f'{rel}.offsets', offsets.astype('<i4')))
+            arrays.append((f'{rel}.neighbors', neighbors.astype('<i4')))
+        # uint8 last so every int32 array stays 4-byte aligned
+        arrays.append(('edge_types', self.edge_types.astype('u1')))
+
+        layout, chunks, offset = {}, [], 0
+        for name, arr in arrays:
+            layout[name] = {"dtype": arr.dtype.str, "offset": offset, "length": int(arr.size)}
+            chunks.append(arr.tobytes())
+            offset += arr.nbytes
+
+        header = {
+            "version": 1,
+            "num_nodes": self.num_nodes,
+            "num_edges": self.num_edges,
+            "relation_types": RELATION_TYPES,
+            "file": GRAPH_BIN,
+            "arrays": layout,
+        }
+        atomic_write_bytes(os.path.join(output_dir, GRAPH_BIN), b''.join(chunks))
+        atomic_write_json(os.path.join(output_dir, GRAPH_HEADER), header)
+        return header
+
+    @classmethod
+    def load(cls, output_dir=GRAPH_DIR):
+        with open(os.path.join(output_dir, GRAPH_HEADER), 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        with open(os.path.join(output_dir, header["file"]), 'rb') as f:
+            blob = f.read()
+
+        def array(name):
+            spec = header["arrays"][name]
+            return np.frombuffer(blob, dtype=spec["dtype"], count=spec["length"], offset=spec["offset"])
+
+        return cls(array('ids'), array('offsets'), array('neighbors'), array('edge_types'))
+
+
+def benchmark(graph, samples=1000, depth=3, seed=0):
+    """Time k-hop BFS from random scholars and print latency percentiles."""
+    rng = random.Random(seed)
+    ids = graph.ids.tolist()
+    timings, reached = [], 0
+    for _ in range(samples):
+        start = time.perf_counter()
+        result = graph.k_hop(rng.choice(ids), depth)
+        timings.append((time.perf_counter() - start) * 1000)
+        reached += len(result)
+    timings.sort()
+    print(f"BFS depth-{depth} over {graph.num_nodes} nodes / {graph.num_edges} edges ({samples} samples):")
+    print(f"   - p50: {timings[len(timings) // 2]:.3f} ms")
+    print(f"   - p99: {timings[int(len(timings) * 0.99)]:.3f} ms")
+    print(f"   - mean reached: {reached / samples:.0f} scholars")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build CSR adjacency artifacts for the scholar graph")
+    parser.add_argument("--scholars-csv", default=os.path.join(DATA_DIR, 'all_rawis.csv'))
+    parser.add_argument("--output-dir", default=GRAPH_DIR)
+    parser.add_argument("--benchmark", action="store_true", help="Run a BFS depth-3 latency benchmark")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    with BuildRun('build_isnad_graph', args.output_dir, profile=args.profile) as run:
+        with run.stage('load_scholars'):
+            print("📚 Loading Scholars Database...")
+            scholars = load_scholars(args.scholars_csv)
+            run.count('rows_read', len(scholars))
+
+        print("🕸️  Building CSR adjacency...")
+        start = time.perf_counter()
+        with run.stage('build_csr'):
+            graph = IsnadGraph.from_scholars(scholars)
+            run.count('edges', graph.num_edges)
+        with run.stage('write'):
+            header = graph.save(args.output_dir)
+            run.count('files_written', 2)
+            run.count('bytes_written', os.path.getsize(os.path.join(args.output_dir, GRAPH_BIN)))
+        elapsed = time.perf_counter() - start
+
+    print(f"\n✅ Graph Complete!")
+    print(f"   - Nodes: {header['num_nodes']}, Edges: {header['num_edges']}")
+    print(f"   - Built in {elapsed:.2f}s")
+    print(f"   - Location: {args.output_dir}")
+
+    if args.benchmark:
+        benchmark(graph)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Stage timing, counters, memory and optional profiling for the build scripts.
+
+Each script opens one BuildRun, wraps its phases in run.stage(...) and bumps
+counters as it goes; when the run ends a JSON report is written to
+<report_dir>/.build-reports/<script>.json next to the artifacts it produced:
+
+    with BuildRun('extract_enhanced_data', OUTPUT_DIR) as run:
+        with run.stage('load_scholars'):
+            scholars = load_scholars(path)
+            run.count('rows_read', len(scholars))
+
+Stage times and counters are inclusive of nested stages. Peak RSS per stage
+is sampled from /proc/self/statm on a background thread (falling back to the
+process high-water mark elsewhere).
+
+Profiling is opt-in through BUILD_PROFILE=cprofile,tracemalloc or a script's
+--profile flag: cProfile stats are dumped to <script>.prof beside the report
+with the top functions summarized in it, tracemalloc adds the top allocation
+sites and the traced peak.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from artifact_io import atomic_write_json
+
+REPORT_DIRNAME = '.build-reports'
+PROFILE_ENV = 'BUILD_PROFILE'
+PROFILERS = ('cprofile', 'tracemalloc')
+SAMPLE_INTERVAL = 0.05
+TOP_N = 25
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def peak_rss_bytes():
+    """Process high-water RSS (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def current_rss_bytes():
+    """Current RSS from /proc, or the high-water mark where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def parse_profile(value):
+    """Normalize 'cprofile,tracemalloc' / a list into a set of known profiler names."""
+    if not value:
+        return set()
+    names = value.split(',') if isinstance(value, str) else value
+    requested = {name.strip().lower() for name in names if name.strip()}
+    unknown = requested - set(PROFILERS)
+    if unknown:
+        raise ValueError(f"Unknown profiler(s) {sorted(unknown)}; expected {PROFILERS}")
+    return requested
+
+
+def add_profile_argument(parser):
+    """Add --profile to a script's argparse parser."""
+    parser.add_argument(
+        "--profile", default=None,
+        help=f"Comma-separated profilers to enable ({', '.join(PROFILERS)}); overrides ${PROFILE_ENV}"
+    )
+
+
+class _RssSampler(threading.Thread):
+    """Background thread raising the 'peak_rss' of every open stage record."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(name='build-metrics-rss', daemon=True)
+        self.interval = interval
+        self.active = []
+        self._stop_event = threading.Event()
+
+    def sample(self):
+        rss = current_rss_bytes()
+        for record in list(self.active):
+            if rss > record['peak_rss']:
+                record['peak_rss'] = rss
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class BuildRun:
+    """Collects stages and counters for one script run and writes its report."""
+
+    def __init__(self, name, report_dir, profile=None):
+        self.name = name
+        self.report_dir = report_dir
+        self.profile = parse_profile(profile if profile is not None else os.environ.get(PROFILE_ENV, ''))
+        self.counters = Counter()
+        self.metrics = {}
+        self.stages = []
+        self.report_path = None
+        self._stack = []
+        self._started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+
+        self._sampler = _RssSampler()
+        self._sampler.start()
+
+        self._profiler = None
+        if 'tracemalloc' in self.profile and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if 'cprofile' in self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(status='failed' if exc_type else 'ok', error=repr(exc) if exc else None)
+        return False
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block; nested stages are recorded as 'outer/inner'."""
+        full_name = f"{self._stack[-1]['name']}/{name}" if self._stack else name
+        record = {
+            "name": full_name,
+            "counters": Counter(),
+            "peak_rss": current_rss_bytes(),
+            "rss_before": current_rss_bytes(),
+        }
+        self._stack.append(record)
+        self.stages.append(record)
+        self._sampler.active.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 6)
+            self._sampler.sample()
+            self._sampler.active.remove(record)
+            self._stack.pop()
+
+    def count(self, name, n=1):
+        """Add n to a run-level counter and to every open stage."""
+        self.counters[name] += n
+        for record in self._stack:
+            record["counters"][name] += n
+
+    def metric(self, name, value):
+        """Record a non-additive value (ratio, size, setting) in the report."""
+        self.metrics[name] = value
+
+    def _profile_summary(self, report_dir):
+        summary = {}
+        if self._profiler is not None:
+            self._profiler.disable()
+            prof_path = os.path.join(report_dir, f"{self.name}.prof")
+            self._profiler.dump_stats(prof_path)
+            stream = io.StringIO()
+            pstats.Stats(self._profiler, stream=stream).sort_stats('cumulative').print_stats(TOP_N)
+            summary["cprofile"] = {"stats_file": prof_path, "top_cumulative": stream.getvalue().splitlines()}
+        if 'tracemalloc' in self.profile and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            _, traced_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            summary["tracemalloc"] = {
+                "peak_bytes": traced_peak,
+                "top_lines": [
+                    {"location": str(stat.traceback[0]), "bytes": stat.size, "blocks": stat.count}
+                    for stat in snapshot.statistics('lineno')[:TOP_N]
+                ],
+            }
+        return summary
+
+    def finish(self, status='ok', error=None, **extra):
+        """Stop sampling/profiling and write the report; safe to call once."""
+        if self.report_path:
+            return self.report_path
+        self._sampler.stop()
+        report_dir = os.path.join(self.report_dir, REPORT_DIRNAME)
+        os.makedirs(report_dir, exist_ok=True)
+
+        stages = []
+        for record in self.stages:
+            stages.append({
+                "name": record["name"],
+                "seconds": record.get("seconds"),
+                "peak_rss_mb": round(record["peak_rss"] / (1024 * 1024), 1),
+                "rss_delta_mb": round((record["peak_rss"] - record["rss_before"]) / (1024 * 1024), 1),
+                "counters": dict(record["counters"]),
+            })
+
+        report = {
+            "script": self.name,
+            "status": status,
+            "started_at": self._started_at.isoformat(timespec='seconds'),
+            "seconds": round(time.perf_counter() - self._start, 6),
+            "peak_rss_mb": round(peak_rss_bytes() / (1024 * 1024), 1),
+            "python": sys.version.split()[0],
+            "argv": sys.argv,
+            "counters": dict(self.counters),
+            "metrics": self.metrics,
+            "stages": stages,
+        }
+        if error:
+            report["error"] = error
+        report.update(extra)
+        report.update(self._profile_summary(report_dir))
+
+        self.report_path = os.path.join(report_dir, f"{self.name}.json")
+        atomic_write_json(self.report_path, report)
+        print(f"📊 Run report: {self.report_path} ({report['seconds']:.1f}s, peak {report['peak_rss_mb']} MB)")
+        return self.report_path
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Build orchestrator for the data pipeline.
+
+Every build script is declared as a stage with the files it reads and writes.
+Dependencies follow from those declarations: a stage depends on the latest
+earlier stage that writes one of its inputs or outputs, so the in-place CSV
+enrichment scripts stay ordered and everything downstream of the CSVs waits
+for them.
+
+A stage is skipped when its outputs exist and neither its inputs (including
+its own scripts) nor its outputs changed since it last succeeded. Files are
+fingerprinted by content hash, directories by (path, size, mtime) of their
+files. Fingerprints are kept in .build-cache/pipeline-state.json under the
+build root. Independent stages run concurrently, each as a separate process
+with cwd = build root, which is the layout every script expects.
+
+Usage:
+    python scripts/build_pipeline.py                   # build everything that is stale
+    python scripts/build_pipeline.py convert_to_sqlite # one target plus its dependencies
+    python scripts/build_pipeline.py --enrich          # include the CSV enrichment scripts
+    python scripts/build_pipeline.py --dry-run
+    python scripts/build_pipeline.py --watch           # rebuild when source data changes
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import List
+
+from artifact_io import atomic_write_json, load_json, sha256_file
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = os.path.join('.build-cache', 'pipeline-state.json')
+WATCH_INTERVAL = 2.0
+
+RAWIS_CSV = 'data-processing/data/all_rawis.csv'
+HADITHS_CSV = 'data-processing/data/all_hadiths_clean.csv'
+JSON_SOURCE = 'data-processing/data/json_source'
+HADITH_REGISTRY = 'data-processing/data/hadith-ids.sqlite'
+SITEMAP_STATE = 'data-processing/data/sitemap-lastmod.sqlite'
+DATA_DIR = 'public/data'
+
+
+@dataclass
+class Stage:
+    name: str
+    script: str
+    inputs: List[str]
+    outputs: List[str]
+    args: List[str] = field(default_factory=list)
+    # Extra modules the script imports; edits to them invalidate the stage too
+    modules: List[str] = field(default_factory=list)
+    group: str = 'build'
+
+    @property
+    def sources(self):
+        return [os.path.join(SCRIPTS_DIR, f) for f in [self.script, *self.modules]]
+
+
+# Declaration order is a valid execution order
+STAGES = [
+    Stage('map_usc_msa_refs', 'map_usc_msa_refs.py',
+          inputs=[HADITHS_CSV, JSON_SOURCE], outputs=[HADITHS_CSV],
+          modules=['text_normalize.py', 'build_metrics.py'], group='enrich'),
+    Stage('fill_missing_english', 'fill_missing_english.py',
+          inputs=[HADITHS_CSV, JSON_SOURCE], outputs=[HADITHS_CSV],
+          modules=['text_normalize.py', 'build_metrics.py'], group='enrich'),
+    Stage('fill_from_duplicates', 'fill_from_duplicates.py',
+          inputs=[HADITHS_CSV], outputs=[HADITHS_CSV],
+          modules=['build_metrics.py'], group='enrich'),
+    Stage('extract_enhanced_data', 'extract_enhanced_data.py',
+          inputs=[RAWIS_CSV, HADITHS_CSV],
+          outputs=[f'{DATA_DIR}/search-index.json', f'{DATA_DIR}/scholars',
+                   f'{DATA_DIR}/hadiths', f'{DATA_DIR}/scholar-lookup', f'{DATA_DIR}/name-index', HADITH_REGISTRY],
+          modules=['build_transmission_graph.py', 'rank_narrators.py', 'scholar_lookup.py', 'name_index.py',
+                   'biography_parser.py', 'hadith_registry.py', 'hadith_search.py', 'text_normalize.py',
+                   'artifact_io.py', 'build_metrics.py']),
+    Stage('build_isnad_graph', 'build_isnad_graph.py',
+          inputs=[RAWIS_CSV],
+          outputs=[f'{DATA_DIR}/graph/isnad-graph.bin', f'{DATA_DIR}/graph/isnad-graph.json'],
+          modules=['extract_enhanced_data.py', 'biography_parser.py', 'name_index.py', 'hadith_search.py',
+                   'text_normalize.py', 'artifact_io.py', 'build_metrics.py']),
+    Stage('timeline_index', 'timeline_index.py',
+          inputs=[RAWIS_CSV],
+          outputs=[f'{DATA_DIR}/timeline/lifespans.bin', f'{DATA_DIR}/timeline/lifespans.json'],
+          modules=['extract_enhanced_data.py', 'biography_parser.py', 'name_index.py', 'hadith_search.py',
+                   'text_normalize.py', 'artifact_io.py', 'build_metrics.py']),
+    Stage('generate_hadith_index', 'generate_hadith_index.py',
+          inputs=[HADITHS_CSV, f'{DATA_DIR}/search-index.json', HADITH_REGISTRY,
+                  f'{DATA_DIR}/timeline/lifespans.bin', f'{DATA_DIR}/timeline/lifespans.json'],
+          outputs=[f'{DATA_DIR}/hadith-index.json', f'{DATA_DIR}/hadith-records.ndjson',
+                   f'{DATA_DIR}/hadith-records.idx', f'{DATA_DIR}/hadith-search'],
+          modules=['isnad_analytics.py', 'timeline_index.py', 'extract_enhanced_data.py', 'biography_parser.py',
+                   'name_index.py', 'hadith_lookup.py', 'hadith_registry.py', 'hadith_search.py',
+                   'hadith_parallels.py', 'hadith_related.py', 'text_normalize.py', 'artifact_io.py',
+                   'build_metrics.py']),
+    Stage('split_locales', 'split_locales.py',
+          inputs=[f'{DATA_DIR}/scholars', f'{DATA_DIR}/search-index.json'],
+          outputs=[f'{DATA_DIR}/scholars-core', f'{DATA_DIR}/locales'],
+          modules=['artifact_io.py', 'build_metrics.py']),
+    Stage('build_sitemaps', 'build_sitemaps.py',
+          inputs=[f'{DATA_DIR}/search-index.json', f'{DATA_DIR}/scholars', f'{DATA_DIR}/scholar-lookup',
+                  f'{DATA_DIR}/hadith-records.ndjson'],
+          outputs=['public/sitemap.xml', 'public/sitemaps', SITEMAP_STATE],
+          modules=['artifact_io.py', 'build_metrics.py']),
+    Stage('convert_to_sqlite', 'convert_to_sqlite.py',
+          inputs=[f'{DATA_DIR}/scholars', f'{DATA_DIR}/search-index.json', f'{DATA_DIR}/hadith-index.json',
+                  HADITH_REGISTRY],
+          outputs=['public/scholars.db'],
+          args=['--output', 'public/scholars.db.tmp'],
+          modules=['hadith_registry.py', 'timeline_index.py', 'extract_enhanced_data.py', 'biography_parser.py',
+                   'name_index.py', 'hadith_search.py', 'build_metrics.py', 'text_normalize.py', 'artifact_io.py']),
+]
+
+# Publishing copies everything the stages above serve from public/, so it runs last
+STAGES.append(Stage(
+    'publish_artifacts', 'publish_artifacts.py',
+    inputs=[DATA_DIR] + sorted({path for stage in STAGES for path in stage.outputs
+                                if path.startswith(f'{DATA_DIR}/') or path == 'public/scholars.db'}),
+    outputs=['public/immutable', 'public/data-manifest.json'],
+    modules=['hadith_search.py', 'text_normalize.py', 'artifact_io.py', 'build_metrics.py'],
+))
+STAGES.append(Stage(
+    'build_deltas', 'build_deltas.py',
+    inputs=['public/data-manifest.json'], outputs=['public/deltas'],
+    modules=['publish_artifacts.py', 'hadith_search.py', 'text_normalize.py', 'artifact_io.py', 'build_metrics.py'],
+))
+
+# convert_to_sqlite appends to an existing file, so it writes a fresh temp
+# database that replaces the old one only on success
+POST_STEPS = {
+    'convert_to_sqlite': lambda root: os.replace(
+        os.path.join(root, 'public/scholars.db.tmp'), os.path.join(root, 'public/scholars.db')
+    ),
+}
+PRE_STEPS = {
+    'convert_to_sqlite': lambda root: os.path.exists(os.path.join(root, 'public/scholars.db.tmp'))
+    and os.remove(os.path.join(root, 'public/scholars.db.tmp')),
+}
+
+
+def fingerprint(path, root):
+    """Content hash for files, (path, size, mtime) hash for directories, 'missing' otherwise."""
+    full = os.path.join(root, path)
+    if os.path.isfile(full):
+        return sha256_file(full)
+    if os.path.isdir(full):
+        digest = hashlib.sha256()
+        for dirpath, dirnames, filenames in os.walk(full):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+            for name in sorted(filenames):
+                if name.startswith('.'):
+                    continue
+                st = os.stat(os.path.join(dirpath, name))
+                rel = os.path.relpath(os.path.join(dirpath, name), full)
+                digest.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode('utf-8'))
+        return 'dir:' + digest.hexdigest()
+    return 'missing'
+
+
+def input_fingerprints(stage, root):
+    prints = {path: fingerprint(path, root) for path in stage.inputs}
+    prints.update({os.path.relpath(src, SCRIPTS_DIR): sha256_file(src) for src in stage.sources})
+    prints['args'] = ' '.join(stage.args)
+    return prints
+
+
+def output_fingerprints(stage, root):
+    return {path: fingerprint(path, root) for path in stage.outputs}
+
+
+def select_stages(targets=None, enrich=False):
+    """Stages to consider: the requested targets plus everything they depend on."""
+    stages = [s for s in STAGES if enrich or s.group != 'enrich']
+    if not targets:
+        return stages
+    by_name = {s.name: s for s in stages}
+    unknown = set(targets) - set(by_name)
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+    deps = dependencies(stages)
+    wanted, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(deps[name])
+    return [s for s in stages if s.name in wanted]
+
+
+def dependencies(stages):
+    """name -> set of stage names it must wait for."""
+    deps = {}
+    for i, stage in enumerate(stages):
+        deps[stage.name] = set()
+        for path in stage.inputs + stage.outputs:
+            for earlier in reversed(stages[:i]):
+                if path in earlier.outputs:
+                    deps[stage.name].add(earlier.name)
+                    break
+    return deps
+
+
+def is_fresh(stage, root, state):
+    record = state.get(stage.name)
+    if not record:
+        return False
+    if any(fingerprint(path, root) == 'missing' for path in stage.outputs):
+        return False
+    return (record.get('inputs') == input_fingerprints(stage, root)
+            and record.get('outputs') == output_fingerprints(stage, root))
+
+
+def run_stage(stage, root, log_dir):
+    """Run a stage script in its own process; returns (ok, seconds, log path)."""
+    log_path = os.path.join(log_dir, f"{stage.name}.log")
+    if stage.name in PRE_STEPS:
+        PRE_STEPS[stage.name](root)
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        proc = subprocess.run(
+            [sys.executable, os.path.join(SCRIPTS_DIR, stage.script), *stage.args],
+            cwd=root, stdout=log, stderr=subprocess.STDOUT
+        )
+    ok = proc.returncode == 0
+    if ok and stage.name in POST_STEPS:
+        POST_STEPS[stage.name](root)
+    return ok, time.perf_counter() - start, log_path
+
+
+def build(root='.', targets=None, enrich=False, force=False, jobs=None, dry_run=False):
+    """Run stale stages in dependency order; returns True when nothing failed."""
+    root = os.path.abspath(root)
+    stages = select_stages(targets, enrich)
+    deps = dependencies(stages)
+    state_path = os.path.join(root, STATE_PATH)
+    state = load_json(state_path, {})
+    log_dir = os.path.join(root, os.path.dirname(STATE_PATH), 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+
+    pending = {s.name: s for s in stages}
+    done, failed, ran = set(), set(), set()
+    jobs = jobs or min(4, os.cpu_count() or 1)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        running = {}
+        while pending or running:
+            # Start every stage whose dependencies are settled
+            for name, stage in list(pending.items()):
+                if not deps[name] <= (done | failed):
+                    continue
+                del pending[name]
+                blocked = deps[name] & failed
+                if blocked:
+                    print(f"⏭️  {name}: skipped (failed dependency {', '.join(sorted(blocked))})")
+                    failed.add(name)
+                elif not force and not (deps[name] & ran) and is_fresh(stage, root, state):
+                    print(f"✓  {name}: up to date")
+                    done.add(name)
+                elif dry_run:
+                    print(f"•  {name}: would run")
+                    done.add(name)
+                    ran.add(name)
+                else:
+                    print(f"▶️  {name}: running")
+                    running[pool.submit(run_stage, stage, root, log_dir)] = stage
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                ok, seconds, log_path = future.result()
+                if ok:
+                    state[stage.name] = {
+                        "inputs": input_fingerprints(stage, root),
+                        "outputs": output_fingerprints(stage, root),
+                        "seconds": round(seconds, 3),
+                        "finished_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    }
+                    atomic_write_json(state_path, state)
+                    done.add(stage.name)
+                    ran.add(stage.name)
+                    print(f"✅ {stage.name}: done in {seconds:.1f}s")
+                else:
+                    state.pop(stage.name, None)
+                    atomic_write_json(state_path, state)
+                    failed.add(stage.name)
+                    print(f"❌ {stage.name}: failed after {seconds:.1f}s (log: {log_path})")
+
+    print(f"\nBuild finished: {len(ran)} ran, {len(done) - len(ran)} up to date, {len(failed)} failed")
+    return not failed
+
+
+def source_signature(root, stages):
+    """Cheap (size, mtime) snapshot of the inputs no stage produces, for --watch."""
+    produced = {path for stage in stages for path in stage.outputs}
+    paths = {path for stage in stages for path in stage.inputs if path not in produced}
+    paths |= {src for stage in stages for src in stage.sources}
+    signature = []
+    for path in sorted(paths):
+        full = os.path.join(root, path)
+        if os.path.isdir(full):
+            for dirpath, _, filenames in os.walk(full):
+                for name in filenames:
+                    st = os.stat(os.path.join(dirpath, name))
+                    signature.append((os.path.join(dirpath, name), st.st_size, st.st_mtime_ns))
+        elif os.path.exists(full):
+            st = os.stat(full)
+            signature.append((full, st.st_size, st.st_mtime_ns))
+    return signature
+
+
+def watch(root, interval=WATCH_INTERVAL, **options):
+    """Rebuild whenever source data or stage scripts change; Ctrl-C to stop."""
+    stages = select_stages(options.get('targets'), options.get('enrich', False))
+    build(root, **options)
+    last = source_signature(root, stages)
+    print(f"\n👀 Watching sources (every {interval:g}s)...")
+    try:
+        while True:
+            time.sleep(interval)
+            current = source_signature(root, stages)
+            if current != last:
+                print("\n🔁 Change detected, rebuilding...")
+                build(root, **options)
+                # Enrichment rewrites the CSVs, so re-snapshot after the build
+                last = source_signature(root, stages)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build data artifacts, skipping stages that are up to date")
+    parser.add_argument("targets", nargs='*', help="Stages to build (default: all); dependencies are included")
+    parser.add_argument("--root", default='.', help="Project root the scripts run from")
+    parser.add_argument("--enrich", action="store_true", help="Also run the in-place CSV enrichment scripts")
+    parser.add_argument("--force", action="store_true", help="Run stages even if they are up to date")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Stages to run concurrently")
+    parser.add_argument("--dry-run", action="store_true", help="Only report which stages would run")
+    parser.add_argument("--watch", action="store_true", help="Keep running and rebuild on source changes")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="Watch polling interval (s)")
+    parser.add_argument("--list", action="store_true", help="List stages with their dependencies")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        stages = select_stages(None, enrich=True)
+        deps = dependencies(stages)
+        for stage in stages:
+            after = ', '.join(sorted(deps[stage.name])) or '-'
+            print(f"{stage.name:<24} [{stage.group}] after: {after}")
+        return 0
+
+    options = dict(targets=args.targets, enrich=args.enrich, force=args.force,
+                   jobs=args.jobs, dry_run=args.dry_run)
+    if args.watch:
+        watch(args.root, args.interval, **options)
+        return 0
+    return 0 if build(args.root, **options) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Sharded, gzipped sitemaps for every scholar and hadith page in every locale.
+
+app/sitemap.ts used to JSON.parse all of search-index.json and hadith-index.json
+on request, emitted /en/ URLs only and stamped every entry with new Date(), so
+crawlers saw the whole site as changed on each deploy. This script runs after
+the data build and writes static files instead:
+
+- public/sitemaps/{kind}-{n}.xml.gz: at most MAX_URLS <url> entries each
+  (the sitemaps.org limit), one per page per locale
+- public/sitemap.xml: the sitemap index robots.txt points to
+
+Ids are streamed, never materialized: scholars one scholar-lookup shard at a
+time, hadiths one hadith-records.ndjson line at a time, and each shard is
+gzipped as it is written. Memory stays flat however large the corpus gets.
+
+<lastmod> comes from content, not the clock. Every page's artifact
+(scholars/{id}.json, its hadith record line) is hashed; the hash and the date
+it was first seen are kept in data-processing/data/sitemap-lastmod.sqlite next
+to the hadith id registry. A page's lastmod only moves when its hash changes.
+Output is byte-identical for unchanged data (gzip mtime is pinned to 0).
+
+Usage:
+    python scripts/build_sitemaps.py
+    python scripts/build_sitemaps.py --base-url https://example.org
+    python scripts/build_sitemaps.py --date 2024-01-01   # date stamped on changed pages
+"""
+
+import argparse
+import datetime
+import glob
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import sys
+from xml.sax.saxutils import escape
+
+from artifact_io import atomic_write_bytes, sha256_file
+from build_metrics import BuildRun, add_profile_argument
+
+DATA_DIR = 'public/data'
+PUBLIC_DIR = 'public'
+SITEMAP_DIR = os.path.join(PUBLIC_DIR, 'sitemaps')
+INDEX_PATH = os.path.join(PUBLIC_DIR, 'sitemap.xml')
+STATE_PATH = 'data-processing/data/sitemap-lastmod.sqlite'
+
+# Locales served by i18n/routing.ts
+LOCALES = ['en', 'ar', 'ckb']
+BASE_URL = os.environ.get('NEXT_PUBLIC_BASE_URL', 'https://sahih-explorer.com')
+MAX_URLS = 50000
+# State lookups and updates are batched; bounds memory per batch
+BATCH_SIZE = 2048
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_OPEN = '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+
+STATE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS lastmod (
+        page TEXT PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        lastmod TEXT NOT NULL
+    ) WITHOUT ROWID
+"""
+
+
+def iter_scholar_pages(data_dir=DATA_DIR):
+    """(page, content hash) for every scholar, in id order, one lookup shard in memory."""
+    lookup_dir = os.path.join(data_dir, 'scholar-lookup')
+    with open(os.path.join(lookup_dir, 'index.json'), 'r', encoding='utf-8') as f:
+        header = json.load(f)
+    shard_size = header['shard_size']
+    for shard in sorted(header['shards']):
+        with open(os.path.join(lookup_dir, f"{shard}.json"), 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        for slot, row in enumerate(rows):
+            if row is None:
+                continue
+            scholar_id = shard * shard_size + slot
+            path = os.path.join(data_dir, 'scholars', f"{scholar_id}.json")
+            digest = sha256_file(path) if os.path.exists(path) else 'missing'
+            yield f"scholar/{scholar_id}", digest
+
+
+def iter_hadith_pages(data_dir=DATA_DIR):
+    """(page, content hash) for every hadith, in hadith-index order, one record in memory."""
+    with open(os.path.join(data_dir, 'hadith-records.ndjson'), 'rb') as f:
+        for line in f:
+            line = line.rstrip(b'\n')
+            if not line:
+                continue
+            hadith_id = json.loads(line)['id']
+            yield f"hadith/{hadith_id}", hashlib.sha256(line).hexdigest()
+
+
+def static_pages(data_dir=DATA_DIR):
+    """Locale home pages; their content follows search-index.json."""
+    path = os.path.join(data_dir, 'search-index.json')
+    yield '', sha256_file(path) if os.path.exists(path) else 'missing'
+
+
+class LastmodState:
+    """page -> (content hash, date first seen with that hash)."""
+
+    def __init__(self, path=STATE_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(STATE_SCHEMA)
+        self.changed = 0
+        self.unchanged = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        self.conn.close()
+
+    def resolve(self, pages, today):
+        """Yield (page, lastmod) for (page, hash) pairs, recording new hashes as of today."""
+        batch = []
+        for item in pages:
+            batch.append(item)
+            if len(batch) >= BATCH_SIZE:
+                yield from self._resolve_batch(batch, today)
+                batch = []
+        if batch:
+            yield from self._resolve_batch(batch, today)
+
+    def _resolve_batch(self, batch, today):
+        keys = [page for page, _ in batch]
+        placeholders = ','.join('?' * len(keys))
+        known = {page: (digest, lastmod) for page, digest, lastmod in self.conn.execute(
+            f"SELECT page, content_hash, lastmod FROM lastmod WHERE page IN ({placeholders})", keys
+        )}
+        updates = []
+        for page, digest in batch:
+            previous = known.get(page)
+            if previous is not None and previous[0] == digest:
+                self.unchanged += 1
+                yield page, previous[1]
+            else:
+                self.changed += 1
+                updates.append((page, digest, today))
+                yield page, today
+        if updates:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO lastmod (page, content_hash, lastmod) VALUES (?, ?, ?)", updates
+                )
+
+
+class ShardWriter:
+    """Write <url> entries to {kind}-{n}.xml.gz files of at most max_urls entries."""
+
+    def __init__(self, kind, output_dir=SITEMAP_DIR, max_urls=MAX_URLS):
+        self.kind = kind
+        self.output_dir = output_dir
+        self.max_urls = max_urls
+        self.shards = []  # (file name, newest lastmod)
+        self.urls = 0
+        self._buffer = None
+        self._gzip = None
+        self._count = 0
+        self._newest = ''
+
+    def add(self, loc, lastmod):
+        if self._gzip is None:
+            self._open()
+        self._gzip.write(
+            f"<url><loc>{escape(loc)}</loc><lastmod>{lastmod}</lastmod></url>\n".encode('utf-8')
+        )
+        self._count += 1
+        self.urls += 1
+        self._newest = max(self._newest, lastmod)
+        if self._count >= self.max_urls:
+            self._close()
+
+    def _open(self):
+        self._buffer = io.BytesIO()
+        # mtime=0 keeps the bytes reproducible for unchanged input
+        self._gzip = gzip.GzipFile(filename='', mode='wb', fileobj=self._buffer, mtime=0)
+        self._gzip.write((XML_HEADER + URLSET_OPEN).encode('utf-8'))
+        self._count = 0
+        self._newest = ''
+
+    def _close(self):
+        self._gzip.write(b'</urlset>\n')
+        self._gzip.close()
+        name = f"{self.kind}-{len(self.shards)}.xml.gz"
+        atomic_write_bytes(os.path.join(self.output_dir, name), self._buffer.getvalue())
+        self.shards.append((name, self._newest))
+        self._buffer = self._gzip = None
+
+    def finish(self):
+        if self._gzip is not None:
+            self._close()
+        return self.shards
+
+
+def write_sitemaps(state, base_url=BASE_URL, data_dir=DATA_DIR, output_dir=SITEMAP_DIR,
+                   index_path=INDEX_PATH, today=None, max_urls=MAX_URLS):
+    """Write every shard plus the index; returns {kind: url count} and the shard list."""
+    today = today or datetime.date.today().isoformat()
+    base_url = base_url.rstrip('/')
+    site_path = '/' + os.path.relpath(output_dir, os.path.dirname(index_path)).replace(os.sep, '/')
+    sources = [
+        ('pages', static_pages(data_dir)),
+        ('scholars', iter_scholar_pages(data_dir)),
+        ('hadiths', iter_hadith_pages(data_dir)),
+    ]
+
+    counts = {}
+    shards = []
+    for kind, pages in sources:
+        writer = ShardWriter(kind, output_dir, max_urls)
+        for page, lastmod in state.resolve(pages, today):
+            for locale in LOCALES:
+                writer.add(f"{base_url}/{locale}/{page}".rstrip('/'), lastmod)
+        shards.extend(writer.finish())
+        counts[kind] = writer.urls
+
+    # Shards from a larger previous build would otherwise linger in the index directory
+    current = {name for name, _ in shards}
+    for path in glob.glob(os.path.join(output_dir, '*.xml.gz')):
+        if os.path.basename(path) not in current:
+            os.remove(path)
+
+    index = [XML_HEADER, INDEX_OPEN]
+    for name, newest in shards:
+        index.append(f"<sitemap><loc>{escape(f'{base_url}{site_path}/{name}')}</loc>"
+                     f"<lastmod>{newest}</lastmod></sitemap>\n")
+    index.append('</sitemapindex>\n')
+    atomic_write_bytes(index_path, ''.join(index).encode('utf-8'))
+    return counts, shards
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write sharded sitemaps and the sitemap index")
+    parser.add_argument("--base-url", default=BASE_URL, help="Site origin (default: $NEXT_PUBLIC_BASE_URL)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory with the built data artifacts")
+    parser.add_argument("--state", default=STATE_PATH, help="Lastmod state database")
+    parser.add_argument("--date", help="Date recorded for changed pages (default: today)")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    with BuildRun('build_sitemaps', args.data_dir, profile=args.profile) as run:
+        with run.stage('write'), LastmodState(args.state) as state:
+            counts, shards = write_sitemaps(state, args.base_url, args.data_dir, today=args.date)
+            for kind, urls in counts.items():
+                run.count(f"{kind}_urls", urls)
+            run.count('shards_written', len(shards))
+            run.count('pages_changed', state.changed)
+            run.count('pages_unchanged', state.unchanged)
+
+    print(f"Wrote {sum(counts.values())} URLs in {len(shards)} shards to {SITEMAP_DIR} "
+          f"({state.changed} pages changed, {state.unchanged} unchanged)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Materialize the narrator-to-narrator transmission graph from hadith chains.
+
+Each consecutive pair in a hadith's chain_indx is a transmission edge: chains
+are stored from the compiler's shaykh back towards the Prophet, so
+chain[i + 1] transmitted to chain[i]. All edges from the whole corpus are
+gathered into flat numpy arrays and summed into a weighted sparse matrix in a
+single COO -> CSR conversion (rows = transmitter, columns = receiver, value =
+number of hadiths carried over that link).
+
+extract_enhanced_data.py embeds the per-narrator top-k lists into each scholar
+JSON, and convert_to_sqlite.py loads them into scholar_transmissions.
+
+Usage:
+    python scripts/build_transmission_graph.py
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+
+from build_metrics import BuildRun, add_profile_argument
+
+DATA_DIR = 'data-processing/data'
+TOP_K = 10
+
+
+def load_chains(filepath):
+    """Read only the chain_indx column as lists of id strings."""
+    chains = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            chain = row.get('chain_indx', '') or ''
+            chains.append([x.strip() for x in chain.split(',') if x.strip()])
+    return chains
+
+
+def load_scholar_ids(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return [row['scholar_indx'] for row in csv.DictReader(f)]
+
+
+def build_transmission_matrix(chains, scholar_ids):
+    """
+    Build the weighted transmitter -> receiver matrix.
+
+    Returns (matrix, ids, stats) where ids[i] is the scholar id of row/column i.
+    Edges touching ids that are not in the scholars table, and self-loops,
+    are dropped and counted in stats.
+    """
+    ids = np.array(sorted({int(sid) for sid in scholar_ids}), dtype=np.int64)
+    n = len(ids)
+
+    lengths = np.fromiter((len(c) for c in chains), dtype=np.int64, count=len(chains))
+    flat = np.fromiter(
+        (int(x) if x.isdigit() else -1 for chain in chains for x in chain),
+        dtype=np.int64, count=int(lengths.sum())
+    )
+    hadith_of = np.repeat(np.arange(len(chains)), lengths)
+
+    # Map raw scholar ids to node indexes (-1 when unknown)
+    pos = np.minimum(np.searchsorted(ids, flat), max(n - 1, 0))
+    nodes = np.where((n > 0) & (ids[pos] == flat), pos, -1)
+
+    # Consecutive pairs inside the same chain: receiver = chain[i], transmitter = chain[i + 1]
+    same_chain = hadith_of[1:] == hadith_of[:-1]
+    receivers = nodes[:-1][same_chain]
+    transmitters = nodes[1:][same_chain]
+    known = (receivers >= 0) & (transmitters >= 0)
+    not_loop = transmitters != receivers
+    keep = known & not_loop
+
+    matrix = sparse.coo_matrix(
+        (np.ones(int(keep.sum()), dtype=np.int32), (transmitters[keep], receivers[keep])),
+        shape=(n, n)
+    ).tocsr()
+    matrix.sum_duplicates()
+
+    stats = {
+        "chains": len(chains),
+        "links": int(same_chain.sum()),
+        "unknown_links": int((~known).sum()),
+        "self_loops": int((known & ~not_loop).sum()),
+        "edges": int(matrix.nnz),
+    }
+    return matrix, ids, stats
+
+
+def top_k_per_row(matrix, ids, k=TOP_K):
+    """For each row, the k heaviest (scholar id, weight) pairs, ties broken by id."""
+    result = {}
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+    for row in np.flatnonzero(np.diff(indptr)):
+        start, end = indptr[row], indptr[row + 1]
+        cols, weights = indices[start:end], data[start:end]
+        order = np.lexsort((ids[cols], -weights))[:k]
+        result[str(ids[row])] = [(str(ids[cols[i]]), int(weights[i])) for i in order]
+    return result
+
+
+def build_transmission_summary(chains, scholar_ids, k=TOP_K):
+    """
+    Per-narrator top-k receivers and transmitters.
+
+    Returns (summary, stats) where summary maps scholar id to
+    {"transmitted_to": [(id, hadith_count), ...], "received_from": [...]}.
+    """
+    matrix, ids, stats = build_transmission_matrix(chains, scholar_ids)
+    transmitted_to = top_k_per_row(matrix, ids, k)
+    received_from = top_k_per_row(matrix.T.tocsr(), ids, k)
+
+    summary = {}
+    for sid in set(transmitted_to) | set(received_from):
+        summary[sid] = {
+            "transmitted_to": transmitted_to.get(sid, []),
+            "received_from": received_from.get(sid, []),
+        }
+    return summary, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the weighted chain transmission graph")
+    parser.add_argument("--hadiths-csv", default=os.path.join(DATA_DIR, 'all_hadiths_clean.csv'))
+    parser.add_argument("--scholars-csv", default=os.path.join(DATA_DIR, 'all_rawis.csv'))
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    with BuildRun('build_transmission_graph', DATA_DIR, profile=args.profile) as run:
+        print("📜 Loading chains...")
+        with run.stage('load') as stage:
+            chains = load_chains(args.hadiths_csv)
+            scholar_ids = load_scholar_ids(args.scholars_csv)
+            run.count('rows_read', len(chains) + len(scholar_ids))
+
+        print("🔗 Building transmission graph...")
+        with run.stage('coo_to_csr') as matrix_stage:
+            matrix, ids, stats = build_transmission_matrix(chains, scholar_ids)
+            run.count('edges', stats['edges'])
+
+        with run.stage('top_k') as summary_stage:
+            transmitted_to = top_k_per_row(matrix, ids, args.top_k)
+            received_from = top_k_per_row(matrix.T.tocsr(), ids, args.top_k)
+    load_time = stage['seconds']
+    matrix_time = matrix_stage['seconds']
+    summary_time = summary_stage['seconds']
+
+    print(f"\n✅ Transmission Graph Complete!")
+    print(f"   - Chains: {stats['chains']}, consecutive links: {stats['links']}")
+    print(f"   - Weighted edges: {stats['edges']} "
+          f"(dropped {stats['unknown_links']} unknown-id links, {stats['self_loops']} self-loops)")
+    print(f"   - Narrators who transmitted: {len(transmitted_to)}, who received: {len(received_from)}")
+    print(f"   - Timing: load {load_time:.2f}s, COO->CSR {matrix_time:.3f}s, "
+          f"top-{args.top_k} summary {summary_time:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
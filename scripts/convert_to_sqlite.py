@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Convert JSON scholar data to SQLite database with normalized schema.
-This script processes 24,326 scholar JSON files and creates a relational database.
+This script processes 24,326 scholar JSON files plus hadith-index.json and
+creates a relational database.
 """
 
 import json
@@ -12,17 +13,52 @@ from pathlib import Path
 from typing import Dict, List, Any
 import argparse
 
+from build_metrics import BuildRun, add_profile_argument
+from hadith_registry import REGISTRY_PATH, HadithIdRegistry
+from timeline_index import MAX_LIFESPAN, UNKNOWN, lifespan, pair_status
+
+# scholar_relationships.relationship_type -> key in the page data / scholar JSON
+RELATION_KEYS = {
+    "parent": "parents",
+    "child": "children",
+    "spouse": "spouses",
+    "sibling": "siblings",
+    "teacher": "teachers",
+    "student": "students",
+}
+
+# Narrators alive in a Hijri year (bind the year three times). No interval is
+# longer than MAX_LIFESPAN, so the start_year bound turns it into an index range.
+ALIVE_IN_YEAR_SQL = f"""
+    SELECT scholar_id FROM scholar_lifespans
+    WHERE start_year BETWEEN ? - {MAX_LIFESPAN} AND ? AND end_year >= ?
+"""
+
 
 class ScholarDatabaseConverter:
-    def __init__(self, data_dir: str, output_db: str):
+    def __init__(self, data_dir: str, output_db: str, profile: str = None,
+                 registry_path: str = REGISTRY_PATH, strict_foreign_keys: bool = False):
         self.data_dir = Path(data_dir)
+        self.strict_foreign_keys = strict_foreign_keys
         self.output_db = output_db
+        self.registry_path = registry_path
+        self.hadith_ids = {}
+        self.ranks = {}
+        self.profile = profile
         self.conn = None
         self.cursor = None
+        self.run = None
         self.stats = {
             "scholars_processed": 0,
             "hadiths_processed": 0,
             "relationships_created": 0,
+            "transmissions_created": 0,
+            "isnad_records": 0,
+            "parallels_created": 0,
+            "foreign_key_violations": 0,
+            "summaries_created": 0,
+            "lifespans_indexed": 0,
+            "implausible_pairs": 0,
             "errors": [],
         }
 
@@ -43,7 +79,14 @@ class ScholarDatabaseConverter:
                 death_date_hijri TEXT,
                 death_date_gregorian TEXT,
                 death_place TEXT,
-                death_reason TEXT
+                death_reason TEXT,
+                birth_year_hijri INTEGER,
+                birth_year_gregorian INTEGER,
+                death_year_hijri INTEGER,
+                death_year_gregorian INTEGER,
+                influence_score INTEGER,
+                pagerank REAL,
+                weighted_degree INTEGER
             )
         """)
 
@@ -54,6 +97,34 @@ class ScholarDatabaseConverter:
                 scholar_id INTEGER NOT NULL,
                 related_scholar_id INTEGER NOT NULL,
                 relationship_type TEXT NOT NULL,
+                contemporary INTEGER,
+                FOREIGN KEY (scholar_id) REFERENCES scholars(id),
+                FOREIGN KEY (related_scholar_id) REFERENCES scholars(id)
+            )
+        """)
+
+        # Hijri lifespan intervals, filled by build_lifespans() (see timeline_index.py):
+        # a missing birth or death is estimated, so every interval is at most
+        # MAX_LIFESPAN years long and "alive in Y" is a start_year range scan
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scholar_lifespans (
+                scholar_id INTEGER PRIMARY KEY,
+                start_year INTEGER NOT NULL,
+                end_year INTEGER NOT NULL,
+                estimated INTEGER NOT NULL,
+                FOREIGN KEY (scholar_id) REFERENCES scholars(id)
+            )
+        """)
+
+        # Chain transmissions (top-k narrators per direction, weighted by hadith count)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scholar_transmissions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scholar_id INTEGER NOT NULL,
+                related_scholar_id INTEGER NOT NULL,
+                direction TEXT NOT NULL,
+                hadith_count INTEGER NOT NULL,
+                rank INTEGER NOT NULL,
                 FOREIGN KEY (scholar_id) REFERENCES scholars(id),
                 FOREIGN KEY (related_scholar_id) REFERENCES scholars(id)
             )
@@ -93,12 +164,27 @@ class ScholarDatabaseConverter:
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS hadiths (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
+                public_id TEXT UNIQUE,
                 hadith_no TEXT NOT NULL,
                 source TEXT NOT NULL,
                 chapter TEXT,
                 chapter_no TEXT,
                 text_ar TEXT,
-                text_en TEXT
+                text_en TEXT,
+                parallel_cluster INTEGER
+            )
+        """)
+
+        # Parallel narrations (near-duplicate matns, from hadith-index.json)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS hadith_parallels (
+                hadith_id INTEGER NOT NULL,
+                parallel_id INTEGER NOT NULL,
+                similarity REAL NOT NULL,
+                rank INTEGER NOT NULL,
+                PRIMARY KEY (hadith_id, parallel_id),
+                FOREIGN KEY (hadith_id) REFERENCES hadiths(id),
+                FOREIGN KEY (parallel_id) REFERENCES hadiths(id)
             )
         """)
 
@@ -114,6 +200,55 @@ class ScholarDatabaseConverter:
             )
         """)
 
+        # Precomputed isnad analytics (one row per hadith, from hadith-index.json)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS hadith_isnad (
+                hadith_id INTEGER PRIMARY KEY,
+                chain_length INTEGER NOT NULL,
+                narrator_ids TEXT NOT NULL,
+                weakest_narrator_id INTEGER,
+                weakest_grade TEXT,
+                weakest_rank INTEGER,
+                is_continuous INTEGER NOT NULL,
+                unverified_links INTEGER NOT NULL,
+                has_unknown_narrator INTEGER NOT NULL,
+                FOREIGN KEY (hadith_id) REFERENCES hadiths(id)
+            )
+        """)
+
+        # Materialized per-scholar page data, filled by build_summary_tables()
+        # after the load: relation counts and packed [id, name, grade] lists,
+        # hadith counts per collection and the biography lists, as JSON
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scholar_summary (
+                scholar_id INTEGER PRIMARY KEY,
+                parent_count INTEGER NOT NULL DEFAULT 0,
+                child_count INTEGER NOT NULL DEFAULT 0,
+                spouse_count INTEGER NOT NULL DEFAULT 0,
+                sibling_count INTEGER NOT NULL DEFAULT 0,
+                teacher_count INTEGER NOT NULL DEFAULT 0,
+                student_count INTEGER NOT NULL DEFAULT 0,
+                hadith_count INTEGER NOT NULL DEFAULT 0,
+                hadith_counts TEXT NOT NULL DEFAULT '{}',
+                relations TEXT NOT NULL DEFAULT '{}',
+                places TEXT NOT NULL DEFAULT '[]',
+                interests TEXT NOT NULL DEFAULT '[]',
+                tags TEXT NOT NULL DEFAULT '[]',
+                FOREIGN KEY (scholar_id) REFERENCES scholars(id)
+            )
+        """)
+
+        # Distinct hadiths per scholar and collection (hadith_chains -> hadiths, pre-joined)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scholar_hadith_counts (
+                scholar_id INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                hadith_count INTEGER NOT NULL,
+                PRIMARY KEY (scholar_id, source),
+                FOREIGN KEY (scholar_id) REFERENCES scholars(id)
+            ) WITHOUT ROWID
+        """)
+
         # Create indexes for performance
         print("Creating indexes...")
         self.cursor.execute(
@@ -122,6 +257,18 @@ class ScholarDatabaseConverter:
         self.cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_scholar_grade ON scholars(grade)"
         )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scholar_pagerank ON scholars(pagerank DESC)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scholar_death_year ON scholars(death_year_hijri)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scholar_birth_year ON scholars(birth_year_hijri)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_lifespan_years ON scholar_lifespans(start_year, end_year)"
+        )
         self.cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_relationship_scholar ON scholar_relationships(scholar_id)"
         )
@@ -131,15 +278,27 @@ class ScholarDatabaseConverter:
         self.cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_relationship_type ON scholar_relationships(relationship_type)"
         )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_transmission_scholar ON scholar_transmissions(scholar_id, direction)"
+        )
         self.cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_hadith_source ON hadiths(source)"
         )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_hadith_isnad_weakest ON hadith_isnad(weakest_rank)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_hadith_parallel_cluster ON hadiths(parallel_cluster)"
+        )
         self.cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_hadith_chain_hadith ON hadith_chains(hadith_id)"
         )
         self.cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_hadith_chain_scholar ON hadith_chains(scholar_id)"
         )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_hadith_counts_source ON scholar_hadith_counts(source, hadith_count DESC)"
+        )
 
         # Full-text search virtual table for scholar names
         self.cursor.execute("""
@@ -164,14 +323,17 @@ class ScholarDatabaseConverter:
             bio = scholar_data.get("biography", {})
             birth = bio.get("birth", {})
             death = bio.get("death", {})
+            rank = self.ranks.get(str(scholar_id), {})
 
             # Insert main scholar record
             self.cursor.execute(
                 """
                 INSERT OR REPLACE INTO scholars 
                 (id, name, full_name, grade, birth_date_hijri, birth_date_gregorian, 
-                 birth_place, death_date_hijri, death_date_gregorian, death_place, death_reason)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 birth_place, death_date_hijri, death_date_gregorian, death_place, death_reason,
+                 birth_year_hijri, birth_year_gregorian, death_year_hijri, death_year_gregorian,
+                 influence_score, pagerank, weighted_degree)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
                 (
                     scholar_id,
@@ -185,6 +347,13 @@ class ScholarDatabaseConverter:
                     death.get("date_gregorian", ""),
                     death.get("place", ""),
                     death.get("reason", ""),
+                    birth.get("year_hijri"),
+                    birth.get("year_gregorian"),
+                    death.get("year_hijri"),
+                    death.get("year_gregorian"),
+                    rank.get("score"),
+                    rank.get("pagerank"),
+                    rank.get("weighted_degree"),
                 ),
             )
 
@@ -242,6 +411,13 @@ class ScholarDatabaseConverter:
                 scholar_id, scholar_data.get("students", []), "student"
             )
 
+            # Insert chain transmissions
+            transmissions = scholar_data.get("transmissions", {})
+            for direction in ("received_from", "transmitted_to"):
+                self._insert_transmissions(
+                    scholar_id, transmissions.get(direction, []), direction
+                )
+
             self.stats["scholars_processed"] += 1
             return True
 
@@ -269,43 +445,147 @@ class ScholarDatabaseConverter:
             except Exception as e:
                 self.stats["errors"].append(f"Error creating relationship: {str(e)}")
 
-    def insert_hadiths(self, scholar_id: int, hadiths: List[Dict]):
-        """Insert hadiths and their chains."""
-        for hadith in hadiths:
+    def _insert_transmissions(
+        self, scholar_id: int, related_scholars: List[Dict], direction: str
+    ):
+        """Insert ranked transmission records."""
+        for rank, related in enumerate(related_scholars):
             try:
-                # Insert hadith
                 self.cursor.execute(
                     """
-                    INSERT INTO hadiths (hadith_no, source, chapter, chapter_no, text_ar, text_en)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    INSERT INTO scholar_transmissions
+                    (scholar_id, related_scholar_id, direction, hadith_count, rank)
+                    VALUES (?, ?, ?, ?, ?)
                 """,
                     (
-                        hadith.get("hadith_no", ""),
-                        hadith.get("source", ""),
-                        hadith.get("chapter", ""),
-                        hadith.get("chapter_no", ""),
-                        hadith.get("text_ar", ""),
-                        hadith.get("text_en", ""),
+                        scholar_id,
+                        int(related["id"]),
+                        direction,
+                        int(related.get("hadith_count", 0)),
+                        rank,
                     ),
                 )
+                self.stats["transmissions_created"] += 1
+            except Exception as e:
+                self.stats["errors"].append(f"Error creating transmission: {str(e)}")
 
-                hadith_id = self.cursor.lastrowid
+    def insert_hadith(self, hadith: Dict[str, Any]):
+        """Insert one hadith-index entry with its chain and isnad analytics."""
+        try:
+            self.cursor.execute(
+                """
+                INSERT INTO hadiths (id, public_id, hadith_no, source, chapter, chapter_no, text_ar, text_en)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    self.hadith_ids.get(hadith.get("id")),
+                    hadith.get("id"),
+                    hadith.get("hadith_no", ""),
+                    hadith.get("source", ""),
+                    hadith.get("chapter", ""),
+                    hadith.get("chapter_no", ""),
+                    hadith.get("matn", ""),
+                    hadith.get("matn_en", ""),
+                ),
+            )
 
-                # Insert chain of narration
-                chain = hadith.get("chain", [])
-                for position, narrator_id in enumerate(chain):
-                    self.cursor.execute(
-                        """
-                        INSERT INTO hadith_chains (hadith_id, scholar_id, position)
-                        VALUES (?, ?, ?)
-                    """,
-                        (hadith_id, int(narrator_id), position),
-                    )
+            hadith_id = self.cursor.lastrowid
+            isnad = hadith.get("isnad") or {}
 
-                self.stats["hadiths_processed"] += 1
+            # Insert chain of narration
+            chain = isnad.get("narrator_ids") or [n["id"] for n in hadith.get("narrators", [])]
+            for position, narrator_id in enumerate(chain):
+                self.cursor.execute(
+                    """
+                    INSERT INTO hadith_chains (hadith_id, scholar_id, position)
+                    VALUES (?, ?, ?)
+                """,
+                    (hadith_id, int(narrator_id), position),
+                )
 
-            except Exception as e:
-                self.stats["errors"].append(f"Error processing hadith: {str(e)}")
+            if isnad:
+                weakest = isnad.get("weakest_narrator_id")
+                self.cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO hadith_isnad
+                    (hadith_id, chain_length, narrator_ids, weakest_narrator_id, weakest_grade,
+                     weakest_rank, is_continuous, unverified_links, has_unknown_narrator)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        hadith_id,
+                        isnad.get("length", len(chain)),
+                        ",".join(chain),
+                        int(weakest) if weakest else None,
+                        isnad.get("weakest_grade"),
+                        isnad.get("weakest_rank"),
+                        int(bool(isnad.get("is_continuous"))),
+                        isnad.get("unverified_links", 0),
+                        int(bool(isnad.get("has_unknown_narrator"))),
+                    ),
+                )
+                self.stats["isnad_records"] += 1
+
+            self.stats["hadiths_processed"] += 1
+
+        except Exception as e:
+            self.stats["errors"].append(
+                f"Error processing hadith {hadith.get('id', 'unknown')}: {str(e)}"
+            )
+
+    def insert_parallels(self, hadith_index: List[Dict[str, Any]]):
+        """Resolve parallel_cluster / parallels (public ids) to hadith rows once all are loaded."""
+        row_ids = dict(self.cursor.execute("SELECT public_id, id FROM hadiths"))
+        clusters, parallels = [], []
+        for hadith in hadith_index:
+            hadith_id = row_ids.get(hadith.get("id"))
+            if hadith_id is None:
+                continue
+            cluster_id = row_ids.get(hadith.get("parallel_cluster"))
+            if cluster_id is not None:
+                clusters.append((cluster_id, hadith_id))
+            for rank, parallel in enumerate(hadith.get("parallels") or []):
+                parallel_id = row_ids.get(parallel["id"])
+                if parallel_id is not None:
+                    parallels.append((hadith_id, parallel_id, parallel["similarity"], rank))
+
+        self.cursor.executemany("UPDATE hadiths SET parallel_cluster = ? WHERE id = ?", clusters)
+        self.cursor.executemany(
+            """
+            INSERT OR IGNORE INTO hadith_parallels (hadith_id, parallel_id, similarity, rank)
+            VALUES (?, ?, ?, ?)
+        """,
+            parallels,
+        )
+        self.stats["parallels_created"] = len(parallels)
+
+    def process_hadith_index(self):
+        """Load hadiths, chains and isnad analytics from hadith-index.json."""
+        index_path = self.data_dir / "hadith-index.json"
+        if not index_path.exists():
+            print(f"Skipping hadiths: {index_path} not found")
+            return
+
+        with open(index_path, "r", encoding="utf-8") as f:
+            hadith_index = json.load(f)
+        self.run.count("hadiths_read", len(hadith_index))
+
+        # Registry ids keep hadiths.id stable across rebuilds; without it SQLite numbers rows
+        if os.path.exists(self.registry_path):
+            with HadithIdRegistry(self.registry_path, readonly=True) as registry:
+                self.hadith_ids = registry.numeric_ids()
+        else:
+            print(f"Warning: {self.registry_path} not found, hadith ids will follow file order")
+
+        print(f"Found {len(hadith_index)} hadiths to process...")
+        for idx, hadith in enumerate(hadith_index, 1):
+            self.insert_hadith(hadith)
+            if idx % 5000 == 0:
+                print(f"Processed {idx}/{len(hadith_index)} hadiths...")
+                self.conn.commit()
+
+        self.insert_parallels(hadith_index)
+        self.conn.commit()
 
     def process_all_scholars(self):
         """Process all scholar JSON files."""
@@ -315,6 +595,13 @@ class ScholarDatabaseConverter:
             print(f"Error: Scholars directory not found at {scholars_dir}")
             return False
 
+        # Graph centrality lives in the search index only (see rank_narrators.py)
+        search_index_path = self.data_dir / "search-index.json"
+        if search_index_path.exists():
+            with open(search_index_path, "r", encoding="utf-8") as f:
+                self.ranks = {str(entry["id"]): entry for entry in json.load(f)}
+            self.run.count("files_read")
+
         json_files = list(scholars_dir.glob("*.json"))
         total_files = len(json_files)
 
@@ -324,15 +611,11 @@ class ScholarDatabaseConverter:
             try:
                 with open(json_file, "r", encoding="utf-8") as f:
                     data = json.load(f)
+                self.run.count("files_read")
 
                 # Insert scholar
                 self.insert_scholar(data)
 
-                # Insert hadiths if present
-                hadiths = data.get("hadiths", [])
-                if hadiths:
-                    self.insert_hadiths(int(data["id"]), hadiths)
-
                 # Progress indicator
                 if idx % 1000 == 0:
                     print(f"Processed {idx}/{total_files} scholars...")
@@ -342,7 +625,148 @@ class ScholarDatabaseConverter:
                 self.stats["errors"].append(f"Error reading {json_file}: {str(e)}")
 
         self.conn.commit()
-        print(f"\nProcessing complete!")
+        return True
+
+    def build_summary_tables(self):
+        """Fill scholar_summary / scholar_hadith_counts from the loaded tables."""
+        print("Building summary tables...")
+        self.cursor.execute("DELETE FROM scholar_hadith_counts")
+        self.cursor.execute("""
+            INSERT INTO scholar_hadith_counts (scholar_id, source, hadith_count)
+            SELECT hc.scholar_id, h.source, COUNT(DISTINCT hc.hadith_id)
+            FROM hadith_chains hc
+            INNER JOIN hadiths h ON h.id = hc.hadith_id
+            INNER JOIN scholars s ON s.id = hc.scholar_id
+            GROUP BY hc.scholar_id, h.source
+        """)
+
+        summaries = {
+            scholar_id: {"relations": {key: [] for key in RELATION_KEYS.values()},
+                         "hadith_counts": {}, "places": [], "interests": [], "tags": []}
+            for (scholar_id,) in self.cursor.execute("SELECT id FROM scholars")
+        }
+        # Same rows, in the same order, as the per-type queries in lib/database/queries.ts
+        for scholar_id, rel_type, related_id, name, grade in self.cursor.execute("""
+            SELECT sr.scholar_id, sr.relationship_type, s.id, s.name, s.grade
+            FROM scholar_relationships sr
+            INNER JOIN scholars s ON s.id = sr.related_scholar_id
+            ORDER BY sr.scholar_id, sr.id
+        """):
+            if scholar_id in summaries and rel_type in RELATION_KEYS:
+                summaries[scholar_id]["relations"][RELATION_KEYS[rel_type]].append([related_id, name, grade])
+        for table, column, key in (("scholar_places", "place", "places"),
+                                   ("scholar_interests", "interest", "interests"),
+                                   ("scholar_tags", "tag", "tags")):
+            for scholar_id, value in self.cursor.execute(
+                f"SELECT scholar_id, {column} FROM {table} ORDER BY scholar_id, id"
+            ):
+                if scholar_id in summaries:
+                    summaries[scholar_id][key].append(value)
+        for scholar_id, source, count in self.cursor.execute(
+            "SELECT scholar_id, source, hadith_count FROM scholar_hadith_counts ORDER BY scholar_id, source"
+        ):
+            summaries[scholar_id]["hadith_counts"][source] = count
+
+        def pack(value):
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+        self.cursor.execute("DELETE FROM scholar_summary")
+        self.cursor.executemany(
+            """
+            INSERT INTO scholar_summary
+            (scholar_id, parent_count, child_count, spouse_count, sibling_count, teacher_count,
+             student_count, hadith_count, hadith_counts, relations, places, interests, tags)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                (
+                    scholar_id,
+                    *(len(summary["relations"][key]) for key in
+                      ("parents", "children", "spouses", "siblings", "teachers", "students")),
+                    sum(summary["hadith_counts"].values()),
+                    pack(summary["hadith_counts"]),
+                    pack(summary["relations"]),
+                    pack(summary["places"]),
+                    pack(summary["interests"]),
+                    pack(summary["tags"]),
+                )
+                for scholar_id, summary in summaries.items()
+            ),
+        )
+        self.conn.commit()
+        self.stats["summaries_created"] = len(summaries)
+
+    def build_lifespans(self):
+        """Fill scholar_lifespans and mark teacher/student rows as contemporary (1/0, NULL if unknown)."""
+        print("Building lifespan intervals...")
+        spans = {}
+        for scholar_id, birth_year, death_year in self.cursor.execute(
+            "SELECT id, birth_year_hijri, death_year_hijri FROM scholars"
+        ):
+            span = lifespan(birth_year, death_year)
+            if span is not None:
+                spans[scholar_id] = span
+        self.cursor.execute("DELETE FROM scholar_lifespans")
+        self.cursor.executemany(
+            "INSERT INTO scholar_lifespans (scholar_id, start_year, end_year, estimated) VALUES (?, ?, ?, ?)",
+            ((scholar_id, start, end, flags) for scholar_id, (start, end, flags) in spans.items()),
+        )
+
+        # A "teacher" row is (learner, teacher), a "student" row (teacher, learner)
+        updates = []
+        for row_id, scholar_id, related_id, rel_type in self.cursor.execute("""
+            SELECT id, scholar_id, related_scholar_id, relationship_type
+            FROM scholar_relationships
+            WHERE relationship_type IN ('teacher', 'student')
+        """).fetchall():
+            learner, teacher = (scholar_id, related_id) if rel_type == "teacher" else (related_id, scholar_id)
+            status = pair_status(spans.get(learner), spans.get(teacher))
+            updates.append((None if status == UNKNOWN else status, row_id))
+        self.cursor.executemany("UPDATE scholar_relationships SET contemporary = ? WHERE id = ?", updates)
+        self.conn.commit()
+        self.stats["lifespans_indexed"] = len(spans)
+        self.stats["implausible_pairs"] = sum(1 for status, _ in updates if status == 0)
+
+    def enforce_foreign_keys(self):
+        """
+        Drop rows that reference missing scholars/hadiths, then enable FK checks.
+
+        Every dropped row is reported (table, rowid, missing key); with
+        strict_foreign_keys any violation fails the conversion instead.
+        """
+        violations = self.cursor.execute("PRAGMA foreign_key_check").fetchall()
+        self.stats["foreign_key_violations"] = len(violations)
+        if not violations:
+            self.cursor.execute("PRAGMA foreign_keys = ON")
+            return True
+
+        columns = {}
+        by_table = {}
+        for table, rowid, parent, fkid in violations:
+            if table not in columns:
+                columns[table] = {row[0]: row[3] for row in self.cursor.execute(f"PRAGMA foreign_key_list({table})")}
+            column = columns[table][fkid]
+            (missing,) = self.cursor.execute(f"SELECT {column} FROM {table} WHERE rowid = ?", (rowid,)).fetchone()
+            by_table.setdefault(table, []).append((rowid, f"{column}={missing} (no {parent} row)"))
+
+        print(f"⚠️  {len(violations)} rows reference missing scholars/hadiths:")
+        for table, rows in sorted(by_table.items()):
+            print(f"  {table}: {len(rows)} rows")
+            for rowid, reason in rows[:10]:
+                print(f"    - rowid {rowid}: {reason}")
+            if len(rows) > 10:
+                print(f"    ... and {len(rows) - 10} more")
+            self.run.count(f"dangling_{table}", len(rows))
+
+        if self.strict_foreign_keys:
+            self.stats["errors"].append(f"{len(violations)} foreign key violations (--strict-foreign-keys)")
+            return False
+
+        for table, rowid, _parent, _fkid in violations:
+            self.cursor.execute(f"DELETE FROM {table} WHERE rowid = ?", (rowid,))
+        self.conn.commit()
+        print(f"⚠️  Dropped {len(violations)} dangling rows (use --strict-foreign-keys to fail instead)")
+        self.cursor.execute("PRAGMA foreign_keys = ON")
         return True
 
     def print_stats(self):
@@ -352,7 +776,14 @@ class ScholarDatabaseConverter:
         print("=" * 60)
         print(f"Scholars processed: {self.stats['scholars_processed']}")
         print(f"Hadiths processed: {self.stats['hadiths_processed']}")
+        print(f"Isnad analytics records: {self.stats['isnad_records']}")
         print(f"Relationships created: {self.stats['relationships_created']}")
+        print(f"Transmissions created: {self.stats['transmissions_created']}")
+        print(f"Parallel narration links: {self.stats['parallels_created']}")
+        print(f"Dangling references dropped: {self.stats['foreign_key_violations']}")
+        print(f"Scholar summaries built: {self.stats['summaries_created']}")
+        print(f"Lifespans indexed: {self.stats['lifespans_indexed']}")
+        print(f"Implausible teacher/student links: {self.stats['implausible_pairs']}")
         print(f"Errors encountered: {len(self.stats['errors'])}")
 
         if self.stats["errors"]:
@@ -385,6 +816,9 @@ class ScholarDatabaseConverter:
         print(f"✓ Hadiths in database: {hadith_count}")
         print(f"✓ Relationships in database: {relationship_count}")
 
+        alive = self.cursor.execute(ALIVE_IN_YEAR_SQL, (100, 100, 100)).fetchall()
+        print(f"✓ Narrators alive in 100 AH: {len(alive)}")
+
         # Test a query
         self.cursor.execute("""
             SELECT s.name, COUNT(h.id) as hadith_count
@@ -402,24 +836,49 @@ class ScholarDatabaseConverter:
 
     def convert(self):
         """Main conversion process."""
+        self.run = BuildRun("convert_to_sqlite", str(self.data_dir), profile=self.profile)
+        success = False
         try:
             # Connect to database
             print(f"Creating database: {self.output_db}")
             self.conn = sqlite3.connect(self.output_db)
             self.cursor = self.conn.cursor()
 
-            # Enable foreign keys
-            self.cursor.execute("PRAGMA foreign_keys = ON")
+            # Foreign keys are checked once after the bulk load: scholar files
+            # arrive in arbitrary order, so a per-row check would reject links
+            # to scholars that simply have not been inserted yet.
+            self.cursor.execute("PRAGMA foreign_keys = OFF")
 
             # Create schema
-            self.create_schema()
+            with self.run.stage("create_schema"):
+                self.create_schema()
 
             # Process all scholars
-            success = self.process_all_scholars()
+            with self.run.stage("scholars"):
+                success = self.process_all_scholars()
 
             if success:
+                with self.run.stage("hadiths"):
+                    self.process_hadith_index()
+                print(f"\nProcessing complete!")
+
+                with self.run.stage("enforce_foreign_keys"):
+                    success = self.enforce_foreign_keys()
+                if not success:
+                    print("\n✗ Conversion failed: dangling references")
+                    self.print_stats()
+                    return False
+
+                with self.run.stage("lifespans"):
+                    self.build_lifespans()
+
+                # Summaries read the cleaned tables, so they come after the FK pass
+                with self.run.stage("summary_tables"):
+                    self.build_summary_tables()
+
                 # Validate
-                self.validate_database()
+                with self.run.stage("validate"):
+                    self.validate_database()
 
                 # Print stats
                 self.print_stats()
@@ -432,10 +891,81 @@ class ScholarDatabaseConverter:
 
         except Exception as e:
             print(f"\n✗ Fatal error: {str(e)}")
+            self.stats["errors"].append(f"Fatal error: {str(e)}")
             return False
         finally:
             if self.conn:
                 self.conn.close()
+            for key, value in self.stats.items():
+                self.run.count(key, len(value) if key == "errors" else value)
+            if os.path.exists(self.output_db):
+                self.run.count("bytes_written", os.path.getsize(self.output_db))
+            self.run.finish(status="ok" if success else "failed")
+
+
+# Statements lib/database/queries.ts issues to assemble one scholar page, per
+# strategy (the hadith list itself is the same query either way and left out)
+LEGACY_PAGE_QUERIES = [
+    "SELECT * FROM scholars WHERE id = ?",
+    *[
+        f"""SELECT s.id, s.name, s.grade
+            FROM scholars s
+            INNER JOIN scholar_relationships sr ON s.id = sr.related_scholar_id
+            WHERE sr.scholar_id = ? AND sr.relationship_type = '{rel_type}'"""
+        for rel_type in RELATION_KEYS
+    ],
+    "SELECT place FROM scholar_places WHERE scholar_id = ?",
+    "SELECT interest FROM scholar_interests WHERE scholar_id = ?",
+    "SELECT tag FROM scholar_tags WHERE scholar_id = ?",
+    """SELECT h.source, COUNT(DISTINCT h.id)
+       FROM hadith_chains hc
+       INNER JOIN hadiths h ON h.id = hc.hadith_id
+       WHERE hc.scholar_id = ?
+       GROUP BY h.source""",
+]
+SUMMARY_PAGE_QUERIES = [
+    """SELECT s.*, ss.*
+       FROM scholars s
+       LEFT JOIN scholar_summary ss ON ss.scholar_id = s.id
+       WHERE s.id = ?""",
+]
+
+
+def benchmark_page_queries(db_path: str, sample_size: int = 2000, seed: int = 0):
+    """Time scholar page assembly with per-table queries vs the summary row."""
+    import random
+    import time
+
+    conn = sqlite3.connect(db_path)
+    ids = [row[0] for row in conn.execute("SELECT id FROM scholars")]
+    sample = random.Random(seed).sample(ids, min(sample_size, len(ids)))
+
+    results = {}
+    for label, statements in (("legacy", LEGACY_PAGE_QUERIES), ("summary", SUMMARY_PAGE_QUERIES)):
+        for scholar_id in sample[:50]:  # warm the page cache
+            for sql in statements:
+                conn.execute(sql, (scholar_id,)).fetchall()
+        latencies = []
+        for scholar_id in sample:
+            start = time.perf_counter()
+            for sql in statements:
+                conn.execute(sql, (scholar_id,)).fetchall()
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        results[label] = {
+            "queries_per_page": len(statements),
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+            "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        }
+    conn.close()
+
+    print(f"Scholar page assembly over {len(sample)} scholars:")
+    for label, result in results.items():
+        print(f"  {label:<8} {result['queries_per_page']:>2} queries/page  "
+              f"mean {result['mean_ms']:.3f} ms  p95 {result['p95_ms']:.3f} ms")
+    speedup = results["legacy"]["mean_ms"] / max(results["summary"]["mean_ms"], 1e-9)
+    print(f"  summary tables: {speedup:.1f}x faster")
+    return results
 
 
 def main():
@@ -449,12 +979,32 @@ def main():
     parser.add_argument(
         "--validate-only", action="store_true", help="Only validate existing database"
     )
+    parser.add_argument(
+        "--hadith-registry", default=REGISTRY_PATH, help="Hadith id registry (see hadith_registry.py)"
+    )
+    parser.add_argument(
+        "--benchmark", action="store_true",
+        help="Compare scholar page query count/latency with and without the summary tables"
+    )
+    parser.add_argument(
+        "--strict-foreign-keys", action="store_true",
+        help="Fail instead of dropping rows that reference missing scholars/hadiths"
+    )
+    add_profile_argument(parser)
 
     args = parser.parse_args()
 
-    converter = ScholarDatabaseConverter(args.data_dir, args.output)
+    converter = ScholarDatabaseConverter(
+        args.data_dir, args.output, profile=args.profile, registry_path=args.hadith_registry,
+        strict_foreign_keys=args.strict_foreign_keys
+    )
 
-    if args.validate_only:
+    if args.benchmark:
+        if not os.path.exists(args.output):
+            print(f"Database not found: {args.output}")
+            sys.exit(1)
+        benchmark_page_queries(args.output)
+    elif args.validate_only:
         if os.path.exists(args.output):
             converter.conn = sqlite3.connect(args.output)
             converter.cursor = converter.conn.cursor()
@@ -1,16 +1,29 @@
+import argparse
 import csv
 import json
 import re
 import os
+import sys
+import time
 from datetime import datetime
 
+import biography_parser
+from artifact_io import atomic_write_bytes, atomic_write_json
+from biography_parser import parse_biography, parse_date_list, parse_reliability_grade
+from build_metrics import BuildRun
+from build_transmission_graph import build_transmission_summary
+from hadith_registry import REGISTRY_PATH, HadithIdRegistry
+from name_index import NAME_INDEX_DIR, write_name_index
+from rank_narrators import compute_narrator_ranks
+from scholar_lookup import LOOKUP_DIR, write_scholar_lookup
+from text_normalize import clean_name
+
 # Configuration
 DATA_DIR = 'data-processing/data'
 OUTPUT_DIR = 'public/data'
 SCHOLARS_DIR = os.path.join(OUTPUT_DIR, 'scholars')
-
-# Ensure output directories exist
-os.makedirs(SCHOLARS_DIR, exist_ok=True)
+HADITHS_DIR = os.path.join(OUTPUT_DIR, 'hadiths')
+HADITH_PAGE_SIZE = 25
 
 def parse_ids(id_str):
     """Extract IDs from strings like 'Name [ID], Name2 [ID2]'"""
@@ -19,47 +32,33 @@ def parse_ids(id_str):
     ids = re.findall(r'\[(\d+)\]', id_str)
     return ids
 
+def parse_inds(inds_str):
+    """Parse index lists like '12, 34, 56', ignoring 'NA' and blanks"""
+    if not inds_str or inds_str == 'NA':
+        return []
+    return [x.strip() for x in inds_str.split(',') if x.strip().isdigit()]
+
+def get_learning_pairs(scholars):
+    """(learner_id, teacher_id) pairs from both teachers_inds and students_inds"""
+    pairs = []
+    for scholar_id, person in scholars.items():
+        for teacher_id in parse_inds(person.get('teachers_inds', '')):
+            pairs.append((scholar_id, teacher_id))
+        for student_id in parse_inds(person.get('students_inds', '')):
+            pairs.append((student_id, scholar_id))
+    return pairs
+
 def parse_date_field(date_str):
     """Parse date fields that may contain lists like "['28 BH', '596 CE']" """
-    if not date_str or date_str == 'NA':
-        return None
-    try:
-        # Handle string representation of lists
-        if date_str.startswith('['):
-            dates = eval(date_str)
-            return dates if isinstance(dates, list) else [date_str]
-    except:
-        pass
-    return [date_str]
-
-def clean_name(name):
-    """Extract clean name without Arabic text and honorifics"""
-    name = str(name)
-    # Remove content in parentheses (usually Arabic or honorifics)
-    clean = re.sub(r'\([^)]*\)', '', name)
-    # Remove extra whitespace
-    clean = ' '.join(clean.split())
-    return clean.strip()
+    return parse_date_list(date_str)
 
 def extract_reliability_grade(area_of_interest_str):
     """Extract reliability grade from area_of_interest field (e.g., 'Narrator[Grade:Thiqah]')"""
-    if not area_of_interest_str or area_of_interest_str == 'NA':
-        return None
-    
-    # Match pattern: Narrator[Grade:XXX]
-    match = re.search(r'Narrator\[Grade:([^\]]+)\]', str(area_of_interest_str))
-    if match:
-        return match.group(1).strip()
-    return None
+    return parse_reliability_grade(area_of_interest_str)
 
 def parse_tags(tags_str):
     """Parse tags field which contains space-separated tags with URLs"""
-    if not tags_str or tags_str == 'NA':
-        return []
-    
-    # Extract tag names (text before the URL in brackets)
-    tags = re.findall(r'([^,\[]+)\s*\[', tags_str)
-    return [tag.strip() for tag in tags if tag.strip()]
+    return biography_parser.parse_tags(tags_str)
 
 def load_scholars(filepath):
     """Load all scholars into a dictionary"""
@@ -83,79 +82,219 @@ def resolve_person_names(id_list, scholars):
             })
     return persons
 
-def get_enhanced_scholar_data(target_id, scholars, all_hadiths):
-    """Get comprehensive data for a single scholar"""
+def resolve_weighted_persons(pairs, scholars, summaries=None):
+    """Resolve (id, hadith_count) pairs to person objects with names and counts"""
+    persons = []
+    for person_id, hadith_count in pairs:
+        if summaries is not None:
+            if person_id in summaries:
+                persons.append({**summaries[person_id], "hadith_count": hadith_count})
+        elif person_id in scholars:
+            person = scholars[person_id]
+            persons.append({
+                "id": person_id,
+                "name": clean_name(person['name']),
+                "grade": person.get('grade', ''),
+                "hadith_count": hadith_count
+            })
+    return persons
+
+# Relation key in scholar JSON -> (CSV column, id parser)
+RELATION_COLUMNS = [
+    ('parents', 'parents', parse_ids),
+    ('spouses', 'spouse', parse_ids),
+    ('siblings', 'siblings', parse_ids),
+    ('children', 'children', parse_ids),
+    ('teachers', 'teachers_inds', parse_inds),
+    ('students', 'students_inds', parse_inds),
+]
+
+def build_person_summaries(scholars):
+    """Clean every name once: id -> {"id", "name", "grade"}, shared by every list that mentions the person"""
+    return {
+        scholar_id: {"id": scholar_id, "name": clean_name(person['name']), "grade": person.get('grade', '')}
+        for scholar_id, person in scholars.items()
+    }
+
+def build_relation_index(scholars, summaries):
+    """Parse each relation column once: id -> {relation: tuple of person summaries}"""
+    return {
+        scholar_id: {
+            relation: tuple(summaries[rid] for rid in parser(person.get(column, '')) if rid in summaries)
+            for relation, column, parser in RELATION_COLUMNS
+        }
+        for scholar_id, person in scholars.items()
+    }
+
+def benchmark_emit_loop(scholars, hadiths_by_scholar, transmissions):
+    """Time building every scholar file's data with per-call resolution against the precomputed
+    summaries/relation index, index build included; returns (legacy_s, indexed_s, index_build_s)"""
+    def emit(summaries=None, relations=None):
+        # Both passes start with cold biography caches
+        for parser in biography_parser.CACHED_PARSERS:
+            parser.cache_clear()
+        for scholar_id in scholars:
+            get_enhanced_scholar_data(scholar_id, scholars, hadiths_by_scholar, transmissions,
+                                      summaries=summaries, relations=relations)
+    
+    start = time.perf_counter()
+    emit()
+    legacy = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    summaries = build_person_summaries(scholars)
+    relations = build_relation_index(scholars, summaries)
+    index_build = time.perf_counter() - start
+    emit(summaries, relations)
+    indexed = time.perf_counter() - start
+    return legacy, indexed, index_build
+
+def group_hadiths_by_scholar(all_hadiths):
+    """Map each narrator id to the hadiths whose chain includes them, in corpus order"""
+    groups = {}
+    for hadith in all_hadiths:
+        for narrator_id in dict.fromkeys(hadith['chain']):
+            groups.setdefault(narrator_id, []).append(hadith)
+    return groups
+
+def count_by_collection(person_hadiths):
+    """Number of hadiths per source collection"""
+    counts = {}
+    for hadith in person_hadiths:
+        counts[hadith['source']] = counts.get(hadith['source'], 0) + 1
+    return counts
+
+def get_enhanced_scholar_data(target_id, scholars, hadiths_by_scholar, transmissions=None,
+                              summaries=None, relations=None):
+    """Get comprehensive data for a single scholar
+    
+    summaries/relations come from build_person_summaries/build_relation_index;
+    without them names are cleaned and relation columns parsed on every call.
+    """
     if target_id not in scholars:
         return None
     
     person = scholars[target_id]
     
-    # Parse biographical data
-    birth_dates = parse_date_field(person.get('birth_date', ''))
-    death_dates = parse_date_field(person.get('death_date', ''))
+    if relations is not None:
+        related = {relation: list(persons) for relation, persons in relations[target_id].items()}
+    else:
+        related = {
+            relation: resolve_person_names(parser(person.get(column, '')), scholars)
+            for relation, column, parser in RELATION_COLUMNS
+        }
     
-    # Get related hadiths (optimization: pre-grouped hadiths would be faster)
-    person_hadiths = [
-        h for h in all_hadiths 
-        if target_id in h['chain']
-    ]
+    transmission = (transmissions or {}).get(target_id, {})
+    
+    # Hadiths themselves live in paginated files (see write_hadith_pages)
+    person_hadiths = hadiths_by_scholar.get(target_id, [])
     
     tree = {
         "id": target_id,
-        "name": clean_name(person['name']),
+        "name": summaries[target_id]['name'] if summaries is not None else clean_name(person['name']),
         "full_name": person['name'],
         "grade": person.get('grade', ''),
         "reliability_grade": extract_reliability_grade(person.get('area_of_interest', '')),
         
         # Biographical information
-        "biography": {
-            "birth": {
-                "date_hijri": person.get('birth_date_hijri', ''),
-                "date_gregorian": person.get('birth_date_gregorian', ''),
-                "date_display": birth_dates,
-                "place": person.get('birth_place', '')
-            },
-            "death": {
-                "date_hijri": person.get('death_date_hijri', ''),
-                "date_gregorian": person.get('death_date_gregorian', ''),
-                "date_display": death_dates,
-                "place": person.get('death_place', ''),
-                "reason": person.get('death_reason', '')
-            },
-            "places_of_stay": person.get('places_of_stay', '').split(', ') if person.get('places_of_stay') else [],
-            "area_of_interest": person.get('area_of_interest', '').split(', ') if person.get('area_of_interest') else [],
-            "tags": parse_tags(person.get('tags', ''))
-        },
+        "biography": parse_biography(person),
         
         # Family relationships
-        "parents": resolve_person_names(parse_ids(person.get('parents', '')), scholars),
-        "spouses": resolve_person_names(parse_ids(person.get('spouse', '')), scholars),
-        "siblings": resolve_person_names(parse_ids(person.get('siblings', '')), scholars),
-        "children": resolve_person_names(parse_ids(person.get('children', '')), scholars),
+        "parents": related['parents'],
+        "spouses": related['spouses'],
+        "siblings": related['siblings'],
+        "children": related['children'],
         
         # Academic lineage
-        "teachers": resolve_person_names(person.get('teachers_inds', '').split(', ') if person.get('teachers_inds') and person.get('teachers_inds') != 'NA' else [], scholars),
-        "students": resolve_person_names(person.get('students_inds', '').split(', ') if person.get('students_inds') and person.get('students_inds') != 'NA' else [], scholars),
+        "teachers": related['teachers'],
+        "students": related['students'],
         
-        # Hadiths (all hadiths for this narrator)
-        "hadiths": person_hadiths,
-        "total_hadiths": len(person_hadiths)
+        # Chain transmissions (top narrators by number of hadiths carried over each link)
+        "transmissions": {
+            "received_from": resolve_weighted_persons(transmission.get('received_from', []), scholars, summaries),
+            "transmitted_to": resolve_weighted_persons(transmission.get('transmitted_to', []), scholars, summaries)
+        },
+        
+        # Hadith summary; pages are at scholars/{id}/hadiths-{n}.json
+        "total_hadiths": len(person_hadiths),
+        "hadith_counts": count_by_collection(person_hadiths),
+        "hadith_page_size": HADITH_PAGE_SIZE,
+        "hadith_pages": -(-len(person_hadiths) // HADITH_PAGE_SIZE)
     }
     
     return tree
 
-def slugify(text):
-    import re
-    text = str(text).lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '-', text).strip('-')
-    return text
+def write_compact_json(path, data):
+    """Atomically write JSON without indentation and return the number of bytes written"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    atomic_write_bytes(path, payload)
+    return len(payload)
+
+def remove_stale_files(directory, written):
+    """Remove .json files under directory that this run did not write (written: paths), then empty
+    subdirectories; returns the number of files removed"""
+    removed = 0
+    for root, dirs, files in os.walk(directory, topdown=False):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith('.json') and not name.startswith('.') and path not in written:
+                os.remove(path)
+                removed += 1
+        if root != directory and not os.listdir(root):
+            os.rmdir(root)
+    return removed
+
+def json_bytes(directory):
+    """Total size of the .json files under directory (0 if it does not exist)"""
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(directory)
+        for name in files if name.endswith('.json') and not name.startswith('.')
+    )
 
-def load_all_hadiths(filepath):
-    """Load all hadiths into memory with parsed chains"""
+def write_hadith_pages(scholar_id, person_hadiths, written_paths=None):
+    """Write fixed-size pages of hadith references for one scholar, returning bytes written"""
+    page_dir = os.path.join(SCHOLARS_DIR, scholar_id)
+    pages = -(-len(person_hadiths) // HADITH_PAGE_SIZE)
+    
+    written = 0
+    for page in range(pages):
+        chunk = person_hadiths[page * HADITH_PAGE_SIZE:(page + 1) * HADITH_PAGE_SIZE]
+        path = os.path.join(page_dir, f"hadiths-{page + 1}.json")
+        if written_paths is not None:
+            written_paths.add(path)
+        written += write_compact_json(path, {
+            "scholar_id": scholar_id,
+            "page": page + 1,
+            "pages": pages,
+            "page_size": HADITH_PAGE_SIZE,
+            "total": len(person_hadiths),
+            "hadiths": [
+                {"id": h['id'], "source": h['source'], "hadith_no": h['hadith_no'], "chapter": h['chapter']}
+                for h in chunk
+            ]
+        })
+    return written
+
+def write_hadith_records(all_hadiths):
+    """Write one record per hadith (texts stored once, not per chain member); returns (bytes written,
+    stale records removed)"""
+    written, paths = 0, set()
+    for hadith in all_hadiths:
+        path = os.path.join(HADITHS_DIR, f"{hadith['id']}.json")
+        paths.add(path)
+        written += write_compact_json(path, hadith)
+    # Hadiths dropped from the corpus would otherwise stay published
+    return written, remove_stale_files(HADITHS_DIR, paths)
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+def load_all_hadiths(filepath, registry_path=REGISTRY_PATH):
+    """Load all hadiths into memory with parsed chains and registered ids"""
     hadiths = []
-    seen_ids = set()
-    count = 0
     
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -164,23 +303,10 @@ def load_all_hadiths(filepath):
                 chain = row.get('chain_indx', '')
                 chain_ids = [x.strip() for x in chain.split(',') if x.strip()]
                 
-                source = row.get('source', '').strip() or 'Unknown Book'
-                hadith_no = row.get('hadith_no', '').strip()
-                
-                # Generate Unique ID
-                base_id = f"{slugify(source)}-{hadith_no}" if hadith_no else f"{slugify(source)}-{count}"
-                unique_id = base_id
-                dup_count = 1
-                while unique_id in seen_ids:
-                    dup_count += 1
-                    unique_id = f"{base_id}-{dup_count}"
-                
-                seen_ids.add(unique_id)
-                
                 hadiths.append({
-                    "id": unique_id,
-                    "hadith_no": hadith_no,
-                    "source": source,
+                    "id": None,
+                    "hadith_no": row.get('hadith_no', '').strip(),
+                    "source": row.get('source', '').strip() or 'Unknown Book',
                     "chapter": row.get('chapter', ''),
                     "chapter_no": row.get('chapter_no', ''),
                     "text_ar": row.get('text_ar', ''),
@@ -188,73 +314,195 @@ def load_all_hadiths(filepath):
                     "usc_msa_ref": row.get('usc_msa_ref', ''),
                     "chain": chain_ids
                 })
-                count += 1
     except FileNotFoundError:
         print(f"Warning: Hadith file not found at {filepath}")
+        return hadiths
+    
+    # Stable public ids from the shared registry (see hadith_registry.py)
+    with HadithIdRegistry(registry_path) as registry:
+        ids = registry.assign((h['source'], h['hadith_no'], h['text_ar']) for h in hadiths)
+    for hadith, hadith_id in zip(hadiths, ids):
+        hadith['id'] = hadith_id
     return hadiths
 
-def main():
+def benchmark():
+    """Scholar emit loop with and without the person summaries / relation index; writes nothing"""
+    scholars = load_scholars(os.path.join(DATA_DIR, 'all_rawis.csv'))
+    all_hadiths = load_all_hadiths(os.path.join(DATA_DIR, 'all_hadiths_clean.csv'))
+    transmissions, _ = build_transmission_summary([h['chain'] for h in all_hadiths], scholars.keys())
+    legacy_s, indexed_s, index_build_s = benchmark_emit_loop(
+        scholars, group_hadiths_by_scholar(all_hadiths), transmissions
+    )
+    print(f"Scholar emit loop over {len(scholars)} scholars:")
+    print(f"   - per-call resolution: {legacy_s:.2f}s")
+    print(f"   - summaries + relation index: {indexed_s:.2f}s (index build {index_build_s:.2f}s)")
+    print(f"   - {legacy_s / max(indexed_s, 1e-9):.1f}x faster")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build scholar, hadith and search artifacts from the CSVs")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time the scholar emit loop with and without the precomputed person summaries "
+                             "(writes nothing)")
+    args = parser.parse_args(argv)
+    
+    if args.benchmark:
+        benchmark()
+        return 0
+    
     print("🚀 Starting Production Data Build...")
+    os.makedirs(SCHOLARS_DIR, exist_ok=True)
     
+    with BuildRun('extract_enhanced_data', OUTPUT_DIR) as run:
+        build(run)
+    return 0
+
+def build(run):
     # 1. Load Source Data
-    print("📚 Loading Scholars Database...")
-    scholars = load_scholars(os.path.join(DATA_DIR, 'all_rawis.csv'))
+    with run.stage('load_scholars'):
+        print("📚 Loading Scholars Database...")
+        scholars = load_scholars(os.path.join(DATA_DIR, 'all_rawis.csv'))
+        run.count('scholar_rows_read', len(scholars))
     
-    print("📜 Loading Hadiths Database...")
-    all_hadiths = load_all_hadiths(os.path.join(DATA_DIR, 'all_hadiths_clean.csv'))
+    with run.stage('load_hadiths'):
+        print("📜 Loading Hadiths Database...")
+        all_hadiths = load_all_hadiths(os.path.join(DATA_DIR, 'all_hadiths_clean.csv'))
+        run.count('hadith_rows_read', len(all_hadiths))
     
     print(f"Loaded {len(scholars)} scholars and {len(all_hadiths)} hadiths.")
     
+    with run.stage('transmission_graph'):
+        print("🔗 Building Transmission Graph...")
+        transmissions, transmission_stats = build_transmission_summary(
+            [h['chain'] for h in all_hadiths], scholars.keys()
+        )
+        run.count('transmission_edges', transmission_stats['edges'])
+    print(f"Found {transmission_stats['edges']} weighted transmission edges.")
+    
+    with run.stage('rank_narrators'):
+        print("📈 Ranking Narrators...")
+        ranks, rank_stats = compute_narrator_ranks(
+            scholars.keys(), get_learning_pairs(scholars), [h['chain'] for h in all_hadiths]
+        )
+    print(f"PageRank converged in {rank_stats['iterations']} iterations ({rank_stats['seconds']:.2f}s).")
+    
+    hadiths_by_scholar = group_hadiths_by_scholar(all_hadiths)
+    
+    with run.stage('person_summaries'):
+        print("👤 Precomputing Person Summaries...")
+        summaries = build_person_summaries(scholars)
+        relations = build_relation_index(scholars, summaries)
+        run.count('names_cleaned', len(summaries))
+    
+    # Summaries + hadith pages + hadith records as they were before this run
+    previous_bytes = json_bytes(SCHOLARS_DIR) + json_bytes(HADITHS_DIR)
+    
+    with run.stage('hadith_records'):
+        print("📝 Writing Hadith Records...")
+        record_bytes, stale_records = write_hadith_records(all_hadiths)
+        run.count('files_written', len(all_hadiths))
+        run.count('files_removed', stale_records)
+        run.count('bytes_written', record_bytes)
+    
     # 2. Generate Search Index
     print("🔍 Generating Search Index...")
     search_index = []
     
     count = 0
     total = len(scholars)
+    summary_sizes = []
+    page_bytes = 0
+    written_paths = set()
     
-    for scholar_id, person in scholars.items():
-        # Calculate approximate influence score for search ranking
-        # Based on number of students + teachers
-        students_count = len(person.get('students_inds', '').split(',')) if person.get('students_inds') != 'NA' else 0
-        teachers_count = len(person.get('teachers_inds', '').split(',')) if person.get('teachers_inds') != 'NA' else 0
-        influence = students_count + teachers_count
-        
-        name = clean_name(person['name'])
-        
-        # Add to search index
-        search_index.append({
-            "id": scholar_id,
-            "name": name,
-            "grade": person.get('grade', ''),
-            "reliability_grade": extract_reliability_grade(person.get('area_of_interest', '')),
-            "death_year": person.get('death_date_hijri', ''),
-            "score": influence
-        })
-        
-        # 3. Generate Individual JSON Files for ALL scholars
-        scholar_data = get_enhanced_scholar_data(scholar_id, scholars, all_hadiths)
-        if scholar_data:
-            output_path = os.path.join(SCHOLARS_DIR, f"{scholar_id}.json")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(scholar_data, f, indent=2, ensure_ascii=False)
+    with run.stage('scholar_files'):
+        for scholar_id, person in scholars.items():
+            # Influence for search ranking: graph centrality plus distinct teacher/student count
+            rank = ranks[scholar_id]
             
-        count += 1
-        if count % 1000 == 0:
-            print(f"Processed {count}/{total}...")
+            name = summaries[scholar_id]['name']
+            
+            # Add to search index
+            search_index.append({
+                "id": scholar_id,
+                "name": name,
+                "grade": person.get('grade', ''),
+                "reliability_grade": extract_reliability_grade(person.get('area_of_interest', '')),
+                "death_year": person.get('death_date_hijri', ''),
+                "score": rank['degree'],
+                "pagerank": rank['pagerank'],
+                "weighted_degree": rank['weighted_degree']
+            })
+            
+            # 3. Generate Individual JSON Files for ALL scholars
+            scholar_data = get_enhanced_scholar_data(
+                scholar_id, scholars, hadiths_by_scholar, transmissions, summaries, relations
+            )
+            if scholar_data:
+                # Names the per-call path would have cleaned: self + every resolved person
+                transmission = scholar_data['transmissions']
+                run.count('name_mentions', 1 + sum(len(scholar_data[rel]) for rel, _, _ in RELATION_COLUMNS)
+                          + len(transmission['received_from']) + len(transmission['transmitted_to']))
+                output_path = os.path.join(SCHOLARS_DIR, f"{scholar_id}.json")
+                summary_sizes.append(len(atomic_write_json(output_path, scholar_data)))
+                written_paths.add(output_path)
+                person_hadiths = hadiths_by_scholar.get(scholar_id, [])
+                page_bytes += write_hadith_pages(scholar_id, person_hadiths, written_paths)
+                run.count('files_written', 1 + -(-len(person_hadiths) // HADITH_PAGE_SIZE))
+                
+            count += 1
+            if count % 1000 == 0:
+                print(f"Processed {count}/{total}...")
+        run.count('bytes_written', sum(summary_sizes) + page_bytes)
+        # Dropped scholars and the pages past a narrator's new last page would otherwise stay published
+        stale_files = remove_stale_files(SCHOLARS_DIR, written_paths)
+        run.count('files_removed', stale_files)
+        # Biography fields are parsed once per distinct string
+        parse_hits, parse_misses = biography_parser.cache_stats()
+        run.count('biography_strings_parsed', parse_misses)
+        run.count('biography_parse_cache_hits', parse_hits)
 
+    with run.stage('search_index'):
+        # Sort search index by graph centrality
+        search_index.sort(key=lambda x: (x['pagerank'], x['score']), reverse=True)
+        
+        # Save Search Index
+        search_path = os.path.join(OUTPUT_DIR, 'search-index.json')
+        run.count('files_written')
+        run.count('bytes_written', len(atomic_write_json(search_path, search_index)))
+        
+        # Id-keyed shards for resolving chain narrators without the full index
+        lookup_stats = write_scholar_lookup(search_index, LOOKUP_DIR)
+        run.count('files_written', lookup_stats['shards'] + 1)
+        run.count('bytes_written', lookup_stats['bytes'])
 
-    # Sort search index by influence score
-    search_index.sort(key=lambda x: x['score'], reverse=True)
-    
-    # Save Search Index
-    search_path = os.path.join(OUTPUT_DIR, 'search-index.json')
-    with open(search_path, 'w', encoding='utf-8') as f:
-        json.dump(search_index, f, indent=2, ensure_ascii=False)
+        # Typo-tolerant name token lookup (SymSpell deletions)
+        name_stats = write_name_index(search_index, NAME_INDEX_DIR)
+        run.count('files_written', name_stats['files'])
+        run.count('bytes_written', name_stats['bytes'])
         
+    # The summaries clean each name once instead of once per mention
+    run.count('regex_calls_avoided', run.counters['name_mentions'] - len(summaries))
+    
     print(f"\n✅ Build Complete!")
     print(f"   - Search Index: {len(search_index)} scholars")
     print(f"   - Location: {search_path}")
-    print(f"   - Individual Scholar Files generated in {SCHOLARS_DIR}")
+    print(f"   - Scholar Lookup: {lookup_stats['shards']} shards in {LOOKUP_DIR}")
+    print(f"   - Name Index: {name_stats['tokens']} tokens, {name_stats['deletes']} deletions in {NAME_INDEX_DIR}")
+    print(f"   - Individual Scholar Files generated in {SCHOLARS_DIR} "
+          f"({stale_files + stale_records} stale files removed)")
+    print(f"   - Biography fields: {parse_misses} distinct strings parsed, {parse_hits} cache hits")
+    print(f"   - Person summaries: {run.counters['regex_calls_avoided']} clean_name calls avoided "
+          f"(--benchmark times the emit loop against per-call resolution)")
+    
+    summary_sizes.sort()
+    new_bytes = sum(summary_sizes) + page_bytes + record_bytes
+    mb = 1024 * 1024
+    print(f"\n📦 Payload Sizes:")
+    print(f"   - Scholar summaries: {sum(summary_sizes) / mb:.1f} MB "
+          f"(p50 {percentile(summary_sizes, 0.5) / 1024:.1f} KB, p99 {percentile(summary_sizes, 0.99) / 1024:.1f} KB)")
+    print(f"   - Hadith pages: {page_bytes / mb:.1f} MB, hadith records: {record_bytes / mb:.1f} MB")
+    if previous_bytes:
+        print(f"   - Previous scholar and hadith files: {previous_bytes / mb:.1f} MB "
+              f"(saved {(previous_bytes - new_bytes) / mb:.1f} MB)")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
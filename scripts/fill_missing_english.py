@@ -1,7 +1,9 @@
 import pandas as pd
 import json
 import os
-import re
+
+from build_metrics import BuildRun
+from text_normalize import normalize_arabic, normalize_batch
 
 # File paths
 CSV_PATH = 'data-processing/data/all_hadiths_clean.csv'
@@ -26,21 +28,6 @@ ARABIC_SOURCE_MAP = {
     'Sunan Ibn Majah': 'ara-ibnmajah.min.json'
 }
 
-def remove_tashkeel(text):
-    """Remove Arabic diacritics."""
-    tashkeel = re.compile(r'[\u0617-\u061A\u064B-\u0652]')
-    return tashkeel.sub('', text)
-
-def normalize_arabic(text):
-    """Normalize Arabic text for matching."""
-    if not isinstance(text, str):
-        return ""
-    text = re.sub(r'<[^>]+>', '', text)
-    text = remove_tashkeel(text)
-    text = re.sub(r'\s+', '', text)
-    text = re.sub(r'[^\w]', '', text)
-    return text
-
 def load_translations_by_number(source_name):
     """Load English translations indexed by hadith number."""
     if source_name not in SOURCE_MAP:
@@ -87,21 +74,31 @@ def load_arabic_to_english_map(source_name):
     
     eng_by_num = {h.get('hadithnumber'): h.get('text', '') for h in eng_hadiths}
     
-    ara_to_eng = {}
+    ara_texts, refs = [], []
     for h in ara_hadiths:
         ara_text = h.get('text', '')
         ref = h.get('hadithnumber')
         
         if ara_text and ref and ref in eng_by_num and eng_by_num[ref]:
-            norm_ara = normalize_arabic(ara_text)
-            if norm_ara:
-                ara_to_eng[norm_ara] = eng_by_num[ref]
+            ara_texts.append(ara_text)
+            refs.append(ref)
+
+    ara_to_eng = {}
+    for norm_ara, ref in zip(normalize_batch(ara_texts, normalize_arabic), refs):
+        if norm_ara:
+            ara_to_eng[norm_ara] = eng_by_num[ref]
     
     return ara_to_eng
 
 def main():
+    with BuildRun('fill_missing_english', os.path.dirname(CSV_PATH)) as run:
+        fill_missing(run)
+
+def fill_missing(run):
     print("Loading CSV...")
-    df = pd.read_csv(CSV_PATH)
+    with run.stage('read_csv'):
+        df = pd.read_csv(CSV_PATH)
+        run.count('rows_read', len(df))
     df['source'] = df['source'].str.strip()
     
     total_updated = 0
@@ -113,7 +110,8 @@ def main():
         
         # Method 1: Match by hadith number
         print("Method 1: Matching by hadith number...")
-        by_number = load_translations_by_number(source_name)
+        with run.stage(f'load_translations:{source_name}'):
+            by_number = load_translations_by_number(source_name)
         print(f"  Loaded {len(by_number)} translations from JSON")
         
         mask = (df['source'] == source_name) & (df['text_en'].isna())
@@ -131,25 +129,27 @@ def main():
             except:
                 pass
         
+        run.count('rows_matched_by_number', method1_count)
         print(f"  Updated {method1_count} rows via hadith number")
         total_updated += method1_count
         
         # Method 2: Match by Arabic text (for remaining)
         print("Method 2: Matching by Arabic text...")
-        ara_to_eng = load_arabic_to_english_map(source_name)
+        with run.stage(f'load_arabic_map:{source_name}'):
+            ara_to_eng = load_arabic_to_english_map(source_name)
         print(f"  Loaded {len(ara_to_eng)} Arabic→English mappings")
         
         mask = (df['source'] == source_name) & (df['text_en'].isna()) & (df['text_ar'].notna())
         method2_count = 0
         
-        for idx in df[mask].index:
-            ara_text = df.at[idx, 'text_ar']
-            norm_ara = normalize_arabic(ara_text)
+        for idx, norm_ara in normalize_batch(df.loc[mask, 'text_ar'], normalize_arabic).items():
+            run.count('rows_compared')
             
             if norm_ara in ara_to_eng:
                 df.at[idx, 'text_en'] = ara_to_eng[norm_ara]
                 method2_count += 1
         
+        run.count('rows_matched_by_text', method2_count)
         print(f"  Updated {method2_count} rows via Arabic matching")
         total_updated += method2_count
         
@@ -163,7 +163,10 @@ def main():
     
     # Save
     print(f"\nSaving to {CSV_PATH}...")
-    df.to_csv(CSV_PATH, index=False)
+    with run.stage('write_csv'):
+        df.to_csv(CSV_PATH, index=False)
+        run.count('files_written')
+        run.count('bytes_written', os.path.getsize(CSV_PATH))
     print("Done!")
     
     # Final stats
@@ -2,6 +2,16 @@ import pandas as pd
 import json
 import os
 
+from build_metrics import BuildRun
+from hadith_lookup import LOOKUP_PATH, RECORDS_PATH, write_lookup_artifacts
+from hadith_parallels import annotate_parallels
+from hadith_related import annotate_related
+from hadith_registry import REGISTRY_PATH, HadithIdRegistry
+from hadith_search import SEARCH_DIR, write_search_index
+from isnad_analytics import analyze_chain
+from text_normalize import clean_field
+from timeline_index import TIMELINE_DIR, LifespanIndex
+
 # Configuration
 # Assuming running from sahih-explorer root
 CSV_PATH = 'data-processing/data/all_hadiths_clean.csv'
@@ -21,97 +31,134 @@ def load_scholar_map():
         # Create map: ID (str) -> Scholar Dict
         return {str(item['id']): item for item in data}
 
-def clean_text(text):
-    if pd.isna(text):
-        return ""
-    return str(text).strip()
-
-def slugify(text):
-    import re
-    text = str(text).lower()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[-\s]+', '-', text).strip('-')
-    return text
-
 def process_hadiths():
-    scholar_map = load_scholar_map()
+    with BuildRun('generate_hadith_index', os.path.dirname(OUTPUT_PATH)) as run:
+        build_hadith_index(run)
+
+def build_hadith_index(run):
+    with run.stage('load_scholar_map'):
+        scholar_map = load_scholar_map()
+        run.count('scholars_loaded', len(scholar_map))
+        # Chain links are judged against the lifespans written by timeline_index.py
+        lifespans = LifespanIndex.load(TIMELINE_DIR)
     print(f"Loaded {len(scholar_map)} scholars.")
 
     print(f"Reading CSV from {CSV_PATH}...")
     try:
-        df = pd.read_csv(CSV_PATH)
+        with run.stage('read_csv'):
+            # Exactly the strings csv.DictReader gives extract_enhanced_data.py: no '12.0'
+            # hadith numbers and no 'N/A' / 'NULL' turned into NaN, so registry keys match
+            df = pd.read_csv(CSV_PATH, dtype=str, keep_default_na=False)
+            run.count('rows_read', len(df))
     except Exception as e:
         print(f"Error reading CSV: {e}")
         return
 
     hadiths = []
-    seen_ids = set()
     
     # Process rows
     count = 0
-    for _, row in df.iterrows():
-        if LIMIT is not None and count >= LIMIT:
-            break
+    with run.stage('build_hadiths'):
+        for _, row in df.iterrows():
+            if LIMIT is not None and count >= LIMIT:
+                break
+                
+            # Parse chain IDs
+            chain_str = str(row.get('chain_indx', ''))
+            chain_ids = [cid.strip() for cid in chain_str.split(',') if cid.strip().isdigit()]
             
-        # Parse chain IDs
-        chain_str = str(row.get('chain_indx', ''))
-        chain_ids = [cid.strip() for cid in chain_str.split(',') if cid.strip().isdigit()]
-        
-        # Build Narrator Objects
-        narrators = []
-        for sid in chain_ids:
-            if sid in scholar_map:
-                s = scholar_map[sid]
-                narrators.append({
-                    "id": str(s['id']),
-                    "name": s['name'],
-                    "grade": s.get('grade', 'Unknown'),
-                    "reliability_grade": s.get('reliability_grade', ''),
-                    "death_year": s.get('death_year', '')
-                })
-            else:
-                # Fallback for unknown IDs
-                narrators.append({
-                    "id": sid,
-                    "name": f"Unknown Scholar ({sid})",
-                    "grade": "Unknown",
-                    "death_year": ""
-                })
+            # Build Narrator Objects
+            narrators = []
+            for sid in chain_ids:
+                if sid in scholar_map:
+                    s = scholar_map[sid]
+                    narrators.append({
+                        "id": str(s['id']),
+                        "name": s['name'],
+                        "grade": s.get('grade', 'Unknown'),
+                        "reliability_grade": s.get('reliability_grade', ''),
+                        "death_year": s.get('death_year', '')
+                    })
+                    run.count('narrators_matched')
+                else:
+                    # Fallback for unknown IDs
+                    narrators.append({
+                        "id": sid,
+                        "name": f"Unknown Scholar ({sid})",
+                        "grade": "Unknown",
+                        "death_year": ""
+                    })
+                    run.count('narrators_unknown')
 
-        source = clean_text(row.get('source', 'Unknown Book'))
-        hadith_no = clean_text(row.get('hadith_no', ''))
-        
-        # Generate Unique ID
-        base_id = f"{slugify(source)}-{hadith_no}" if hadith_no else f"{slugify(source)}-{count}"
-        unique_id = base_id
-        dup_count = 1
-        while unique_id in seen_ids:
-            dup_count += 1
-            unique_id = f"{base_id}-{dup_count}"
-        
-        seen_ids.add(unique_id)
+            source = clean_field(row.get('source', 'Unknown Book'))
+            hadith_no = clean_field(row.get('hadith_no', ''))
+            
+            hadith = {
+                "id": None,
+                "source": source,
+                "book": source, # Alias for UI compatibility
+                "hadith_no": hadith_no,
+                "chapter_no": clean_field(row.get('chapter_no', '')),
+                "chapter": clean_field(row.get('chapter', '')),
+                "matn": clean_field(row.get('text_ar', '')),
+                "matn_en": clean_field(row.get('text_en', '')),
+                "narrators": narrators,
+                "isnad": analyze_chain(chain_ids, scholar_map, lifespans)
+            }
+            
+            hadiths.append(hadith)
+            count += 1
+        run.count('hadiths_built', len(hadiths))
 
-        hadith = {
-            "id": unique_id,
-            "source": source,
-            "book": source, # Alias for UI compatibility
-            "hadith_no": hadith_no,
-            "chapter_no": clean_text(row.get('chapter_no', '')),
-            "chapter": clean_text(row.get('chapter', '')),
-            "matn": clean_text(row.get('text_ar', '')),
-            "matn_en": clean_text(row.get('text_en', '')),
-            "narrators": narrators
-        }
-        
-        hadiths.append(hadith)
-        count += 1
+    # Same ids extract_enhanced_data.py gave these rows (see hadith_registry.py)
+    with run.stage('assign_ids'), HadithIdRegistry(REGISTRY_PATH) as registry:
+        ids = registry.assign((h['source'], h['hadith_no'], h['matn']) for h in hadiths)
+        for hadith, hadith_id in zip(hadiths, ids):
+            hadith['id'] = hadith_id
+        for name, value in registry.stats.items():
+            run.count(f"ids_{name}", value)
+
+    # Parallel narrations (MinHash/LSH near-duplicates, see hadith_parallels.py)
+    with run.stage('parallels'):
+        parallel_stats = annotate_parallels(hadiths)
+        run.count('parallel_candidates', parallel_stats['candidates'])
+        run.count('parallel_clusters', parallel_stats['clusters'])
+
+    # Top-k TF-IDF neighbours (see hadith_related.py)
+    with run.stage('related'):
+        related_stats = annotate_related(hadiths)
+        run.count('related_links', related_stats['links'])
 
     print(f"Processed {len(hadiths)} hadiths.")
+    broken = sum(1 for h in hadiths if not h['isnad']['is_continuous'])
+    unknown = sum(1 for h in hadiths if h['isnad']['has_unknown_narrator'])
+    print(f"Isnad analytics: {broken} chains with generation gaps, {unknown} with unknown narrators.")
+    print(f"Parallels: {parallel_stats['clusters']} clusters covering {parallel_stats['clustered_hadiths']} hadiths "
+          f"({parallel_stats['cross_collection']} with parallels in another collection).")
+    print(f"Related: {related_stats['with_related']} hadiths with related hadiths ({related_stats['links']} links).")
     
     # Save JSON
-    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(hadiths, f, ensure_ascii=False, indent=2)
+    with run.stage('write_index'):
+        with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
+            json.dump(hadiths, f, ensure_ascii=False, indent=2)
+        run.count('files_written')
+        run.count('bytes_written', os.path.getsize(OUTPUT_PATH))
     print(f"Saved index to {OUTPUT_PATH}")
+    
+    # O(1) lookup artifacts for the hadith page server path
+    with run.stage('write_lookup'):
+        lookup_stats = write_lookup_artifacts(hadiths, RECORDS_PATH, LOOKUP_PATH)
+        run.count('files_written', 2)
+        run.count('bytes_written', lookup_stats['record_bytes'] + os.path.getsize(LOOKUP_PATH))
+    print(f"Saved {lookup_stats['records']} lookup records to {RECORDS_PATH} (table: {LOOKUP_PATH})")
+
+    # BM25 postings so the command palette never indexes matns in the browser
+    with run.stage('write_search'):
+        search_stats = write_search_index(hadiths, SEARCH_DIR)
+        run.count('files_written', search_stats['files'] + 1)
+        run.count('bytes_written', search_stats['bytes'])
+        run.count('search_terms', search_stats['terms'])
+    print(f"Saved search index ({search_stats['terms']} terms, {search_stats['files']} files) to {SEARCH_DIR}")
 
 if __name__ == "__main__":
     process_hadiths()
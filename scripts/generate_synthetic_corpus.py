@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic all_rawis.csv / all_hadiths_clean.csv lookalikes.
+
+The real corpus is fixed at ~24k narrators and ~34k hadiths; this produces
+the same columns and value formats at any multiple of that size so the build
+can be benchmarked at 1x / 10x / 100x scale:
+
+- narrators are spread over 12 generations with hijri birth/death years,
+  grades, Narrator[Grade:...] reliability tags and family links
+- teacher/student lists link consecutive generations and are kept symmetric
+- chains walk from a companion down through students, with a chain-length
+  distribution peaking at 5-6 narrators and a small share of unknown ids
+- text_ar is vocalized Arabic (isnad preamble + matn), text_en English
+
+Output goes to <output-dir>/data-processing/data/, the layout every build
+script expects when run from <output-dir>.
+
+Usage:
+    python scripts/generate_synthetic_corpus.py --output-dir /tmp/corpus-10x --scale 10
+"""
+
+import argparse
+import bisect
+import csv
+import itertools
+import os
+import random
+import sys
+import time
+
+BASE_SCHOLARS = 24000
+BASE_HADITHS = 34000
+GENERATIONS = 12
+
+# Relative number of narrators per generation (companions .. 12th generation)
+GENERATION_WEIGHTS = [6, 10, 14, 16, 15, 13, 10, 7, 4, 2, 2, 1]
+
+# Narrators per chain, from compiler's shaykh to companion
+CHAIN_LENGTH_WEIGHTS = {2: 2, 3: 8, 4: 20, 5: 28, 6: 22, 7: 12, 8: 5, 9: 2, 10: 1}
+UNKNOWN_ID_RATE = 0.005
+
+RELIABILITY_WEIGHTS = {
+    'Thiqah': 45, 'Thiqah Thabt': 5, 'Thiqah Hafiz': 3, 'Saduq': 22,
+    'Maqbul': 10, "Da'if": 9, 'Majhul': 5, 'Matruk': 1,
+}
+
+SOURCES = {
+    'Sahih Bukhari': 22, 'Sahih Muslim': 21, "Sunan Abi Da'ud": 15,
+    "Jami' al-Tirmidhi": 12, "Sunan an-Nasa'i": 17, 'Sunan Ibn Majah': 13,
+}
+
+PLACES = ['Makkah', 'Medina', 'Kufa', 'Basra', 'Damascus', 'Baghdad', 'Egypt', 'Yemen', 'Khurasan', 'Wasit']
+TAGS = ['Quraish', 'Ansar', 'Muhajirun', 'Badr', 'Uhud', 'Hadith', 'Fiqh', 'Tafsir', 'Zuhd']
+
+ISMS = [
+    ('Abdullah', 'عبد الله'), ('Muhammad', 'محمد'), ('Umar', 'عمر'), ('Ali', 'علي'),
+    ('Anas', 'أنس'), ('Sufyan', 'سفيان'), ('Malik', 'مالك'), ('Yahya', 'يحيى'),
+    ('Ibrahim', 'إبراهيم'), ('Hammad', 'حماد'), ('Qutaybah', 'قتيبة'), ('Layth', 'الليث'),
+    ('Yazid', 'يزيد'), ('Said', 'سعيد'), ('Shuba', 'شعبة'), ('Ismail', 'إسماعيل'),
+    ('Hisham', 'هشام'), ('Urwah', 'عروة'), ('Nafi', 'نافع'), ('Zuhri', 'الزهري'),
+]
+NISBAS = [
+    ('al-Ansari', 'الأنصاري'), ('al-Basri', 'البصري'), ('al-Kufi', 'الكوفي'),
+    ('al-Madani', 'المدني'), ('ath-Thaqafi', 'الثقفي'), ('al-Makhzumi', 'المخزومي'),
+    ('ad-Dimashqi', 'الدمشقي'), ('al-Misri', 'المصري'), ('', ''),
+]
+
+ISNAD_AR = ['حَدَّثَنَا', 'أَخْبَرَنَا', 'عَنْ', 'سَمِعْتُ', 'قَالَ']
+MATN_AR = (
+    'قَالَ رَسُولُ اللَّهِ صلى الله عليه وسلم إِنَّمَا الأَعْمَالُ بِالنِّيَّاتِ وَإِنَّمَا لِكُلِّ امْرِئٍ '
+    'مَا نَوَى فَمَنْ كَانَتْ هِجْرَتُهُ إِلَى دُنْيَا يُصِيبُهَا أَوْ إِلَى امْرَأَةٍ يَنْكِحُهَا فَهِجْرَتُهُ '
+    'إِلَى مَا هَاجَرَ إِلَيْهِ الصَّلاَةُ وَالزَّكَاةُ وَالصِّيَامُ وَالْحَجُّ مِنَ الإِسْلاَمِ'
+).split()
+MATN_EN = (
+    "Allah's Messenger said the reward of deeds depends upon the intentions and every person "
+    "will get the reward according to what he has intended so whoever emigrated for worldly "
+    "benefits or for a woman to marry his emigration was for what he emigrated for prayer "
+    "charity fasting and pilgrimage are from Islam"
+).split()
+
+RAWI_COLUMNS = [
+    'scholar_indx', 'name', 'grade', 'parents', 'spouse', 'siblings', 'children',
+    'birth_date', 'birth_date_hijri', 'birth_date_gregorian', 'birth_place',
+    'death_date', 'death_date_hijri', 'death_date_gregorian', 'death_place', 'death_reason',
+    'places_of_stay', 'area_of_interest', 'tags', 'teachers_inds', 'students_inds',
+]
+HADITH_COLUMNS = [
+    'id', 'hadith_id', 'source', 'chapter_no', 'hadith_no', 'chapter',
+    'chain_indx', 'text_ar', 'text_en', 'usc_msa_ref',
+]
+
+
+def weighted_sampler(weights, rng):
+    """Return a zero-argument function drawing keys of weights proportionally."""
+    keys = list(weights)
+    cumulative = list(itertools.accumulate(weights.values()))
+    total = cumulative[-1]
+    return lambda: keys[bisect.bisect_right(cumulative, rng.random() * total)]
+
+
+def generation_grade(generation):
+    if generation == 1:
+        return 'Comp.(RA) [1st Generation]'
+    if generation == 2:
+        return "Follower(Tabi') [2nd Generation]"
+    if generation == 3:
+        return "Succ. (Taba' Tabi') [3rd Generation]"
+    century = 2 + (generation - 4) // 3
+    return f"{century}{'nd' if century == 2 else 'rd' if century == 3 else 'th'} Century AH [{generation}th generation]"
+
+
+def date_field(hijri):
+    """Value like "['51 BH', '573 CE']" as stored in the birth/death date columns."""
+    label = f"{-hijri} BH" if hijri <= 0 else f"{hijri} AH"
+    return f"['{label}', '{hijri + 622} CE']"
+
+
+def make_name(rng, sid):
+    ism, ism_ar = rng.choice(ISMS)
+    father, father_ar = rng.choice(ISMS)
+    nisba, nisba_ar = rng.choice(NISBAS)
+    english = ' '.join(filter(None, [ism, 'bin', father, nisba, str(sid)]))
+    arabic = ' '.join(filter(None, [ism_ar, 'بن', father_ar, nisba_ar]))
+    return english, arabic
+
+
+def generate_scholars(n, rng):
+    """Build narrator rows in memory (teacher/student links need the full set)."""
+    pick_generation = weighted_sampler(
+        {g + 1: w for g, w in enumerate(GENERATION_WEIGHTS)}, rng
+    )
+    pick_reliability = weighted_sampler(RELIABILITY_WEIGHTS, rng)
+
+    generation = [0] + [pick_generation() for _ in range(n)]
+    by_generation = {g: [] for g in range(1, GENERATIONS + 1)}
+    for sid in range(1, n + 1):
+        by_generation[generation[sid]].append(sid)
+
+    teachers = {sid: set() for sid in range(1, n + 1)}
+    students = {sid: set() for sid in range(1, n + 1)}
+    for sid in range(1, n + 1):
+        g = generation[sid]
+        if g == 1:
+            continue
+        for _ in range(rng.choice([1, 1, 2, 2, 3, 4, 6])):
+            source_generation = g - 1 if rng.random() < 0.85 or g == 2 else g - 2
+            pool = by_generation[source_generation] or by_generation[g - 1]
+            if pool:
+                teacher = rng.choice(pool)
+                teachers[sid].add(teacher)
+                students[teacher].add(sid)
+
+    rows = []
+    for sid in range(1, n + 1):
+        g = generation[sid]
+        english, arabic = make_name(rng, sid)
+        death = max(1, g * 25 + rng.randint(-20, 20) - 10)
+        birth = death - rng.randint(50, 95)
+        honorific = 'رضي الله عنه' if g == 1 else 'رحمه الله'
+        pool = by_generation[g]
+        parents = [rng.choice(by_generation[max(1, g - 1)]) for _ in range(rng.random() < 0.15)]
+        children = [rng.choice(by_generation[min(GENERATIONS, g + 1)] or pool) for _ in range(rng.random() < 0.1)]
+        siblings = [rng.choice(pool) for _ in range(rng.random() < 0.08)]
+
+        if g == 1:
+            area = 'Companion, Hadith'
+        else:
+            area = f"Narrator[Grade:{pick_reliability()}], {rng.choice(['Fiqh', 'Hadith', 'Tafsir'])}"
+
+        rows.append({
+            'scholar_indx': str(sid),
+            'name': f"{english} ( {arabic} ( {honorific}",
+            'grade': generation_grade(g),
+            'parents': ', '.join(f"{make_name(rng, p)[0]} [{p}]" for p in parents) or 'NA',
+            'spouse': 'NA',
+            'siblings': ', '.join(f"{make_name(rng, s)[0]} [{s}]" for s in siblings if s != sid) or 'NA',
+            'children': ', '.join(f"{make_name(rng, c)[0]} [{c}]" for c in children) or 'NA',
+            'birth_date': date_field(birth) if rng.random() < 0.6 else 'NA',
+            'birth_date_hijri': str(birth) if rng.random() < 0.6 else 'NA',
+            'birth_date_gregorian': 'NA',
+            'birth_place': rng.choice(PLACES),
+            'death_date': date_field(death) if rng.random() < 0.8 else 'NA',
+            'death_date_hijri': str(death) if rng.random() < 0.85 else 'NA',
+            'death_date_gregorian': str(death + 622),
+            'death_place': rng.choice(PLACES),
+            'death_reason': 'NA',
+            'places_of_stay': ', '.join(rng.sample(PLACES, rng.randint(1, 3))),
+            'area_of_interest': area,
+            'tags': ', '.join(f"{tag} [https://muslimscholars.info/tag/{tag}]" for tag in rng.sample(TAGS, rng.randint(0, 3))) or 'NA',
+            'teachers_inds': ', '.join(map(str, sorted(teachers[sid]))) or 'NA',
+            'students_inds': ', '.join(map(str, sorted(students[sid]))) or 'NA',
+        })
+    return rows, by_generation, students
+
+
+def build_chain(length, rng, by_generation, students, n):
+    """Chain ids from compiler's shaykh to companion, following student links where possible."""
+    current = rng.choice(by_generation[1])
+    path = [current]
+    generation = 1
+    while len(path) < length:
+        generation = min(GENERATIONS, generation + 1)
+        candidates = students.get(current)
+        if candidates and rng.random() < 0.9:
+            current = rng.choice(tuple(candidates))
+        else:
+            current = rng.choice(by_generation[generation] or by_generation[GENERATIONS])
+        path.append(current)
+    chain = [str(sid) for sid in reversed(path)]
+    for i in range(len(chain)):
+        if rng.random() < UNKNOWN_ID_RATE:
+            chain[i] = str(n + rng.randint(1, 1000))
+    return chain
+
+
+def hadith_text(chain, names_ar, rng):
+    isnad = ' '.join(f"{rng.choice(ISNAD_AR)} {names_ar.get(sid, 'رجل')}" for sid in chain)
+    matn_ar = ' '.join(rng.choices(MATN_AR, k=rng.randint(15, 80)))
+    matn_en = ' '.join(rng.choices(MATN_EN, k=rng.randint(20, 110)))
+    return f"{isnad} {matn_ar}", f"Narrated {len(chain)} narrators: {matn_en}"
+
+
+def generate_corpus(output_dir, scale=1.0, seed=0, base_scholars=BASE_SCHOLARS, base_hadiths=BASE_HADITHS):
+    """Write both CSVs under output_dir/data-processing/data and return counts."""
+    rng = random.Random(seed)
+    n = max(GENERATIONS * 2, int(base_scholars * scale))
+    h = max(1, int(base_hadiths * scale))
+    data_dir = os.path.join(output_dir, 'data-processing', 'data')
+    os.makedirs(data_dir, exist_ok=True)
+
+    rows, by_generation, students = generate_scholars(n, rng)
+    with open(os.path.join(data_dir, 'all_rawis.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=RAWI_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    names_ar = {row['scholar_indx']: row['name'].split(' ( ')[1] for row in rows}
+    del rows
+
+    pick_length = weighted_sampler(CHAIN_LENGTH_WEIGHTS, rng)
+    pick_source = weighted_sampler(SOURCES, rng)
+    numbers = {source: 0 for source in SOURCES}
+    with open(os.path.join(data_dir, 'all_hadiths_clean.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HADITH_COLUMNS)
+        for i in range(h):
+            source = pick_source()
+            # Occasional repeated numbers exercise the duplicate-id suffixing
+            if rng.random() > 0.02:
+                numbers[source] += 1
+            hadith_no = max(1, numbers[source])
+            chain = build_chain(pick_length(), rng, by_generation, students, n)
+            text_ar, text_en = hadith_text(chain, names_ar, rng)
+            writer.writerow([
+                i, i, f" {source} " if rng.random() < 0.3 else source,
+                hadith_no // 40 + 1, hadith_no, f"Chapter {hadith_no // 40 + 1} - كتاب",
+                ', '.join(chain), text_ar, text_en if rng.random() < 0.9 else '',
+                hadith_no if rng.random() < 0.7 else 0,
+            ])
+    return {"scholars": n, "hadiths": h, "data_dir": data_dir}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic narrator/hadith corpus")
+    parser.add_argument("--output-dir", required=True, help="Corpus root (CSV files go to data-processing/data)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiple of the real corpus size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-scholars", type=int, default=BASE_SCHOLARS)
+    parser.add_argument("--base-hadiths", type=int, default=BASE_HADITHS)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stats = generate_corpus(args.output_dir, args.scale, args.seed, args.base_scholars, args.base_hadiths)
+    print(f"✅ Generated {stats['scholars']} narrators and {stats['hadiths']} hadiths "
+          f"in {time.perf_counter() - start:.1f}s ({stats['data_dir']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
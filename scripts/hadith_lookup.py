@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+O(1) hadith lookup artifacts for the hadith page server path.
+
+generate_hadith_index.py writes two files next to hadith-index.json:
+
+- hadith-records.ndjson: every hadith-index entry as compact JSON, one per line
+- hadith-records.idx: a binary table mapping hadith id -> (offset, length)
+
+Index layout (little-endian):
+    magic   4 bytes  b'HDX1'
+    count   uint32
+    keys    uint64[count]   first 8 bytes of sha256(id), sorted ascending
+    offsets uint32[count]   byte offset of the record in hadith-records.ndjson
+    lengths uint32[count]   byte length of the record (without newline)
+
+A lookup is a binary search over keys plus one seek + read of a ~1 KB record.
+
+Usage:
+    python scripts/hadith_lookup.py              # rebuild from hadith-index.json
+    python scripts/hadith_lookup.py --benchmark
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+
+from artifact_io import atomic_write_bytes
+from build_metrics import BuildRun, add_profile_argument
+
+DATA_DIR = 'public/data'
+RECORDS_PATH = os.path.join(DATA_DIR, 'hadith-records.ndjson')
+LOOKUP_PATH = os.path.join(DATA_DIR, 'hadith-records.idx')
+
+MAGIC = b'HDX1'
+HEADER = struct.Struct('<4sI')
+
+
+def id_key(hadith_id):
+    """64-bit lookup key for a hadith id."""
+    return int.from_bytes(hashlib.sha256(hadith_id.encode('utf-8')).digest()[:8], 'little')
+
+
+def write_lookup_artifacts(hadiths, records_path=RECORDS_PATH, lookup_path=LOOKUP_PATH):
+    """Write the concatenated record file and its id -> (offset, length) table."""
+    chunks, entries, offset = [], [], 0
+    for hadith in hadiths:
+        record = json.dumps(hadith, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        entries.append((id_key(hadith['id']), offset, len(record), hadith['id']))
+        chunks.append(record)
+        chunks.append(b'\n')
+        offset += len(record) + 1
+
+    entries.sort()
+    for previous, current in zip(entries, entries[1:]):
+        if previous[0] == current[0]:
+            raise ValueError(f"Lookup key collision between {previous[3]!r} and {current[3]!r}")
+
+    keys = array('Q', (e[0] for e in entries))
+    offsets = array('I', (e[1] for e in entries))
+    lengths = array('I', (e[2] for e in entries))
+    if sys.byteorder != 'little':
+        for arr in (keys, offsets, lengths):
+            arr.byteswap()
+
+    atomic_write_bytes(records_path, b''.join(chunks))
+    atomic_write_bytes(
+        lookup_path,
+        HEADER.pack(MAGIC, len(entries)) + keys.tobytes() + offsets.tobytes() + lengths.tobytes()
+    )
+    return {"records": len(entries), "record_bytes": offset}
+
+
+class HadithLookup:
+    """Reader for hadith-records.idx / hadith-records.ndjson."""
+
+    def __init__(self, records_path=RECORDS_PATH, lookup_path=LOOKUP_PATH):
+        with open(lookup_path, 'rb') as f:
+            blob = f.read()
+        magic, count = HEADER.unpack_from(blob)
+        if magic != MAGIC:
+            raise ValueError(f"{lookup_path} is not a hadith lookup table")
+
+        start = HEADER.size
+        self.keys = array('Q', blob[start:start + 8 * count])
+        start += 8 * count
+        self.offsets = array('I', blob[start:start + 4 * count])
+        start += 4 * count
+        self.lengths = array('I', blob[start:start + 4 * count])
+        if sys.byteorder != 'little':
+            for arr in (self.keys, self.offsets, self.lengths):
+                arr.byteswap()
+
+        self.records = open(records_path, 'rb')
+
+    def close(self):
+        self.records.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get(self, hadith_id):
+        """Return the hadith record for hadith_id, or None."""
+        key = id_key(hadith_id)
+        i = bisect.bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        self.records.seek(self.offsets[i])
+        record = json.loads(self.records.read(self.lengths[i]))
+        return record if record.get('id') == hadith_id else None
+
+
+def benchmark(data_dir=DATA_DIR, samples=1000, full_parse_samples=10, seed=0):
+    """Compare parse-everything-per-request with an indexed read over random ids."""
+    hadith_index_path = os.path.join(data_dir, 'hadith-index.json')
+    with open(hadith_index_path, 'r', encoding='utf-8') as f:
+        hadiths = json.load(f)
+    ids = [h['id'] for h in hadiths]
+    rng = random.Random(seed)
+    sample = [rng.choice(ids) for _ in range(samples)]
+
+    # Current server path: readFileSync + JSON.parse + linear find on every request
+    start = time.perf_counter()
+    for hadith_id in sample[:full_parse_samples]:
+        with open(hadith_index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        next((h for h in data if h['id'] == hadith_id), None)
+    full_parse = (time.perf_counter() - start) / full_parse_samples
+
+    start = time.perf_counter()
+    for hadith_id in sample:
+        next((h for h in hadiths if h['id'] == hadith_id), None)
+    linear_find = (time.perf_counter() - start) / samples
+
+    timings = []
+    records_path = os.path.join(data_dir, os.path.basename(RECORDS_PATH))
+    lookup_path = os.path.join(data_dir, os.path.basename(LOOKUP_PATH))
+    with HadithLookup(records_path, lookup_path) as lookup:
+        for hadith_id in sample:
+            t0 = time.perf_counter()
+            record = lookup.get(hadith_id)
+            timings.append(time.perf_counter() - t0)
+            assert record is not None and record['id'] == hadith_id
+    timings.sort()
+
+    print(f"Hadith lookup over {len(ids)} hadiths ({samples} random ids):")
+    print(f"   - full parse + find per request: {full_parse * 1000:.1f} ms "
+          f"(averaged over {full_parse_samples} requests)")
+    print(f"   - linear find on a parsed index: {linear_find * 1000:.3f} ms")
+    print(f"   - indexed read: p50 {timings[len(timings) // 2] * 1000:.3f} ms, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1000:.3f} ms")
+    print(f"   - speedup vs full parse: {full_parse / (sum(timings) / len(timings)):.0f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or benchmark the hadith lookup table")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory containing hadith-index.json")
+    parser.add_argument("--benchmark", action="store_true", help="Benchmark full parse vs indexed reads")
+    parser.add_argument("--samples", type=int, default=1000)
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.data_dir, args.samples)
+        return 0
+
+    # Rebuild the lookup artifacts from an existing hadith-index.json
+    with BuildRun('hadith_lookup', args.data_dir, profile=args.profile) as run:
+        with run.stage('load_index'):
+            with open(os.path.join(args.data_dir, 'hadith-index.json'), 'r', encoding='utf-8') as f:
+                hadiths = json.load(f)
+            run.count('rows_read', len(hadiths))
+        records_path = os.path.join(args.data_dir, os.path.basename(RECORDS_PATH))
+        lookup_path = os.path.join(args.data_dir, os.path.basename(LOOKUP_PATH))
+        with run.stage('write'):
+            stats = write_lookup_artifacts(hadiths, records_path, lookup_path)
+            run.count('files_written', 2)
+            run.count('bytes_written', stats['record_bytes'] + os.path.getsize(lookup_path))
+    print(f"Wrote {stats['records']} records ({stats['record_bytes'] / (1024 * 1024):.1f} MB) "
+          f"to {records_path} with lookup table {lookup_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
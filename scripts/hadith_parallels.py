@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate (parallel narration) clustering across the hadith collections.
+
+The same matn is often narrated in several collections, and within one, with
+small wording differences. fill_from_duplicates.py only matches identical
+Arabic strings and nothing links parallels for readers. This module finds
+them without comparing every pair of hadiths:
+
+1. Arabic text is normalized and tokenized like the search index
+   (hadith_search.tokenize) and cut into word shingles of SHINGLE_SIZE.
+2. Identical token sequences are grouped first; only one representative per
+   group goes through the steps below.
+3. Each representative gets a NUM_PERM-value MinHash signature, computed
+   with numpy over a block of documents at a time (multiply-shift hashing,
+   one pass per permutation and np.minimum.reduceat per document).
+4. LSH banding (BANDS bands of NUM_PERM / BANDS rows) puts documents whose
+   band values collide into the same bucket; only pairs sharing a bucket are
+   compared. Buckets larger than MAX_BUCKET are skipped and counted.
+5. Candidates whose signatures agree on at least THRESHOLD of the positions
+   (the MinHash estimate of shingle Jaccard) become edges; clusters are the
+   connected components of the edge graph.
+
+generate_hadith_index.py annotates every hadith with
+
+    "parallel_cluster": "sahih-muslim-34" | null   (smallest member id)
+    "parallels": [{"id", "source", "hadith_no", "similarity"}, ...]
+
+(at most MAX_PARALLELS, most similar first), and convert_to_sqlite.py loads
+them into hadiths.parallel_cluster and hadith_parallels.
+
+Usage:
+    python scripts/hadith_parallels.py                      # cluster stats for hadith-index.json
+    python scripts/hadith_parallels.py --check              # LSH recall against exact Jaccard on a sample
+    python scripts/hadith_parallels.py --check --scale 3    # same, with two noisy copies of every hadith
+    python scripts/hadith_parallels.py --benchmark --scale 10
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import zlib
+from itertools import chain
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from build_metrics import peak_rss_bytes
+from hadith_search import tokenize
+
+DATA_DIR = 'public/data'
+
+SHINGLE_SIZE = 2
+MIN_TOKENS = 8
+NUM_PERM = 120
+BANDS = 30
+THRESHOLD = 0.5
+MAX_BUCKET = 500
+MAX_PARALLELS = 20
+SEED = 46
+
+# Odd 64-bit constant used to fold several 32-bit values into one key
+_FOLD = np.uint64(0x9e3779b97f4a7c15)
+_VERIFY_CHUNK = 200_000
+# Documents per shingle/MinHash pass; keeps the working arrays in cache-sized pieces
+SIGNATURE_BLOCK = 2048
+
+
+def _token_hashes(token_lists):
+    """Flat uint64 array of crc32(token) for every token of every document."""
+    vocabulary = set()
+    for tokens in token_lists:
+        vocabulary.update(tokens)
+    hashes = {token: zlib.crc32(token.encode('utf-8')) for token in vocabulary}
+    total = sum(map(len, token_lists))
+    return np.fromiter(map(hashes.__getitem__, chain.from_iterable(token_lists)), dtype=np.uint64, count=total)
+
+
+def shingle_sets(token_lists, k=SHINGLE_SIZE):
+    """
+    Distinct shingle hashes per document.
+
+    Returns (values, starts): values holds every document's sorted, distinct
+    uint64 shingle hashes back to back, document d's starting at starts[d].
+    Every document must have at least k tokens.
+    """
+    lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+    flat = _token_hashes(token_lists)
+    doc_of = np.repeat(np.arange(len(token_lists)), lengths)
+
+    count = len(flat) - k + 1
+    values = flat[:count].copy()
+    for offset in range(1, k):
+        values = values * _FOLD + flat[offset:offset + count]
+    # Shingles that would straddle two documents
+    valid = doc_of[:count] == doc_of[k - 1:]
+    values, docs = values[valid], doc_of[:count][valid]
+
+    order = np.lexsort((values, docs))
+    values, docs = values[order], docs[order]
+    distinct = np.ones(len(values), dtype=bool)
+    distinct[1:] = (values[1:] != values[:-1]) | (docs[1:] != docs[:-1])
+    values, docs = values[distinct], docs[distinct]
+    starts = np.searchsorted(docs, np.arange(len(token_lists)))
+    return values, starts
+
+
+def minhash_signatures(values, starts, num_perm=NUM_PERM, seed=SEED):
+    """(documents x num_perm) uint32 MinHash signatures."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 2 ** 64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 64, size=num_perm, dtype=np.uint64)
+    shift = np.uint64(32)
+    signatures = np.empty((len(starts), num_perm), dtype=np.uint32)
+    for p in range(num_perm):
+        hashed = (values * a[p] + b[p]) >> shift
+        signatures[:, p] = np.minimum.reduceat(hashed, starts)
+    return signatures
+
+
+def document_signatures(token_lists, block=SIGNATURE_BLOCK):
+    """MinHash signatures for every document, computed a block of documents at a time."""
+    signatures = np.empty((len(token_lists), NUM_PERM), dtype=np.uint32)
+    for start in range(0, len(token_lists), block):
+        values, starts = shingle_sets(token_lists[start:start + block])
+        signatures[start:start + block] = minhash_signatures(values, starts)
+    return signatures
+
+
+def lsh_candidates(signatures, bands=BANDS, max_bucket=MAX_BUCKET):
+    """(i, j) arrays of distinct candidate pairs (i < j) and the number of skipped buckets."""
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    pairs = []
+    skipped = 0
+    for band in range(bands):
+        keys = np.zeros(n, dtype=np.uint64)
+        for column in signatures[:, band * rows:(band + 1) * rows].T:
+            keys = keys * _FOLD + column.astype(np.uint64)
+        # Stable, so members of a bucket stay in ascending order
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        bounds = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        bucket_starts = np.concatenate(([0], bounds))
+        sizes = np.diff(np.concatenate((bucket_starts, [n])))
+
+        skipped += int((sizes > max_bucket).sum())
+
+        # Every pair inside a bucket is (position p, position p + step) for some step;
+        # walking the steps keeps each pass vectorized over all buckets at once
+        size_at = np.repeat(sizes, sizes)
+        positions = np.flatnonzero((size_at > 1) & (size_at <= max_bucket))
+        ends = np.repeat(bucket_starts + sizes, sizes)[positions]
+        step = 1
+        while len(positions):
+            within = positions + step < ends
+            positions, ends = positions[within], ends[within]
+            pairs.append(order[positions].astype(np.int64) * n + order[positions + step])
+            step += 1
+
+    candidates = np.sort(np.concatenate(pairs)) if pairs else np.empty(0, dtype=np.int64)
+    if len(candidates):
+        candidates = candidates[np.concatenate(([True], candidates[1:] != candidates[:-1]))]
+    return candidates // n, candidates % n, skipped
+
+
+def verify_pairs(signatures, left, right, threshold=THRESHOLD):
+    """Estimated Jaccard for each candidate pair; returns the pairs at or above threshold."""
+    similarity = np.empty(len(left), dtype=np.float32)
+    for start in range(0, len(left), _VERIFY_CHUNK):
+        end = start + _VERIFY_CHUNK
+        similarity[start:end] = (signatures[left[start:end]] == signatures[right[start:end]]).mean(axis=1)
+    keep = similarity >= threshold
+    return left[keep], right[keep], similarity[keep]
+
+
+def find_parallels(token_lists, threshold=THRESHOLD, min_tokens=MIN_TOKENS):
+    """
+    Cluster documents by near-duplicate token sequences.
+
+    Returns (component, neighbours, stats): component[d] is a cluster label
+    (or -1 for documents too short to compare) and neighbours[d] the list of
+    (similarity, other document) pairs for d, most similar first.
+    """
+    n = len(token_lists)
+    group_of = np.full(n, -1, dtype=np.int64)
+    groups, group_members = {}, []
+    for doc, tokens in enumerate(token_lists):
+        if len(tokens) < max(min_tokens, SHINGLE_SIZE):
+            continue
+        key = ' '.join(tokens)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = len(group_members)
+            group_members.append([])
+        group_members[group].append(doc)
+        group_of[doc] = group
+
+    reps = [members[0] for members in group_members]
+    stats = {"documents": n, "compared": int((group_of >= 0).sum()), "distinct": len(reps),
+             "candidates": 0, "edges": 0, "skipped_buckets": 0}
+    if not reps:
+        return group_of, [[] for _ in range(n)], stats
+
+    signatures = document_signatures([token_lists[d] for d in reps])
+    left, right, skipped = lsh_candidates(signatures)
+    stats.update(candidates=int(len(left)), skipped_buckets=skipped)
+    left, right, similarity = verify_pairs(signatures, left, right, threshold)
+    stats["edges"] = int(len(left))
+
+    graph = sparse.coo_matrix((np.ones(len(left)), (left, right)), shape=(len(reps), len(reps)))
+    _, labels = connected_components(graph, directed=False)
+    component = np.where(group_of >= 0, labels[np.maximum(group_of, 0)], -1)
+
+    # Both directions of every edge, most similar first per representative (ties in document order)
+    src, dst = np.concatenate((left, right)), np.concatenate((right, left))
+    sim = np.round(np.concatenate((similarity, similarity)).astype(np.float64), 3)
+    order = np.lexsort((dst, -sim, src))
+    src, dst, sim = src[order], dst[order], sim[order]
+    top = np.arange(len(src)) - np.searchsorted(src, src) < MAX_PARALLELS
+    src, dst, sim = src[top], dst[top], sim[top].tolist()
+    bounds = np.searchsorted(src, np.arange(len(reps) + 1)).tolist()
+    dst = dst.tolist()
+
+    neighbours = [[] for _ in range(n)]
+    for group, members in enumerate(group_members):
+        linked = []
+        for s, other in zip(sim[bounds[group]:bounds[group + 1]], dst[bounds[group]:bounds[group + 1]]):
+            linked.extend((s, doc) for doc in group_members[other][:MAX_PARALLELS])
+        if len(members) == 1:
+            neighbours[members[0]] = linked[:MAX_PARALLELS]
+            continue
+        ranked = [(1.0, doc) for doc in members[:MAX_PARALLELS + 1]] + linked
+        for doc in members:
+            neighbours[doc] = [e for e in ranked if e[1] != doc][:MAX_PARALLELS]
+    return component, neighbours, stats
+
+
+def matn_tokens(hadiths):
+    return [tokenize(hadith.get('matn', '')) for hadith in hadiths]
+
+
+def annotate_parallels(hadiths, threshold=THRESHOLD):
+    """Set parallel_cluster / parallels on every hadith; returns stats."""
+    component, neighbours, stats = find_parallels(matn_tokens(hadiths), threshold)
+
+    # Named after the smallest member id, so labels do not depend on row order
+    cluster_name = {}
+    sizes = np.bincount(component[component >= 0]) if (component >= 0).any() else np.zeros(0, dtype=np.int64)
+    for doc, label in enumerate(component.tolist()):
+        if label >= 0 and sizes[label] > 1:
+            name = cluster_name.get(label)
+            if name is None or hadiths[doc]['id'] < name:
+                cluster_name[label] = hadiths[doc]['id']
+
+    for doc, hadith in enumerate(hadiths):
+        label = int(component[doc])
+        hadith['parallel_cluster'] = cluster_name.get(label)
+        hadith['parallels'] = [
+            {"id": hadiths[other]['id'], "source": hadiths[other].get('source', ''),
+             "hadith_no": hadiths[other].get('hadith_no', ''), "similarity": s}
+            for s, other in neighbours[doc]
+        ]
+
+    clustered = sizes[sizes > 1]
+    stats.update(clusters=len(clustered), clustered_hadiths=int(clustered.sum()),
+                 largest_cluster=int(clustered.max()) if len(clustered) else 0,
+                 cross_collection=sum(
+                     1 for h in hadiths if any(p['source'] != h.get('source', '') for p in h['parallels'])))
+    return stats
+
+
+def exact_jaccard_pairs(token_lists, sample, min_similarity):
+    """{(i, j): Jaccard} for sampled documents i against every other document, via sparse products."""
+    eligible = [d for d, tokens in enumerate(token_lists) if len(tokens) >= max(MIN_TOKENS, SHINGLE_SIZE)]
+    values, starts = shingle_sets([token_lists[d] for d in eligible])
+    _, columns = np.unique(values, return_inverse=True)
+    rows = np.repeat(np.arange(len(eligible)), np.diff(np.concatenate((starts, [len(values)]))))
+    matrix = sparse.csr_matrix((np.ones(len(values), dtype=np.float32), (rows, columns)))
+    sizes = np.asarray(matrix.sum(axis=1)).ravel()
+
+    position = {doc: i for i, doc in enumerate(eligible)}
+    picked = [position[d] for d in sample if d in position]
+    overlap = (matrix[picked] @ matrix.T).tocoo()
+    result = {}
+    for r, c, inter in zip(overlap.row, overlap.col, overlap.data):
+        i, j = eligible[picked[r]], eligible[c]
+        jaccard = inter / (sizes[picked[r]] + sizes[c] - inter)
+        if i != j and jaccard >= min_similarity:
+            result[(i, j)] = float(jaccard)
+    return result
+
+
+def check(hadiths, sample_size=500, scale=1, seed=0):
+    """LSH links against exact shingle Jaccard for a sample of hadiths; returns (report, problems)."""
+    token_lists = replicate(matn_tokens(hadiths), scale)
+    ids = [hadith['id'] for hadith in hadiths]
+    names = ids + [f"{hadith_id} (copy {c})" for c in range(1, scale) for hadith_id in ids]
+    _, neighbours, _ = find_parallels(token_lists)
+    sample = random.Random(seed).sample(range(len(token_lists)), min(sample_size, len(token_lists)))
+    exact = exact_jaccard_pairs(token_lists, sample, 0.0)
+
+    # Clear parallels (comfortably above the threshold) must be found unless the list is full,
+    # and linked pairs must not be far below it (MinHash estimates are approximate)
+    found = {(d, other) for d in sample for _, other in neighbours[d]}
+    expected = [pair for pair, j in exact.items() if j >= THRESHOLD + 0.1]
+    missed = [pair for pair in expected if pair not in found and len(neighbours[pair[0]]) < MAX_PARALLELS]
+    loose = [pair for pair in found if exact.get(pair, 0.0) < THRESHOLD - 0.15]
+
+    report = {"sampled": len(sample), "expected": len(expected), "missed": len(missed),
+              "reported": len(found), "below_threshold": len(loose)}
+    problems = []
+    if len(missed) > 0.05 * len(expected):
+        problems += [f"{names[i]} ~ {names[j]} (Jaccard {exact[(i, j)]:.2f}) not linked"
+                     for i, j in missed]
+    if len(loose) > 0.05 * len(found):
+        problems += [f"{names[i]} ~ {names[j]} linked at Jaccard {exact.get((i, j), 0.0):.2f}"
+                     for i, j in loose]
+    return report, problems
+
+
+def replicate(token_lists, scale, seed=0, noise=0.1):
+    """The corpus `scale` times; each copy drops or swaps about `noise` of every text's tokens."""
+    rng = random.Random(seed)
+    result = list(token_lists)
+    for _ in range(scale - 1):
+        for tokens in token_lists:
+            copy = []
+            for token in tokens:
+                roll = rng.random()
+                if roll < noise / 2:
+                    continue
+                copy.append(rng.choice(tokens) if roll < noise else token)
+            result.append(copy)
+    return result
+
+
+def benchmark(hadiths, scale=10):
+    """Clustering time and candidate counts at 1x and `scale`x the corpus."""
+    base = matn_tokens(hadiths)
+    results = []
+    for factor in sorted({1, scale}):
+        token_lists = replicate(base, factor)
+        start = time.perf_counter()
+        _, _, stats = find_parallels(token_lists)
+        seconds = time.perf_counter() - start
+        results.append((factor, seconds, stats))
+        print(f"   - {factor:>3}x: {stats['documents']:>8} hadiths in {seconds:6.2f}s "
+              f"({stats['documents'] / seconds:,.0f}/s), {stats['candidates']:,} candidates, "
+              f"{stats['edges']:,} edges, {stats['skipped_buckets']} skipped buckets, "
+              f"peak RSS {peak_rss_bytes() / (1024 * 1024):.0f} MB")
+    if len(results) > 1:
+        (f1, s1, _), (f2, s2, _) = results
+        print(f"   - {f2}x corpus took {s2 / s1:.1f}x the time of 1x (linear would be {f2 / f1:.0f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate hadiths with MinHash/LSH")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory containing hadith-index.json")
+    parser.add_argument("--check", action="store_true", help="Compare LSH links with exact Jaccard on a sample")
+    parser.add_argument("--sample", type=int, default=500, help="Hadiths sampled by --check")
+    parser.add_argument("--benchmark", action="store_true", help="Time clustering at 1x and --scale x")
+    parser.add_argument("--scale", type=int, help="Corpus multiple, as noisy copies (--check: 1, --benchmark: 10)")
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(args.data_dir, 'hadith-index.json'), 'r', encoding='utf-8') as f:
+        hadiths = json.load(f)
+
+    if args.check:
+        report, problems = check(hadiths, args.sample, args.scale or 1)
+        print(f"Sampled {report['sampled']} hadiths: {report['expected']} pairs with Jaccard >= "
+              f"{THRESHOLD + 0.1:.2f}, {report['missed']} missed; {report['reported']} reported, "
+              f"{report['below_threshold']} below {THRESHOLD - 0.15:.2f}")
+        for problem in problems[:20]:
+            print(f"   - {problem}")
+        if problems:
+            print("❌ LSH parallels disagree with exact Jaccard")
+            return 1
+        print("✅ LSH parallels match exact Jaccard on the sample")
+        return 0
+
+    if args.benchmark:
+        print(f"Parallel clustering ({NUM_PERM} permutations, {BANDS} bands, threshold {THRESHOLD}):")
+        benchmark(hadiths, args.scale or 10)
+        return 0
+
+    start = time.perf_counter()
+    stats = annotate_parallels(hadiths)
+    print(f"📊 {stats['clusters']} clusters covering {stats['clustered_hadiths']} of {stats['documents']} hadiths "
+          f"(largest {stats['largest_cluster']}, {stats['cross_collection']} with cross-collection parallels) "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
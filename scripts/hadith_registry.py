@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Persistent hadith id registry shared by the build scripts.
+
+Public hadith ids (/hadith/sahih-al-bukhari-12) used to be recomputed on every
+run from row order, with a `while unique_id in seen_ids` loop per duplicate,
+separately in extract_enhanced_data.py and generate_hadith_index.py; moving a
+row in the CSV silently renamed hadiths and broke links and caches.
+
+data-processing/data/hadith-ids.sqlite now assigns each hadith its id once:
+
+    hadith_ids(id INTEGER PRIMARY KEY, public_id TEXT UNIQUE,
+               source, hadith_no, content_hash, occurrence)
+
+A row is identified by (source, hadith_no, hash of its Arabic text); identical
+rows are told apart by their occurrence number. Later runs resolve ids with a
+dict lookup and only insert rows never seen before. If a hadith's text is
+edited, the row still keeps its id as long as (source, hadith_no) is
+unambiguous. An empty registry seeded from the CSV (csv.DictReader rows, as
+extract_enhanced_data.py and this script read it) gets exactly the ids the
+old row-order scheme produced, so existing URLs survive the switch. That
+includes rows whose source or hadith_no is the literal 'NA': they are keyed
+as missing values but keep 'na' / 'NA' in their public id, as before.
+
+The integer id is the primary key of `hadiths` in scholars.db, so SQLite ids
+are stable across rebuilds too.
+
+Usage:
+    python scripts/hadith_registry.py            # register new rows from the CSV
+    python scripts/hadith_registry.py --check    # verify every row already has an id
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import sqlite3
+import sys
+from collections import defaultdict
+
+from build_metrics import BuildRun, add_profile_argument
+from text_normalize import slugify
+
+DATA_DIR = 'data-processing/data'
+CSV_PATH = os.path.join(DATA_DIR, 'all_hadiths_clean.csv')
+REGISTRY_PATH = os.path.join(DATA_DIR, 'hadith-ids.sqlite')
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS hadith_ids (
+        id INTEGER PRIMARY KEY,
+        public_id TEXT NOT NULL UNIQUE,
+        source TEXT NOT NULL,
+        hadith_no TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        occurrence INTEGER NOT NULL DEFAULT 0,
+        UNIQUE (source, hadith_no, content_hash, occurrence)
+    )
+"""
+
+
+def _clean(value):
+    # csv keeps 'NA' where pandas yields NaN; both mean "no value"
+    if value is None or value != value or value == 'NA':
+        return ''
+    return str(value).strip()
+
+
+def _raw(value):
+    # What the old id loop saw: the stripped CSV string, 'NA' included
+    if value is None or value != value:
+        return ''
+    return str(value).strip()
+
+
+def content_hash(text_ar):
+    """Short stable hash of a hadith's Arabic text."""
+    return hashlib.sha1(_clean(text_ar).encode('utf-8')).hexdigest()[:16]
+
+
+class HadithIdRegistry:
+    """Resolve (source, hadith_no, text) rows to stable public ids."""
+
+    def __init__(self, path=REGISTRY_PATH, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        else:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(path)
+            self.conn.execute(SCHEMA)
+        self.stats = {"reused": 0, "rekeyed": 0, "assigned": 0}
+
+        self.by_key = {}
+        self.key_of = {}
+        self.by_number = defaultdict(list)
+        self.taken = set()
+        for row_id, public_id, source, hadith_no, digest, occurrence in self.conn.execute(
+            "SELECT id, public_id, source, hadith_no, content_hash, occurrence FROM hadith_ids"
+        ):
+            self.by_key[(source, hadith_no, digest, occurrence)] = (row_id, public_id)
+            self.key_of[row_id] = (source, hadith_no, digest, occurrence)
+            self.by_number[(source, hadith_no)].append((row_id, public_id))
+            self.taken.add(public_id)
+        self._next_suffix = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return len(self.taken)
+
+    def _new_public_id(self, base_id):
+        # Same names the old `while unique_id in seen_ids` loop produced, without
+        # rescanning from -2 for every duplicate of a base
+        if base_id not in self.taken:
+            return base_id
+        suffix = self._next_suffix.get(base_id, 2)
+        while f"{base_id}-{suffix}" in self.taken:
+            suffix += 1
+        self._next_suffix[base_id] = suffix + 1
+        return f"{base_id}-{suffix}"
+
+    def assign(self, rows):
+        """
+        Public ids for rows of (source, hadith_no, text_ar), in order.
+
+        Unknown rows get new ids, committed in one transaction; a read-only
+        registry raises KeyError for them instead.
+        """
+        keys, bases = [], []
+        seen = defaultdict(int)
+        for position, (source, hadith_no, text_ar) in enumerate(rows):
+            # Public ids are built from the raw values, like the old loop did
+            slug, number = slugify(_raw(source) or 'Unknown Book'), _raw(hadith_no)
+            bases.append(f"{slug}-{number}" if number else f"{slug}-{position}")
+            source = _clean(source) or 'Unknown Book'
+            hadith_no = _clean(hadith_no)
+            digest = content_hash(text_ar)
+            keys.append((source, hadith_no, digest, seen[(source, hadith_no, digest)]))
+            seen[(source, hadith_no, digest)] += 1
+
+        # Exact matches first, so an edited row cannot take an id that an
+        # unchanged row later in the file still owns
+        ids = [self.by_key.get(key) for key in keys]
+        claimed = {found[1] for found in ids if found is not None}
+        self.stats["reused"] += len(claimed)
+
+        pending = []
+        for position, key in enumerate(keys):
+            if ids[position] is not None:
+                continue
+            source, hadith_no = key[0], key[1]
+            registered = self.by_number.get((source, hadith_no), ())
+            # Edited text: keep the id when (source, hadith_no) names exactly one hadith
+            if len(registered) == 1 and registered[0][1] not in claimed:
+                found = registered[0]
+                pending.append(('rekey', key, found[0]))
+                self.stats["rekeyed"] += 1
+            elif self.readonly:
+                raise KeyError(f"{source} #{hadith_no} is not registered in {self.path}")
+            else:
+                public_id = self._new_public_id(bases[position])
+                self.taken.add(public_id)
+                found = (None, public_id)
+                pending.append(('insert', key, public_id))
+                self.stats["assigned"] += 1
+            claimed.add(found[1])
+            ids[position] = found
+
+        if pending and not self.readonly:
+            self._commit(pending)
+        return [found[1] for found in ids]
+
+    def _commit(self, pending):
+        with self.conn:
+            for action, key, value in pending:
+                source, hadith_no, digest, occurrence = key
+                if action == 'rekey':
+                    self.conn.execute(
+                        "UPDATE hadith_ids SET content_hash = ?, occurrence = ? WHERE id = ?",
+                        (digest, occurrence, value)
+                    )
+                    self.by_key[key] = self.by_key.pop(self.key_of[value])
+                    self.key_of[value] = key
+                    continue
+                cursor = self.conn.execute(
+                    "INSERT INTO hadith_ids (public_id, source, hadith_no, content_hash, occurrence) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (value, source, hadith_no, digest, occurrence)
+                )
+                entry = (cursor.lastrowid, value)
+                self.by_key[key] = entry
+                self.key_of[entry[0]] = key
+                self.by_number[(source, hadith_no)].append(entry)
+
+    def numeric_ids(self):
+        """{public_id: integer id} for every registered hadith."""
+        return dict(self.conn.execute("SELECT public_id, id FROM hadith_ids"))
+
+
+def read_csv_rows(csv_path=CSV_PATH):
+    """(source, hadith_no, text_ar) for every CSV row, the way the build scripts read them."""
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        return [(row.get('source', ''), row.get('hadith_no', ''), row.get('text_ar', ''))
+                for row in csv.DictReader(f)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Register stable ids for new hadith rows")
+    parser.add_argument("--csv", default=CSV_PATH, help="Hadith CSV to register")
+    parser.add_argument("--registry", default=REGISTRY_PATH, help="Registry database")
+    parser.add_argument("--check", action="store_true", help="Fail if any row has no id yet")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    rows = read_csv_rows(args.csv)
+    if args.check:
+        if not os.path.exists(args.registry):
+            print(f"❌ {args.registry} does not exist")
+            return 1
+        with HadithIdRegistry(args.registry, readonly=True) as registry:
+            try:
+                registry.assign(rows)
+            except KeyError as e:
+                print(f"❌ {e.args[0]}")
+                return 1
+        print(f"✅ All {len(rows)} rows have registered ids")
+        return 0
+
+    with BuildRun('hadith_registry', DATA_DIR, profile=args.profile) as run:
+        with run.stage('assign'), HadithIdRegistry(args.registry) as registry:
+            registry.assign(rows)
+            run.count('rows_read', len(rows))
+            for name, value in registry.stats.items():
+                run.count(f"ids_{name}", value)
+    print(f"Registry {args.registry}: {len(registry)} ids "
+          f"({registry.stats['assigned']} new, {registry.stats['rekeyed']} re-keyed)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Precomputed "related hadiths" from TF-IDF cosine similarity.
+
+Every matn is tokenized like the search index (hadith_search.tokenize) and
+weighted with sublinear TF-IDF into one L2-normalized sparse CSR matrix
+(hadiths x terms, float32). Terms that occur in a single hadith cannot link
+two of them and terms in more than MAX_DF of all hadiths are formulae
+("qala", "rasul allah") rather than topics, so both are dropped.
+
+Cosine similarity is X @ X.T, but the hadiths x hadiths result is never
+built: rows are taken in blocks of BLOCK_CELLS / hadiths, each block's sparse
+product strip is cut to entries of at least MIN_SIMILARITY (other than the
+hadith itself) and a lexsort by (row, -score) keeps the TOP_K best per row.
+Blocks are spread over worker processes, each holding one copy of the
+matrix.
+
+generate_hadith_index.py stores the result as a compact id list per hadith,
+
+    "related": ["sahih-muslim-1907", "sunan-abi-dawud-2201", ...]
+
+most similar first (at most TOP_K, each with cosine >= MIN_SIMILARITY).
+
+Usage:
+    python scripts/hadith_related.py                 # related-list stats for hadith-index.json
+    python scripts/hadith_related.py --check         # blocked top-k vs. row-by-row brute force on a sample
+    python scripts/hadith_related.py --benchmark     # build time and peak memory per block size / workers
+    python scripts/hadith_related.py --benchmark --scale 10 --vocabulary 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+import numpy as np
+from scipy import sparse
+
+from build_metrics import current_rss_bytes, peak_rss_bytes
+from hadith_search import tokenize
+
+DATA_DIR = 'public/data'
+
+TOP_K = 10
+MIN_SIMILARITY = 0.05
+MAX_DF = 0.05
+# Rows per block = BLOCK_CELLS / hadiths, bounding each product strip
+BLOCK_CELLS = 2_000_000
+
+
+def matn_tokens(hadiths):
+    return [tokenize(hadith.get('matn', '')) for hadith in hadiths]
+
+
+def tfidf_matrix(token_lists, max_df=MAX_DF):
+    """L2-normalized sublinear TF-IDF rows (CSR, float32) and the number of terms kept."""
+    vocabulary = {}
+    lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+    columns = np.fromiter((vocabulary.setdefault(token, len(vocabulary)) for token in chain.from_iterable(token_lists)),
+                          dtype=np.int32, count=int(lengths.sum()))
+    rows = np.repeat(np.arange(len(token_lists), dtype=np.int32), lengths)
+
+    # Duplicate (row, column) entries are summed into term counts
+    counts = sparse.csr_matrix((np.ones(len(columns), dtype=np.float32), (rows, columns)),
+                               shape=(len(token_lists), len(vocabulary)))
+    counts.sum_duplicates()
+    df = np.bincount(counts.indices, minlength=len(vocabulary))
+    keep = (df > 1) & (df <= max(2, max_df * len(token_lists)))
+    counts = counts[:, np.flatnonzero(keep)].tocsr()
+
+    idf = np.log(len(token_lists) / df[keep]).astype(np.float32)
+    counts.data = (1 + np.log(counts.data)) * idf[counts.indices]
+    norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags((1 / norms).astype(np.float32)) @ counts, int(keep.sum())
+
+
+_worker_matrix = None
+_worker_transposed = None
+
+
+def _init_worker(matrix):
+    global _worker_matrix, _worker_transposed
+    _worker_matrix, _worker_transposed = matrix, matrix.T.tocsr()
+
+
+def top_k_block(matrix, transposed, start, end, k=TOP_K, min_similarity=MIN_SIMILARITY):
+    """(indices, scores) of the k most similar other rows for rows start..end, best first."""
+    strip = (matrix[start:end] @ transposed).tocsr()
+    rows = np.repeat(np.arange(end - start), np.diff(strip.indptr))
+    columns, values = strip.indices, strip.data
+    # Nearly every row shares some term with thousands of others, almost all far below
+    # min_similarity, so ranking only what clears it is much cheaper than densifying
+    keep = (values >= min_similarity) & (columns != rows + start)
+    rows, columns, values = rows[keep], columns[keep], values[keep]
+    # Best first; ties broken by row order
+    order = np.lexsort((columns, -values, rows))
+    rows, columns, values = rows[order], columns[order], values[order]
+    rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+    top = rank < k
+
+    indices = np.zeros((end - start, k), dtype=np.int64)
+    scores = np.full((end - start, k), np.nan, dtype=np.float32)
+    indices[rows[top], rank[top]] = columns[top]
+    scores[rows[top], rank[top]] = values[top]
+    return indices, scores
+
+
+def _worker_block(bounds):
+    start, end = bounds
+    return start, top_k_block(_worker_matrix, _worker_transposed, start, end)
+
+
+def block_rows(n, block_cells=BLOCK_CELLS):
+    return max(1, block_cells // max(n, 1))
+
+
+def related_top_k(matrix, workers=None, block_cells=BLOCK_CELLS):
+    """(indices, scores) arrays of shape (n, k); scores are NaN past the last related row."""
+    n = matrix.shape[0]
+    step = block_rows(n, block_cells)
+    bounds = [(start, min(start + step, n)) for start in range(0, n, step)]
+    indices = np.zeros((n, TOP_K), dtype=np.int64)
+    scores = np.full((n, TOP_K), np.nan, dtype=np.float32)
+
+    if workers == 1 or len(bounds) == 1:
+        transposed = matrix.T.tocsr()
+        results = ((start, top_k_block(matrix, transposed, start, end)) for start, end in bounds)
+        for start, (best, best_scores) in results:
+            indices[start:start + len(best)], scores[start:start + len(best)] = best, best_scores
+        return indices, scores
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matrix,)) as pool:
+        for start, (best, best_scores) in pool.map(_worker_block, bounds):
+            indices[start:start + len(best)], scores[start:start + len(best)] = best, best_scores
+    return indices, scores
+
+
+def annotate_related(hadiths, workers=None):
+    """Set "related" (ids, most similar first) on every hadith; returns stats."""
+    matrix, terms = tfidf_matrix(matn_tokens(hadiths))
+    indices, scores = related_top_k(matrix, workers)
+    lengths = []
+    for doc, hadith in enumerate(hadiths):
+        valid = ~np.isnan(scores[doc])
+        hadith['related'] = [hadiths[other]['id'] for other in indices[doc][valid].tolist()]
+        lengths.append(len(hadith['related']))
+    return {"hadiths": len(hadiths), "terms": terms, "nnz": int(matrix.nnz),
+            "with_related": sum(1 for n in lengths if n), "links": sum(lengths)}
+
+
+def brute_force_top_k(matrix, doc, k=TOP_K, min_similarity=MIN_SIMILARITY):
+    """Reference top-k for one row: its full similarity row, sorted."""
+    row = (matrix[doc] @ matrix.T).toarray().ravel()
+    row[doc] = -1
+    order = np.lexsort((np.arange(len(row)), -row))[:k]
+    return [(int(i), float(row[i])) for i in order if row[i] >= min_similarity]
+
+
+def check(token_lists, sample_size=300, seed=0, workers=None):
+    """Blocked, parallel top-k against brute force for sampled documents; returns mismatching rows."""
+    matrix, _ = tfidf_matrix(token_lists)
+    # Small blocks so the sample spans many of them
+    indices, scores = related_top_k(matrix, workers, block_cells=max(matrix.shape[0] * 7, 1))
+    problems = []
+    for doc in random.Random(seed).sample(range(len(token_lists)), min(sample_size, len(token_lists))):
+        expected = brute_force_top_k(matrix, doc)
+        valid = ~np.isnan(scores[doc])
+        actual = list(zip(indices[doc][valid].tolist(), scores[doc][valid].tolist()))
+        # Scores must agree position by position; ids may only differ among rows tied with the last one
+        if len(actual) != len(expected) or any(abs(a[1] - e[1]) > 1e-5 for a, e in zip(actual, expected)):
+            problems.append(doc)
+        elif expected and _above(actual, expected[-1][1]) != _above(expected, expected[-1][1]):
+            problems.append(doc)
+    return problems
+
+
+def _above(ranked, score):
+    return {i for i, s in ranked if s > score + 1e-5}
+
+
+def benchmark_tokens(hadiths, scale=1, vocabulary=None, seed=0):
+    """
+    Matn tokens, `scale` times over. With `vocabulary`, every token is redrawn
+    from a Zipf(1) distribution over that many terms, keeping document lengths:
+    the synthetic corpora repeat a few dozen words, which no real text does.
+    """
+    token_lists = matn_tokens(hadiths) * scale
+    if not vocabulary:
+        return token_lists
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, vocabulary + 1)
+    lengths = [len(tokens) for tokens in token_lists]
+    draws = rng.choice(vocabulary, size=sum(lengths), p=weights / weights.sum()).tolist()
+    result, offset = [], 0
+    for length in lengths:
+        result.append([f"t{term}" for term in draws[offset:offset + length]])
+        offset += length
+    return result
+
+
+def benchmark(token_lists, worker_counts=(1, None), block_sizes=(BLOCK_CELLS // 4, BLOCK_CELLS, BLOCK_CELLS * 4)):
+    """Build time and peak memory for a few block sizes and worker counts."""
+    start = time.perf_counter()
+    matrix, terms = tfidf_matrix(token_lists)
+    tfidf_s = time.perf_counter() - start
+    n = matrix.shape[0]
+    print(f"Related hadiths over {n} hadiths: TF-IDF {tfidf_s:.2f}s, {terms} terms, {matrix.nnz:,} non-zeros, "
+          f"RSS {current_rss_bytes() / (1024 * 1024):.0f} MB "
+          f"(a dense similarity matrix would be {n * n * 4 / 1e9:.1f} GB)")
+    for block_cells in block_sizes:
+        for workers in worker_counts:
+            start = time.perf_counter()
+            related_top_k(matrix, workers, block_cells)
+            seconds = time.perf_counter() - start
+            label = 'all CPUs' if workers is None else f"{workers} worker{'s' if workers > 1 else ''}"
+            print(f"   - {block_rows(n, block_cells):>5} rows/block, {label:>9}: {seconds:6.2f}s "
+                  f"({n / seconds:,.0f} hadiths/s), peak RSS {peak_rss_bytes() / (1024 * 1024):.0f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Top-k related hadiths from TF-IDF cosine similarity")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory containing hadith-index.json")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--check", action="store_true", help="Compare with brute-force top-k on a sample")
+    parser.add_argument("--benchmark", action="store_true", help="Time block sizes and worker counts")
+    parser.add_argument("--scale", type=int, default=1, help="Corpus multiple for --check/--benchmark")
+    parser.add_argument("--vocabulary", type=int, help="Redraw tokens from a Zipf vocabulary of this size "
+                                                       "(--check/--benchmark on synthetic corpora)")
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(args.data_dir, 'hadith-index.json'), 'r', encoding='utf-8') as f:
+        hadiths = json.load(f)
+
+    if args.check:
+        problems = check(benchmark_tokens(hadiths, args.scale, args.vocabulary), workers=args.workers)
+        for doc in problems[:20]:
+            print(f"   - {hadiths[doc % len(hadiths)]['id']}: related list differs from brute force")
+        if problems:
+            print(f"❌ {len(problems)} sampled hadiths differ from brute-force top-{TOP_K}")
+            return 1
+        print(f"✅ Blocked top-{TOP_K} matches brute force on the sample")
+        return 0
+
+    if args.benchmark:
+        benchmark(benchmark_tokens(hadiths, args.scale, args.vocabulary))
+        return 0
+
+    start = time.perf_counter()
+    stats = annotate_related(hadiths, args.workers)
+    print(f"📊 {stats['with_related']} of {stats['hadiths']} hadiths have related hadiths "
+          f"({stats['links']} links, {stats['terms']} terms) in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
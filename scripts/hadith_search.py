@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Prebuilt BM25 search index over hadith text.
+
+The command palette used to download hadith-index.json and build a Fuse index
+over every matn on first open. generate_hadith_index.py now writes
+public/data/hadith-search/ instead, so a client only fetches the postings for
+the terms it is looking up:
+
+- manifest.json: tokenizer settings, BM25 parameters, shard count and per
+  collection {slug, name, doc_count, avg_len}
+- docs/{slug}.json: one row per hadith in the collection,
+  [id, hadith_no, token_count, snippet]; postings refer to row numbers
+- postings/{slug}/{shard}.json: {term: [doc, tf, doc_delta, tf, ...]} for the
+  terms whose FNV-1a hash falls in that shard; doc numbers are delta-encoded,
+  so df is half the list length
+
+Arabic (matn) and English (matn_en) text are normalized and tokenized into one
+field: diacritics and tatweel are dropped, alef/yaa/taa marbuta variants are
+folded (text_normalize.normalize_search) and English is lowercased. lib/hadithSearch.ts implements the same
+tokenizer, hash and scoring; HadithSearch below is the reference ranking.
+
+Usage:
+    python scripts/hadith_search.py                        # rebuild from hadith-index.json
+    python scripts/hadith_search.py --query "intention"    # search with the reference engine
+    python scripts/hadith_search.py --check                # artifacts vs brute-force BM25
+    python scripts/hadith_search.py --benchmark            # build time + per-query latency
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+from artifact_io import atomic_write_bytes, atomic_write_json
+from build_metrics import BuildRun, add_profile_argument
+from text_normalize import normalize_search as normalize, slugify
+
+DATA_DIR = 'public/data'
+SEARCH_DIR = os.path.join(DATA_DIR, 'hadith-search')
+
+SHARD_COUNT = 64
+SNIPPET_LENGTH = 160
+MIN_TOKEN_LENGTH = 2
+K1 = 1.2
+B = 0.75
+
+# Letters and digits (JS: /[\p{L}\p{N}]+/gu)
+_TOKEN = re.compile(r'[^\W_]+')
+
+STOPWORDS = frozenset("""
+    a an and are as at be but by for from had has have he her him his i in is it its
+    me my not of on or our she so that the their them then there they this to was we
+    were what when which who will with you your
+""".split())
+
+
+def tokenize(text):
+    return [token for token in _TOKEN.findall(normalize(text))
+            if len(token) >= MIN_TOKEN_LENGTH and token not in STOPWORDS]
+
+
+def document_tokens(hadith):
+    return tokenize(hadith.get('matn', '')) + tokenize(hadith.get('matn_en', ''))
+
+
+def term_shard(term, shard_count=SHARD_COUNT):
+    """FNV-1a (32-bit) over the term's UTF-8 bytes, modulo shard_count."""
+    value = 0x811c9dc5
+    for byte in term.encode('utf-8'):
+        value = ((value ^ byte) * 0x01000193) & 0xffffffff
+    return value % shard_count
+
+
+def collection_slug(name):
+    return slugify(name) or 'unknown'
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_search_index(hadiths, output_dir=SEARCH_DIR, shard_count=SHARD_COUNT):
+    """Write manifest, doc tables and sharded postings; returns size stats."""
+    collections = {}
+    for hadith in hadiths:
+        name = hadith.get('source') or hadith.get('book') or 'Unknown Book'
+        collections.setdefault(collection_slug(name), {"name": name, "hadiths": []})['hadiths'].append(hadith)
+
+    written = set()
+    stats = {"collections": len(collections), "terms": 0, "postings": 0, "files": 0, "bytes": 0}
+
+    def write(rel_path, payload):
+        atomic_write_bytes(os.path.join(output_dir, rel_path), payload)
+        written.add(rel_path)
+        stats["files"] += 1
+        stats["bytes"] += len(payload)
+
+    manifest_collections = []
+    for slug, collection in collections.items():
+        docs = []
+        shards = defaultdict(dict)
+        total_len = 0
+        for doc, hadith in enumerate(collection['hadiths']):
+            tokens = document_tokens(hadith)
+            total_len += len(tokens)
+            docs.append([hadith['id'], hadith.get('hadith_no', ''), len(tokens),
+                         (hadith.get('matn') or hadith.get('matn_en') or '')[:SNIPPET_LENGTH]])
+            # Docs are visited in order, so appending keeps every list sorted
+            for term, tf in Counter(tokens).items():
+                postings = shards[term_shard(term, shard_count)].setdefault(term, [])
+                postings.append(doc)
+                postings.append(tf)
+            stats["postings"] += len(set(tokens))
+
+        write(os.path.join('docs', f"{slug}.json"), _dumps(docs))
+        for shard, terms in shards.items():
+            for postings in terms.values():
+                # Delta-encode doc numbers (every other entry), back to front
+                for i in range(len(postings) - 2, 0, -2):
+                    postings[i] -= postings[i - 2]
+            stats["terms"] += len(terms)
+            write(os.path.join('postings', slug, f"{shard}.json"), _dumps(terms))
+
+        manifest_collections.append({
+            "slug": slug,
+            "name": collection['name'],
+            "doc_count": len(docs),
+            "avg_len": total_len / len(docs) if docs else 0.0,
+            "shards": sorted(shards),
+        })
+
+    manifest = {
+        "version": 1,
+        "shard_count": shard_count,
+        "k1": K1,
+        "b": B,
+        "min_token_length": MIN_TOKEN_LENGTH,
+        "stopwords": sorted(STOPWORDS),
+        "collections": manifest_collections,
+    }
+    atomic_write_json(os.path.join(output_dir, 'manifest.json'), manifest)
+    written.add('manifest.json')
+
+    # Collections or shards that no longer exist would otherwise linger
+    for root, _dirs, files in os.walk(output_dir):
+        for name in files:
+            rel_path = os.path.relpath(os.path.join(root, name), output_dir)
+            if rel_path not in written:
+                os.remove(os.path.join(root, name))
+    return stats
+
+
+def bm25(tf, df, doc_len, doc_count, avg_len, k1=K1, b=B):
+    idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+    return idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len / (avg_len or 1.0)))
+
+
+def _rank(scores, limit):
+    # Highest score first; ties keep collection and document order
+    ordered = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return ordered[:limit]
+
+
+class HadithSearch:
+    """Reference query engine over the written artifacts; shards load on demand."""
+
+    def __init__(self, search_dir=SEARCH_DIR):
+        self.search_dir = search_dir
+        with open(os.path.join(search_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.collections = {c['slug']: c for c in self.manifest['collections']}
+        self.slugs = list(self.collections)
+        self.order = {slug: i for i, slug in enumerate(self.slugs)}
+        self.shards = {}
+        self.decoded = {}
+        self.docs = {}
+
+    def _load(self, *parts):
+        with open(os.path.join(self.search_dir, *parts), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def postings(self, slug, term):
+        """[(doc, tf), ...] for a term in one collection."""
+        if (slug, term) in self.decoded:
+            return self.decoded[(slug, term)]
+        shard = term_shard(term, self.manifest['shard_count'])
+        if shard not in self.collections[slug]['shards']:
+            return []
+        if (slug, shard) not in self.shards:
+            self.shards[(slug, shard)] = self._load('postings', slug, f"{shard}.json")
+        packed = self.shards[(slug, shard)].get(term, [])
+        pairs, doc = [], 0
+        for i in range(0, len(packed), 2):
+            doc += packed[i]
+            pairs.append((doc, packed[i + 1]))
+        self.decoded[(slug, term)] = pairs
+        return pairs
+
+    def doc_table(self, slug):
+        if slug not in self.docs:
+            self.docs[slug] = self._load('docs', f"{slug}.json")
+        return self.docs[slug]
+
+    def search(self, query, collections=None, limit=20):
+        """[(hadith_id, score), ...] best first, over the given collection slugs (default all)."""
+        terms = set(tokenize(query))
+        scores = {}
+        for slug in collections or self.collections:
+            meta = self.collections[slug]
+            docs = self.doc_table(slug)
+            for term in terms:
+                pairs = self.postings(slug, term)
+                for doc, tf in pairs:
+                    key = (self.order[slug], doc)
+                    scores[key] = scores.get(key, 0.0) + bm25(
+                        tf, len(pairs), docs[doc][2], meta['doc_count'], meta['avg_len'],
+                        self.manifest['k1'], self.manifest['b']
+                    )
+        return [(self.doc_table(self.slugs[c])[doc][0], score)
+                for (c, doc), score in _rank(scores, limit)]
+
+
+def brute_force_search(hadiths, query, collections=None, limit=20):
+    """BM25 straight from hadith-index entries, independent of the artifacts."""
+    by_collection = {}
+    ids = defaultdict(list)
+    for hadith in hadiths:
+        slug = collection_slug(hadith.get('source') or hadith.get('book') or 'Unknown Book')
+        by_collection.setdefault(slug, []).append(Counter(document_tokens(hadith)))
+        ids[slug].append(hadith['id'])
+
+    terms = set(tokenize(query))
+    scores = {}
+    for c, (slug, docs) in enumerate(by_collection.items()):
+        if collections and slug not in collections:
+            continue
+        lengths = [sum(counts.values()) for counts in docs]
+        avg_len = sum(lengths) / len(docs)
+        for term in terms:
+            df = sum(1 for counts in docs if term in counts)
+            for doc, counts in enumerate(docs):
+                if term in counts:
+                    scores[(c, doc)] = scores.get((c, doc), 0.0) + bm25(
+                        counts[term], df, lengths[doc], len(docs), avg_len
+                    )
+    slugs = list(by_collection)
+    return [(ids[slugs[c]][doc], score) for (c, doc), score in _rank(scores, limit)]
+
+
+def sample_queries(hadiths, count, seed=0):
+    """1-3 term queries drawn from real hadith text."""
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        tokens = document_tokens(rng.choice(hadiths))
+        if tokens:
+            queries.append(' '.join(rng.sample(tokens, min(len(tokens), rng.randint(1, 3)))))
+    return queries
+
+
+def check(hadiths, search_dir, queries=50, seed=0):
+    """Compare the artifact engine with brute-force BM25 on sampled queries; returns mismatches."""
+    engine = HadithSearch(search_dir)
+    problems = []
+    for query in sample_queries(hadiths, queries, seed):
+        expected = brute_force_search(hadiths, query)
+        actual = engine.search(query)
+        if [i for i, _ in expected] != [i for i, _ in actual] or any(
+            abs(a - e) > 1e-9 for (_, a), (_, e) in zip(actual, expected)
+        ):
+            problems.append(query)
+    return problems
+
+
+def benchmark(hadiths, queries=500, seed=0):
+    """Build time, artifact size and cold/warm per-query latency."""
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        stats = write_search_index(hadiths, tmp)
+        build_s = time.perf_counter() - start
+
+        sample = sample_queries(hadiths, queries, seed)
+        cold, warm = [], []
+        for query in sample:
+            engine = HadithSearch(tmp)
+            t0 = time.perf_counter()
+            engine.search(query)
+            cold.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            engine.search(query)
+            warm.append(time.perf_counter() - t0)
+
+        start = time.perf_counter()
+        for query in sample[:20]:
+            brute_force_search(hadiths, query)
+        brute_s = (time.perf_counter() - start) / min(20, len(sample))
+
+    cold.sort()
+    warm.sort()
+    print(f"Hadith search over {len(hadiths)} hadiths ({stats['collections']} collections):")
+    print(f"   - build: {build_s:.2f}s, {stats['terms']} terms, {stats['postings']} postings, "
+          f"{stats['files']} files, {stats['bytes'] / (1024 * 1024):.1f} MB")
+    print(f"   - query, cold shards: p50 {cold[len(cold) // 2] * 1000:.2f} ms, "
+          f"p95 {cold[int(len(cold) * 0.95)] * 1000:.2f} ms")
+    print(f"   - query, warm shards: p50 {warm[len(warm) // 2] * 1000:.2f} ms, "
+          f"p95 {warm[int(len(warm) * 0.95)] * 1000:.2f} ms")
+    print(f"   - brute-force BM25 scan: {brute_s * 1000:.0f} ms per query")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build, query or benchmark the hadith search index")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory containing hadith-index.json")
+    parser.add_argument("--query", help="Run one query against the built index")
+    parser.add_argument("--collection", action="append", help="Restrict --query to a collection slug")
+    parser.add_argument("--check", action="store_true", help="Verify rankings against brute-force BM25")
+    parser.add_argument("--benchmark", action="store_true", help="Measure build time and query latency")
+    parser.add_argument("--queries", type=int, default=200, help="Sampled queries for --check/--benchmark")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    search_dir = os.path.join(args.data_dir, os.path.basename(SEARCH_DIR))
+    if args.query:
+        for hadith_id, score in HadithSearch(search_dir).search(args.query, args.collection):
+            print(f"{score:8.3f}  {hadith_id}")
+        return 0
+
+    with open(os.path.join(args.data_dir, 'hadith-index.json'), 'r', encoding='utf-8') as f:
+        hadiths = json.load(f)
+
+    if args.check:
+        problems = check(hadiths, search_dir, args.queries)
+        for query in problems[:20]:
+            print(f"   - ranking differs for {query!r}")
+        if problems:
+            print(f"❌ {len(problems)}/{args.queries} queries rank differently from brute-force BM25")
+            return 1
+        print(f"✅ {args.queries} sampled queries match brute-force BM25")
+        return 0
+
+    if args.benchmark:
+        benchmark(hadiths, args.queries)
+        return 0
+
+    with BuildRun('hadith_search', args.data_dir, profile=args.profile) as run:
+        with run.stage('write'):
+            stats = write_search_index(hadiths, search_dir)
+            run.count('rows_read', len(hadiths))
+            run.count('files_written', stats['files'] + 1)
+            run.count('bytes_written', stats['bytes'])
+            run.count('terms', stats['terms'])
+    print(f"Wrote {stats['terms']} terms in {stats['files']} files "
+          f"({stats['bytes'] / (1024 * 1024):.1f} MB) to {search_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
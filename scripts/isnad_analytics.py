@@ -0,0 +1,101 @@
+"""
+Per-hadith isnad analytics computed at build time.
+
+generate_hadith_index.py stores the result under each hadith's "isnad" key
+and convert_to_sqlite.py loads it into hadith_isnad, so pages can show chain
+length, weakest link and continuity without resolving narrators at runtime.
+"""
+
+from timeline_index import IMPLAUSIBLE, UNKNOWN, pair_status, shared_years
+
+# Reliability terms from "Narrator[Grade:...]" ordered strongest -> weakest.
+# Matching is by lowercase substring, first hit wins, so longer/more specific
+# terms are listed before the terms they contain.
+RELIABILITY_SCALE = [
+    ('companion', 0),
+    ('sahabi', 0),
+    ('thiqah thabt', 1),
+    ('thiqah hafiz', 1),
+    ('hafiz', 1),
+    ('thiqah', 2),
+    ('saduq', 3),
+    ('sadooq', 3),
+    ('la ba', 3),
+    ('maqbul', 4),
+    ('maqbool', 4),
+    ("da'if", 5),
+    ('daif', 5),
+    ('weak', 5),
+    ('majhul', 6),
+    ('majhool', 6),
+    ('unknown', 6),
+    ('matruk', 7),
+    ('matrook', 7),
+    ('kadhdhab', 8),
+    ('liar', 8),
+]
+
+# Companions are graded by status rather than a Narrator[Grade:...] tag
+COMPANION_GRADE_PREFIXES = ('Comp.', 'Rasool Allah')
+
+
+def reliability_rank(narrator):
+    """Rank on RELIABILITY_SCALE (0 = strongest) or None if the grade is unrecognized."""
+    grade = narrator.get('grade') or ''
+    if grade.startswith(COMPANION_GRADE_PREFIXES):
+        return 0
+    reliability = (narrator.get('reliability_grade') or '').lower()
+    if not reliability:
+        return None
+    for term, rank in RELIABILITY_SCALE:
+        if term in reliability:
+            return rank
+    return None
+
+
+def analyze_chain(chain_ids, scholar_map, lifespans):
+    """
+    Summarize one chain.
+
+    chain_ids is ordered as in chain_indx (receiver before transmitter);
+    scholar_map maps id -> search-index entry and lifespans is the
+    timeline_index.LifespanIndex. A link breaks continuity when the two
+    recorded lifespans share too few years for the receiver to have heard
+    from the transmitter (timeline_index.pair_status); links with a missing
+    or estimated lifespan are counted as unverified.
+    """
+    narrators = [scholar_map.get(sid) for sid in chain_ids]
+    unknown = [sid for sid, s in zip(chain_ids, narrators) if s is None]
+
+    weakest_rank, weakest = None, None
+    for sid, scholar in zip(chain_ids, narrators):
+        if scholar is None:
+            continue
+        rank = reliability_rank(scholar)
+        if rank is not None and (weakest_rank is None or rank > weakest_rank):
+            weakest_rank, weakest = rank, sid
+
+    gaps = []
+    unverified_links = 0
+    for receiver_id, transmitter_id in zip(chain_ids, chain_ids[1:]):
+        receiver, transmitter = lifespans.span(receiver_id), lifespans.span(transmitter_id)
+        status = pair_status(receiver, transmitter)
+        if status == UNKNOWN:
+            unverified_links += 1
+        elif status == IMPLAUSIBLE:
+            gaps.append({"receiver": receiver_id, "transmitter": transmitter_id,
+                         "shared_years": shared_years(receiver, transmitter)})
+
+    weakest_scholar = scholar_map.get(weakest) if weakest else None
+    return {
+        "narrator_ids": list(chain_ids),
+        "length": len(chain_ids),
+        "weakest_narrator_id": weakest,
+        "weakest_grade": (weakest_scholar.get('reliability_grade') or weakest_scholar.get('grade')) if weakest_scholar else None,
+        "weakest_rank": weakest_rank,
+        "is_continuous": not gaps,
+        "gaps": gaps,
+        "unverified_links": unverified_links,
+        "has_unknown_narrator": bool(unknown),
+        "unknown_narrator_ids": unknown,
+    }
@@ -1,8 +1,10 @@
 import pandas as pd
 import json
-import re
 import os
 
+from build_metrics import BuildRun
+from text_normalize import normalize_arabic, normalize_batch, normalize_english
+
 # File paths
 CSV_PATH = 'data-processing/data/all_hadiths_clean.csv'
 JSON_DIR = 'data-processing/data/json_source'
@@ -22,38 +24,6 @@ ARABIC_SOURCE_MAP = {
     'Sahih Muslim': 'ara-muslim.min.json'
 }
 
-def remove_tashkeel(text):
-    # Basic Tashkeel removal
-    tashkeel = re.compile(r'[\u0617-\u061A\u064B-\u0652]')
-    return tashkeel.sub('', text)
-
-
-def normalize_text(text):
-    if not isinstance(text, str):
-        return ""
-    # Remove HTML tags if any (basic check)
-    text = re.sub(r'<[^>]+>', '', text)
-    # Remove Arabic symbols like ﷺ, ﷻ, etc. (Unicode range for Arabic Presentation Forms)
-    text = re.sub(r'[\uFB50-\uFDFF\uFE70-\uFEFF]', '', text)
-    # Standardize common variations
-    text = text.replace('Apostle', 'Messenger')
-    text = text.replace('apostle', 'messenger')
-    # Remove all whitespace (including newlines, tabs, multiple spaces)
-    text = re.sub(r'\s+', '', text)
-    # Lowercase and keep only alphanumeric chars (for English)
-    return re.sub(r'[^\w]', '', text.lower())
-
-def normalize_arabic(text):
-    if not isinstance(text, str):
-        return ""
-    text = re.sub(r'<[^>]+>', '', text)
-    text = remove_tashkeel(text)
-    # Remove all whitespace
-    text = re.sub(r'\s+', '', text)
-    # Keep only word characters (includes Arabic)
-    text = re.sub(r'[^\w]', '', text)
-    return text
-
 def load_json_map(json_filename):
     path = os.path.join(JSON_DIR, json_filename)
     if not os.path.exists(path):
@@ -72,24 +42,30 @@ def load_json_map(json_filename):
     text_map = {}
     is_arabic = 'ara-' in json_filename
     
+    bodies, refs = [], []
     for h in hadiths:
         # Use 'text' key for text (English or Arabic depending on file)
         body = h.get('body') or h.get('text', '')
         ref = h.get('hadithnumber')
         
         if body and ref:
-            if is_arabic:
-                 norm = normalize_arabic(body)
-            else:
-                 norm = normalize_text(body)
-            
-            if norm:
-                text_map[norm] = ref
+            bodies.append(body)
+            refs.append(ref)
+
+    for norm, ref in zip(normalize_batch(bodies, normalize_arabic if is_arabic else normalize_english), refs):
+        if norm:
+            text_map[norm] = ref
     return text_map
 
 def main():
+    with BuildRun('map_usc_msa_refs', os.path.dirname(CSV_PATH)) as run:
+        update_refs(run)
+
+def update_refs(run):
     print("Loading CSV...")
-    df = pd.read_csv(CSV_PATH)
+    with run.stage('read_csv'):
+        df = pd.read_csv(CSV_PATH)
+        run.count('rows_read', len(df))
     
     # Strip whitespace from source names
     df['source'] = df['source'].str.strip()
@@ -122,7 +98,9 @@ def main():
         print(f"Processing {source_name} using {json_file}...")
         
         # Load map
-        ref_map = load_json_map(json_file)
+        with run.stage(f'load_map:{source_name}'):
+            ref_map = load_json_map(json_file)
+            run.count('reference_texts', len(ref_map))
         if not ref_map:
             continue
             
@@ -134,6 +112,12 @@ def main():
         # We need to update specifically where mask is True
         
         updated_count = 0
+
+        # Matching keys for every row of this source in one batch
+        if use_arabic:
+            row_keys = normalize_batch(df.loc[mask, 'text_ar'], normalize_arabic)
+        else:
+            row_keys = normalize_batch(df.loc[mask, 'text_en'], normalize_english)
         
         # Iterate over indices of the filtered rows
         for idx in df[mask].index:
@@ -160,17 +144,14 @@ def main():
                         should_update = True
 
             if should_update:
-                if use_arabic:
-                     text_val = df.at[idx, 'text_ar']
-                     norm_text = normalize_arabic(text_val)
-                else:
-                     text_val = df.at[idx, 'text_en']
-                     norm_text = normalize_text(text_val)
+                norm_text = row_keys[idx]
                 
+                run.count('rows_compared')
                 if norm_text in ref_map:
                     df.at[idx, 'usc_msa_ref'] = ref_map[norm_text]
                     updated_count += 1
         
+        run.count('rows_matched', updated_count)
         print(f"  Updated {updated_count} rows for {source_name}")
         total_updated += updated_count
 
@@ -179,7 +160,10 @@ def main():
     # Save
     out_path = CSV_PATH # Overwrite
     print(f"Saving to {out_path}...")
-    df.to_csv(out_path, index=False)
+    with run.stage('write_csv'):
+        df.to_csv(out_path, index=False)
+        run.count('files_written')
+        run.count('bytes_written', os.path.getsize(out_path))
     print("Done.")
 
 if __name__ == "__main__":
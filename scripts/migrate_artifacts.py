@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Apply structural migrations to the generated JSON artifacts in public/data.
+
+Migrations are keyed transformations over parsed JSON (not raw string
+replacement), so text that merely contains a key-like substring is never
+touched. Files are processed in parallel, unchanged files are skipped via a
+manifest of content hashes, and every rewrite is atomic.
+
+Usage:
+    python scripts/migrate_artifacts.py                      # all migrations, all artifacts
+    python scripts/migrate_artifacts.py --migration ckb-locale --pattern search-index.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from artifact_io import atomic_write_bytes, dump_json_bytes, load_json, sha256_bytes
+from build_metrics import BuildRun, add_profile_argument
+
+DATA_DIR = 'public/data'
+MANIFEST_NAME = '.migrations-manifest.json'
+DEFAULT_PATTERNS = ['scholars/*.json', 'search-index.json', 'hadith-index.json']
+
+
+def rename_keys(obj, mapping):
+    """
+    Recursively rename dict keys, preserving key order. Values are never rewritten.
+
+    A dict holding both a key and its new name is left for a person to sort
+    out: ValueError, which leaves the file untouched and lists it in the errors.
+    """
+    if isinstance(obj, dict):
+        for old, new in mapping.items():
+            if old in obj and new in obj and obj[old] != obj[new]:
+                raise ValueError(f"both '{old}' and '{new}' present with different values")
+        renamed = {}
+        for k, v in obj.items():
+            if k in mapping and mapping[k] in obj:
+                continue  # same value under both keys: keep the new one
+            renamed[mapping.get(k, k)] = rename_keys(v, mapping)
+        return renamed
+    if isinstance(obj, list):
+        return [rename_keys(v, mapping) for v in obj]
+    return obj
+
+
+def migrate_ckb_locale(obj):
+    """Rename the legacy 'ku' locale key to 'ckb' in localized display objects."""
+    return rename_keys(obj, {'ku': 'ckb'})
+
+
+# Ordered registry: name -> transform(obj) -> obj
+MIGRATIONS = {
+    'ckb-locale': migrate_ckb_locale,
+}
+
+
+def migrate_file(path, names):
+    """
+    Apply the named migrations to one file.
+
+    Returns (path, status, sha256) where status is 'updated' or 'unchanged' and
+    sha256 is the digest of the file contents after the run.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    data = json.loads(raw)
+    migrated = data
+    for name in names:
+        migrated = MIGRATIONS[name](migrated)
+
+    if migrated == data:
+        return path, 'unchanged', sha256_bytes(raw)
+
+    payload = dump_json_bytes(migrated)
+    atomic_write_bytes(path, payload)
+    return path, 'updated', sha256_bytes(payload)
+
+
+def _migrate_file_task(args):
+    path, names = args
+    try:
+        return migrate_file(path, names)
+    except Exception as e:
+        return path, f'error: {e}', None
+
+
+def collect_files(data_dir, patterns):
+    files = []
+    for pattern in patterns:
+        files.extend(sorted(glob.glob(os.path.join(data_dir, pattern))))
+    return files
+
+
+def run_migrations(data_dir=DATA_DIR, names=None, patterns=None, workers=None, force=False):
+    """Migrate every matching artifact and return a stats dict."""
+    names = list(names or MIGRATIONS.keys())
+    unknown = [n for n in names if n not in MIGRATIONS]
+    if unknown:
+        raise ValueError(f"Unknown migration(s): {', '.join(unknown)}")
+
+    manifest_path = os.path.join(data_dir, MANIFEST_NAME)
+    manifest = load_json(manifest_path, default={})
+    files = collect_files(data_dir, patterns or DEFAULT_PATTERNS)
+
+    stats = {"files": len(files), "skipped": 0, "updated": 0, "unchanged": 0, "errors": []}
+    pending = []
+
+    # Skip files whose current bytes were already produced (or verified) by
+    # a run that applied every requested migration.
+    for path in files:
+        rel = os.path.relpath(path, data_dir)
+        entry = manifest.get(rel)
+        if not force and entry and set(names) <= set(entry.get('applied', [])):
+            with open(path, 'rb') as f:
+                if sha256_bytes(f.read()) == entry.get('sha256'):
+                    stats["skipped"] += 1
+                    continue
+        pending.append(path)
+
+    print(f"Migrating {len(pending)}/{len(files)} files with: {', '.join(names)}")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = ((path, names) for path in pending)
+        for idx, (path, status, digest) in enumerate(pool.map(_migrate_file_task, tasks, chunksize=64), 1):
+            rel = os.path.relpath(path, data_dir)
+            if digest is None:
+                stats["errors"].append(f"{rel}: {status}")
+                continue
+            stats[status] += 1
+            applied = set(manifest.get(rel, {}).get('applied', [])) | set(names)
+            manifest[rel] = {"sha256": digest, "applied": sorted(applied)}
+            if idx % 1000 == 0:
+                print(f"Processed {idx}/{len(pending)}...")
+
+    atomic_write_bytes(manifest_path, dump_json_bytes(manifest))
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply structural migrations to generated JSON artifacts")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Path to data directory")
+    parser.add_argument(
+        "--migration", action="append", choices=sorted(MIGRATIONS),
+        help="Migration to apply (repeatable, default: all)"
+    )
+    parser.add_argument(
+        "--pattern", action="append",
+        help="Glob relative to --data-dir (repeatable, default: scholars, search and hadith indexes)"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest and re-check every file")
+    add_profile_argument(parser)
+
+    args = parser.parse_args(argv)
+
+    with BuildRun('migrate_artifacts', args.data_dir, profile=args.profile) as run:
+        with run.stage('migrate'):
+            stats = run_migrations(args.data_dir, args.migration, args.pattern, args.workers, args.force)
+        for key in ('updated', 'unchanged', 'skipped'):
+            run.count(f'files_{key}', stats[key])
+        run.count('errors', len(stats['errors']))
+
+    print(f"Updated {stats['updated']} files "
+          f"({stats['unchanged']} unchanged, {stats['skipped']} skipped via manifest).")
+    if stats["errors"]:
+        print(f"Errors encountered: {len(stats['errors'])}")
+        for error in stats["errors"][:10]:
+            print(f"  - {error}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Typo-tolerant narrator name lookup (SymSpell deletion dictionary).
+
+Narrator names reach users in many transliterations (Abu Hurayra / Abu
+Huraira / Abu Hurairah), and scholars_fts only matches exact tokens. This
+index finds every name token within a small edit distance of a query token
+without scanning the vocabulary: each indexed token is stored under every
+string obtained by deleting up to MAX_DISTANCE of its characters, so a query
+only looks up its own deletions and verifies the few tokens they share.
+
+extract_enhanced_data.py writes public/data/name-index/ next to
+search-index.json:
+
+- manifest.json: settings (max distance, token rules), counts, shard count
+  and the shards present
+- tokens.json: the sorted name-token vocabulary; token ids are positions
+- deletes/{shard}.json: {deletion: [token id, delta, ...]} for deletions
+  whose first character's FNV-1a hash falls in that shard. Every deletion of
+  a query starts with one of its first MAX_DISTANCE + 1 characters, so a
+  lookup reads at most three shards
+- postings/{shard}.json: {token: [scholar id, delta, ...]} sharded by the
+  token's hash, as in hadith-search
+
+Tokens are letter runs of the full display name (English transliteration and
+Arabic) after text_normalize.normalize_search; digits are dropped, as are
+tokens shared by more than MAX_NAME_SHARE of all names (bin, al, rahimahu
+allah), which say nothing about who is meant. Distance is optimal string
+alignment (Levenshtein plus adjacent transposition); the distance allowed
+grows with the query token's length, so short tokens are not matched by
+everything.
+
+Usage:
+    python scripts/name_index.py                      # rebuild from search-index.json
+    python scripts/name_index.py --query "abu huraira" # search with the reference reader
+    python scripts/name_index.py --check              # lookups vs. a full vocabulary scan
+    python scripts/name_index.py --benchmark          # per-lookup latency, distance <= 2
+    python scripts/name_index.py --benchmark --variants 0.5
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from itertools import accumulate
+
+from artifact_io import atomic_write_bytes, atomic_write_json
+from build_metrics import BuildRun, add_profile_argument
+from hadith_search import term_shard
+from text_normalize import normalize_search
+
+DATA_DIR = 'public/data'
+NAME_INDEX_DIR = os.path.join(DATA_DIR, 'name-index')
+
+MAX_DISTANCE = 2
+MIN_TOKEN_LENGTH = 2
+MAX_NAME_SHARE = 0.2
+SHARD_COUNT = 32
+
+# Letter runs only (no digits or underscores)
+_TOKEN = re.compile(r'[^\W\d_]+')
+
+
+def name_tokens(name):
+    """Distinct normalized letter tokens of a display name."""
+    return {token for token in _TOKEN.findall(normalize_search(name)) if len(token) >= MIN_TOKEN_LENGTH}
+
+
+def allowed_distance(token, max_distance=MAX_DISTANCE):
+    """Edits a query token may absorb: none for 2 letters, 1 for 3-4, then max_distance."""
+    return min(max_distance, (len(token) - 1) // 2)
+
+
+def deletions(token, max_distance=MAX_DISTANCE, min_length=MIN_TOKEN_LENGTH):
+    """The token and every string reachable by deleting up to max_distance characters (not below min_length)."""
+    found = {token}
+    frontier = [token]
+    for _ in range(max_distance):
+        following = []
+        for text in frontier:
+            if len(text) <= min_length:
+                continue
+            for i in range(len(text)):
+                shorter = text[:i] + text[i + 1:]
+                if shorter not in found:
+                    found.add(shorter)
+                    following.append(shorter)
+        frontier = following
+    return found
+
+
+def osa_distance(a, b, max_distance):
+    """Optimal string alignment distance, or max_distance + 1 once it is certainly exceeded."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if a == b:
+        return 0
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def _pattern_masks(term):
+    masks = defaultdict(int)
+    for i, char in enumerate(term):
+        masks[char] |= 1 << i
+    return masks
+
+
+def osa_bits(masks, length, token):
+    """
+    Optimal string alignment distance between the term behind _pattern_masks()
+    and token, one bit per term character (Hyyroe's bit-vector algorithm with
+    transpositions): a few integer operations per token character instead of
+    a row of the dynamic-programming table.
+    """
+    if not length:
+        return len(token)
+    full = (1 << length) - 1
+    top = 1 << (length - 1)
+    vp, vn, d0, previous_match = full, 0, 0, 0
+    distance = length
+    for char in token:
+        match = masks.get(char, 0)
+        transposed = (((~d0) & match) << 1) & previous_match
+        d0 = ((((match & vp) + vp) ^ vp) | match | vn | transposed) & full
+        hp = (vn | ~(d0 | vp)) & full
+        hn = d0 & vp
+        if hp & top:
+            distance += 1
+        elif hn & top:
+            distance -= 1
+        hp = (hp << 1) | 1
+        vp = ((hn << 1) | ~(d0 | hp)) & full
+        vn = hp & d0
+        previous_match = match
+    return distance
+
+
+def _delta(ids):
+    return [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def build_name_index(search_index, max_distance=MAX_DISTANCE):
+    """(tokens, postings {token: [scholar ids]}, deletes {deletion: [token ids]}, dropped tokens)."""
+    postings = defaultdict(list)
+    for entry in search_index:
+        for token in name_tokens(entry.get('name', '')):
+            postings[token].append(int(entry['id']))
+    limit = max(1, MAX_NAME_SHARE * len(search_index))
+    dropped = sorted(token for token, ids in postings.items() if len(ids) > limit)
+    for token in dropped:
+        del postings[token]
+
+    tokens = sorted(postings)
+    deletes = defaultdict(list)
+    for token_id, token in enumerate(tokens):
+        # Ids are visited in order, so every list stays sorted
+        for deletion in deletions(token, max_distance):
+            deletes[deletion].append(token_id)
+    return tokens, {token: sorted(ids) for token, ids in postings.items()}, deletes, dropped
+
+
+def write_name_index(search_index, output_dir=NAME_INDEX_DIR, shard_count=SHARD_COUNT):
+    """Write manifest, vocabulary and sharded deletion/posting maps; returns size stats."""
+    tokens, postings, deletes, dropped = build_name_index(search_index)
+    written = set()
+    stats = {"names": len(search_index), "tokens": len(tokens), "deletes": len(deletes),
+             "dropped": len(dropped), "files": 0, "bytes": 0}
+
+    def write(rel_path, payload):
+        atomic_write_bytes(os.path.join(output_dir, rel_path), payload)
+        written.add(rel_path)
+        stats["files"] += 1
+        stats["bytes"] += len(payload)
+
+    write('tokens.json', _dumps(tokens))
+    delete_shards = defaultdict(dict)
+    for deletion, token_ids in sorted(deletes.items()):
+        delete_shards[term_shard(deletion[0], shard_count)][deletion] = _delta(token_ids)
+    for shard, entries in delete_shards.items():
+        write(os.path.join('deletes', f"{shard}.json"), _dumps(entries))
+    posting_shards = defaultdict(dict)
+    for token in tokens:
+        posting_shards[term_shard(token, shard_count)][token] = _delta(postings[token])
+    for shard, entries in posting_shards.items():
+        write(os.path.join('postings', f"{shard}.json"), _dumps(entries))
+
+    manifest = {
+        "version": 1,
+        "max_distance": MAX_DISTANCE,
+        "min_token_length": MIN_TOKEN_LENGTH,
+        "dropped_tokens": dropped,
+        "names": len(search_index),
+        "tokens": len(tokens),
+        "shard_count": shard_count,
+        "delete_shards": sorted(delete_shards),
+        "posting_shards": sorted(posting_shards),
+    }
+    atomic_write_json(os.path.join(output_dir, 'manifest.json'), manifest)
+    written.add('manifest.json')
+
+    # Shards that no longer exist would otherwise linger
+    for root, _dirs, files in os.walk(output_dir):
+        for name in files:
+            rel_path = os.path.relpath(os.path.join(root, name), output_dir)
+            if rel_path not in written:
+                os.remove(os.path.join(root, name))
+    return stats
+
+
+class NameIndex:
+    """Reference reader for the written index; shards load on demand."""
+
+    def __init__(self, index_dir=NAME_INDEX_DIR):
+        self.index_dir = index_dir
+        self.manifest = self._load('manifest.json')
+        self.tokens = self._load('tokens.json')
+        self.max_distance = self.manifest['max_distance']
+        self.shard_count = self.manifest['shard_count']
+        self.present = {'deletes': set(self.manifest['delete_shards']),
+                        'postings': set(self.manifest['posting_shards'])}
+        self.shards = {}
+
+    def _load(self, *parts):
+        with open(os.path.join(self.index_dir, *parts), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _shard(self, kind, key):
+        shard = term_shard(key, self.shard_count)
+        if shard not in self.present[kind]:
+            return {}
+        if (kind, shard) not in self.shards:
+            self.shards[(kind, shard)] = self._load(kind, f"{shard}.json")
+        return self.shards[(kind, shard)]
+
+    def lookup(self, term, max_distance=None):
+        """[(token, distance), ...] for indexed tokens within the allowed distance, closest first."""
+        term = normalize_search(term)
+        distance = allowed_distance(term, self.max_distance if max_distance is None else max_distance)
+        if len(term) < MIN_TOKEN_LENGTH or distance < 0:
+            return []
+        masks = _pattern_masks(term)
+        seen = set()
+        matches = []
+        for deletion in deletions(term, distance):
+            packed = self._shard('deletes', deletion[0]).get(deletion)
+            if not packed:
+                continue
+            for token_id in accumulate(packed):
+                if token_id in seen:
+                    continue
+                seen.add(token_id)
+                token = self.tokens[token_id]
+                if deletion == term or deletion == token:
+                    # One is the other with characters deleted: the length difference is the distance
+                    found = abs(len(token) - len(term))
+                else:
+                    found = osa_bits(masks, len(term), token)
+                if found <= distance:
+                    matches.append((token, found))
+        return sorted(matches, key=lambda match: (match[1], match[0]))
+
+    def postings(self, token):
+        """Scholar ids whose name contains token."""
+        return list(accumulate(self._shard('postings', token).get(token, [])))
+
+    def search(self, query, limit=10):
+        """
+        [(scholar id, matched query tokens, total distance), ...]: names
+        matching the most query tokens first, then the closest spellings.
+        """
+        best = defaultdict(dict)
+        terms = sorted(name_tokens(query))
+        for position, term in enumerate(terms):
+            for token, distance in self.lookup(term):
+                for scholar_id in self.postings(token):
+                    if distance < best[scholar_id].get(position, self.max_distance + 1):
+                        best[scholar_id][position] = distance
+        ranked = sorted(best.items(), key=lambda item: (-len(item[1]), sum(item[1].values()), item[0]))
+        return [(str(scholar_id), len(found), sum(found.values())) for scholar_id, found in ranked[:limit]]
+
+
+def brute_force_lookup(tokens, term, max_distance=MAX_DISTANCE):
+    """lookup() by scanning the whole vocabulary."""
+    term = normalize_search(term)
+    distance = allowed_distance(term, max_distance)
+    if len(term) < MIN_TOKEN_LENGTH or distance < 0:
+        return []
+    matches = [(token, osa_distance(term, token, distance)) for token in tokens]
+    return sorted(((token, found) for token, found in matches if found <= distance),
+                  key=lambda match: (match[1], match[0]))
+
+
+def misspell(token, edits, rng):
+    """token with `edits` random substitutions, insertions, deletions or transpositions."""
+    alphabet = sorted(set(token))
+    for _ in range(edits):
+        kind = rng.choice(['substitute', 'insert', 'delete', 'transpose'] if len(token) > 2 else ['insert'])
+        i = rng.randrange(len(token))
+        if kind == 'substitute':
+            token = token[:i] + rng.choice(alphabet) + token[i + 1:]
+        elif kind == 'insert':
+            token = token[:i] + rng.choice(alphabet) + token[i:]
+        elif kind == 'delete':
+            token = token[:i] + token[i + 1:]
+        elif i + 1 < len(token):
+            token = token[:i] + token[i + 1] + token[i] + token[i + 2:]
+    return token
+
+
+def sample_queries(tokens, count, seed=0):
+    """Vocabulary tokens with 0-2 random edits each."""
+    rng = random.Random(seed)
+    return [misspell(token, rng.randint(0, MAX_DISTANCE), rng) for token in rng.choices(tokens, k=count)]
+
+
+def transliteration_variants(search_index, share, seed=0):
+    """
+    A copy of the search index with `share` of the Latin name tokens respelled
+    the way transliterations vary (vowel and ending changes, doubled letters):
+    the synthetic corpora draw every name from a few dozen words.
+    """
+    rng = random.Random(seed)
+    swaps = [('a', 'aa'), ('i', 'ee'), ('u', 'oo'), ('ah', 'a'), ('y', 'i'), ('q', 'k'), ('th', 't'), ('dh', 'z')]
+
+    def respell(match):
+        word = match.group(0)
+        if rng.random() >= share:
+            return word
+        for _ in range(rng.randint(1, 3)):
+            old, new = rng.choice(swaps)
+            if old in word:
+                at = rng.choice([i for i in range(len(word)) if word.startswith(old, i)])
+                word = word[:at] + new + word[at + len(old):]
+            else:
+                at = rng.randrange(1, len(word))
+                word = word[:at] + word[at - 1] + word[at:]
+        return word
+
+    return [{**entry, "name": re.sub(r'[A-Za-z]{3,}', respell, entry.get('name', ''))} for entry in search_index]
+
+
+def check(index, queries):
+    """Queries whose lookup differs from a full vocabulary scan."""
+    return [query for query in queries
+            if index.lookup(query) != brute_force_lookup(index.tokens, query, index.max_distance)]
+
+
+def benchmark(search_index, queries=2000):
+    """Build size, then lookup latency (warm shards) against a full vocabulary scan."""
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        stats = write_name_index(search_index, tmp)
+        build_s = time.perf_counter() - start
+        index = NameIndex(tmp)
+        sample = sample_queries(index.tokens, queries)
+        for query in sample:
+            index.lookup(query)
+
+        timings, candidates = [], 0
+        for query in sample:
+            start = time.perf_counter()
+            candidates += len(index.lookup(query))
+            timings.append(time.perf_counter() - start)
+        scan = []
+        for query in sample[:200]:
+            start = time.perf_counter()
+            brute_force_lookup(index.tokens, query)
+            scan.append(time.perf_counter() - start)
+
+    timings.sort()
+    scan.sort()
+    print(f"Name index over {stats['names']} names: {stats['tokens']} tokens, {stats['deletes']} deletions, "
+          f"{stats['files']} files ({stats['bytes'] / 1024:.0f} KB), built in {build_s:.2f}s")
+    print(f"   - Lookup (distance <= {MAX_DISTANCE}): p50 {timings[len(timings) // 2] * 1000:.3f} ms, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1000:.3f} ms, "
+          f"{candidates / len(sample):.1f} matching tokens per query")
+    print(f"   - Vocabulary scan:            p50 {scan[len(scan) // 2] * 1000:.3f} ms, "
+          f"p99 {scan[int(len(scan) * 0.99)] * 1000:.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the typo-tolerant narrator name index")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory containing search-index.json")
+    parser.add_argument("--query", help="Search names with the reference reader")
+    parser.add_argument("--check", action="store_true", help="Compare lookups with a full vocabulary scan")
+    parser.add_argument("--benchmark", action="store_true", help="Time lookups on an index built in a temp dir")
+    parser.add_argument("--variants", type=float, default=0,
+                        help="Share of Latin name tokens to respell before --check/--benchmark")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(args.data_dir, 'search-index.json'), 'r', encoding='utf-8') as f:
+        search_index = json.load(f)
+    index_dir = os.path.join(args.data_dir, os.path.basename(NAME_INDEX_DIR))
+
+    if args.query:
+        names = {entry['id']: entry['name'] for entry in search_index}
+        for scholar_id, matched, distance in NameIndex(index_dir).search(args.query):
+            print(f"{scholar_id:>6}  {matched} tokens, distance {distance}  {names.get(scholar_id, '')}")
+        return 0
+
+    if args.benchmark:
+        benchmark(transliteration_variants(search_index, args.variants) if args.variants else search_index)
+        return 0
+
+    if args.check:
+        with tempfile.TemporaryDirectory() as tmp:
+            if args.variants:
+                write_name_index(transliteration_variants(search_index, args.variants), tmp)
+                index = NameIndex(tmp)
+            else:
+                index = NameIndex(index_dir)
+            queries = sample_queries(index.tokens, 1000)
+            problems = check(index, queries)
+        for query in problems[:20]:
+            print(f"   - {query!r}: lookup differs from the vocabulary scan")
+        if problems:
+            print(f"❌ {len(problems)} of {len(queries)} lookups differ from the vocabulary scan")
+            return 1
+        print(f"✅ {len(queries)} misspelled lookups match the vocabulary scan ({len(index.tokens)} tokens)")
+        return 0
+
+    with BuildRun('name_index', args.data_dir, profile=args.profile) as run:
+        with run.stage('write'):
+            stats = write_name_index(search_index, index_dir)
+            run.count('rows_read', len(search_index))
+            run.count('files_written', stats['files'])
+            run.count('bytes_written', stats['bytes'])
+    print(f"Wrote {stats['tokens']} name tokens, {stats['deletes']} deletions in {stats['files']} files "
+          f"({stats['bytes'] / 1024:.0f} KB) to {index_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
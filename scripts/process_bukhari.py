@@ -2,6 +2,8 @@ import pandas as pd
 import os
 import re
 
+from text_normalize import collapse_whitespace
+
 def sanitize_filename(name):
     """
     Sanitize the string to be safe for filenames.
@@ -11,25 +13,11 @@ def sanitize_filename(name):
     safe_name = re.sub(r'[^\w\s\.\-]', '', name)
     return safe_name.strip()
 
-def clean_text(text):
-    """
-    Clean text by removing newlines, extra spaces, and other artifacts.
-    """
-    if not isinstance(text, str):
-        return ""
-    # Replace newlines and tabs with space
-    text = text.replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
-    # Collapse multiple spaces into one
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
-
-    return text.strip()
-
 def clean_narrator(text):
     """
     Remove 'Narrated by' prefixes and clean.
     """
-    text = clean_text(text)
+    text = collapse_whitespace(text)
     # Remove "Narrated by" or "Narrated" (case insensitive)
     text = re.sub(r'^narrated\s+by\s+', '', text, flags=re.IGNORECASE)
     text = re.sub(r'^narrated\s+', '', text, flags=re.IGNORECASE)
@@ -75,9 +63,9 @@ def process_sahih_bukhari():
                     'volume': volume_name,
                     'book': book_name,
                     'category': category,
-                    'info': clean_text(hadith.get('info', '')),
+                    'info': collapse_whitespace(hadith.get('info', '')),
                     'narrated_by': clean_narrator(hadith.get('by', '')),
-                    'text': clean_text(hadith.get('text', ''))
+                    'text': collapse_whitespace(hadith.get('text', ''))
                 }
                 all_data.append(entry)
                 global_id += 1
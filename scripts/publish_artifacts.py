@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Publish generated artifacts under content-hash names.
+
+Everything the app fetches from public/data (and public/scholars.db) has a
+fixed name, so none of it can be cached for long: any rebuild may change
+any file behind the same URL. This step copies each artifact to an
+immutable, content-addressed path
+
+    public/data/search-index.json  ->  public/immutable/data/search-index.3f2a9c1d4e5b6a70.json
+
+and writes public/data-manifest.json mapping logical names (paths relative
+to public/) to those URLs. Unchanged files keep their hash, and therefore
+their URL, from build to build; next.config.ts serves /immutable/ with a
+year-long `immutable` Cache-Control and the manifest with revalidation.
+
+Directories with one file per entity (scholars, hadiths, search postings)
+would make the manifest as large as the data, so they are published as
+families: their {name: url} maps are split into FNV-1a shards of about
+FAMILY_SHARD_SIZE entries, each itself content-addressed, and the manifest
+only lists the shard URLs. lib/artifacts.ts resolves names the same way.
+
+Published files referenced by the current or the previous manifest are kept,
+so clients still holding the previous manifest keep working; anything older
+is removed. --hardlink links instead of copying, which only stays immutable
+while every writer replaces files (artifact_io) rather than rewriting them in
+place the way update-translations*.js does.
+
+Usage:
+    python scripts/publish_artifacts.py
+    python scripts/publish_artifacts.py --hardlink # no second copy of the data on disk
+    python scripts/publish_artifacts.py --check    # every manifest entry exists and matches its source
+"""
+
+import argparse
+import fnmatch
+import math
+import os
+import shutil
+import sys
+import tempfile
+from urllib.parse import quote, unquote
+
+from artifact_io import atomic_write_bytes, atomic_write_json, dump_json_bytes, load_json, sha256_bytes, sha256_file
+from build_metrics import BuildRun, add_profile_argument
+from hadith_search import term_shard
+
+PUBLIC_DIR = 'public'
+SOURCES = ['data', 'scholars.db']
+PUBLISH_DIR = 'immutable'
+MANIFEST_NAME = 'data-manifest.json'
+HASH_LENGTH = 16
+
+# One file per entity; published as sharded name -> url maps
+FAMILIES = ['data/scholars', 'data/scholars-core', 'data/hadiths', 'data/hadith-search',
+            'data/locales/*/scholars']
+FAMILY_SHARD_SIZE = 1024
+
+
+def url_for(rel_path):
+    return '/' + quote(rel_path.replace(os.sep, '/'))
+
+
+def unquote_url(url):
+    return unquote(url.lstrip('/')).replace('/', os.sep)
+
+
+def family_of(name):
+    """(family, key within it) for a logical name, or (None, name)."""
+    parts = name.split('/')
+    for pattern in FAMILIES:
+        depth = pattern.count('/') + 1
+        if len(parts) > depth and fnmatch.fnmatchcase('/'.join(parts[:depth]), pattern):
+            return '/'.join(parts[:depth]), '/'.join(parts[depth:])
+    return None, name
+
+
+def iter_sources(public_dir=PUBLIC_DIR, sources=SOURCES):
+    """Logical names (relative to public/) of every artifact to publish, sorted."""
+    names = []
+    for source in sources:
+        full = os.path.join(public_dir, source)
+        if os.path.isfile(full):
+            names.append(source)
+            continue
+        for dirpath, dirnames, filenames in os.walk(full):
+            # Build reports, migration manifests and temp files are not served
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+            for filename in filenames:
+                if not filename.startswith('.'):
+                    names.append(os.path.relpath(os.path.join(dirpath, filename), public_dir).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def hashed_name(name, digest):
+    """data/search-index.json -> immutable/data/search-index.<hash>.json"""
+    directory, filename = os.path.split(name)
+    stem, ext = os.path.splitext(filename)
+    return os.path.join(PUBLISH_DIR, directory, f"{stem}.{digest[:HASH_LENGTH]}{ext}")
+
+
+def place_file(src, dst, hardlink=False):
+    """Atomically copy (or hard-link, falling back to a copy across devices) src to dst."""
+    directory = os.path.dirname(dst)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    os.close(fd)
+    os.remove(tmp_path)
+    try:
+        linked = False
+        if hardlink:
+            try:
+                os.link(src, tmp_path)
+                linked = True
+            except OSError:
+                pass
+        if not linked:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def publish_bytes(payload, name, public_dir=PUBLIC_DIR):
+    """Content-address an in-memory artifact (family shard maps); returns its URL."""
+    rel = hashed_name(name, sha256_bytes(payload))
+    path = os.path.join(public_dir, rel)
+    if not os.path.exists(path):
+        atomic_write_bytes(path, payload)
+    return url_for(rel)
+
+
+def referenced_files(manifest, public_dir=PUBLIC_DIR):
+    """Paths (relative to public/) of every published file a manifest points at."""
+    if not manifest:
+        return set()
+    urls = list(manifest.get('artifacts', {}).values())
+    for family in manifest.get('families', {}).values():
+        for shard_url in family['shards']:
+            urls.append(shard_url)
+            shard = load_json(os.path.join(public_dir, unquote_url(shard_url)), default={})
+            urls.extend(shard.values())
+    return {unquote_url(url) for url in urls}
+
+
+def resolve_manifest(manifest, public_dir=PUBLIC_DIR):
+    """{logical name: hashed URL} for every artifact a manifest lists, families included."""
+    resolved = dict(manifest['artifacts'])
+    for family, entry in manifest['families'].items():
+        for shard_url in entry['shards']:
+            shard = load_json(os.path.join(public_dir, unquote_url(shard_url)), default={})
+            for key, url in shard.items():
+                resolved[f"{family}/{key}"] = url
+    return resolved
+
+
+def publish(public_dir=PUBLIC_DIR, sources=SOURCES, shard_size=FAMILY_SHARD_SIZE, hardlink=False):
+    """Publish every artifact, write the manifest and prune old files; returns stats."""
+    manifest_path = os.path.join(public_dir, MANIFEST_NAME)
+    previous = load_json(manifest_path, default=None)
+    previous_files = referenced_files(previous, public_dir)
+
+    stats = {"files": 0, "bytes": 0, "published": 0, "published_bytes": 0, "removed": 0}
+    artifacts = {}
+    families = {}
+    for name in iter_sources(public_dir, sources):
+        src = os.path.join(public_dir, name)
+        rel = hashed_name(name, sha256_file(src))
+        dst = os.path.join(public_dir, rel)
+        size = os.path.getsize(src)
+        stats["files"] += 1
+        stats["bytes"] += size
+        if not os.path.exists(dst):
+            place_file(src, dst, hardlink)
+            stats["published"] += 1
+            stats["published_bytes"] += size
+        family, key = family_of(name)
+        if family is None:
+            artifacts[name] = url_for(rel)
+        else:
+            families.setdefault(family, {})[key] = url_for(rel)
+
+    manifest = {"version": 1, "artifacts": artifacts, "families": {}}
+    for family, entries in sorted(families.items()):
+        shard_count = max(1, math.ceil(len(entries) / shard_size))
+        shards = [{} for _ in range(shard_count)]
+        for key, url in sorted(entries.items()):
+            shards[term_shard(key, shard_count)][key] = url
+        manifest["families"][family] = {
+            "shard_count": shard_count,
+            "shards": [publish_bytes(dump_json_bytes(shard, indent=None), f"{family}/.manifest-{n}.json", public_dir)
+                       for n, shard in enumerate(shards)],
+        }
+    atomic_write_json(manifest_path, manifest)
+
+    # Keep what the current and previous manifests reference; clients that
+    # loaded the previous manifest may still be fetching from it
+    keep = referenced_files(manifest, public_dir) | previous_files
+    publish_root = os.path.join(public_dir, PUBLISH_DIR)
+    for dirpath, _, filenames in os.walk(publish_root, topdown=False):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if os.path.relpath(path, public_dir) not in keep:
+                os.remove(path)
+                stats["removed"] += 1
+        if dirpath != publish_root and not os.listdir(dirpath):
+            os.rmdir(dirpath)
+    stats["artifacts"] = len(artifacts)
+    stats["families"] = len(families)
+    stats["manifest_bytes"] = os.path.getsize(manifest_path)
+    return stats
+
+
+def check(public_dir=PUBLIC_DIR, sources=SOURCES, limit=20):
+    """List of problems with the published manifest (empty when it matches the sources)."""
+    manifest = load_json(os.path.join(public_dir, MANIFEST_NAME), default=None)
+    if manifest is None:
+        return [f"{MANIFEST_NAME} does not exist"]
+
+    resolved = dict(manifest['artifacts'])
+    for family, entry in manifest['families'].items():
+        for n, shard_url in enumerate(entry['shards']):
+            shard = load_json(os.path.join(public_dir, unquote_url(shard_url)), default=None)
+            if shard is None:
+                return [f"{family}: shard {n} ({shard_url}) is missing"]
+            for key, url in shard.items():
+                if term_shard(key, entry['shard_count']) != n:
+                    return [f"{family}/{key}: listed in shard {n}"]
+                resolved[f"{family}/{key}"] = url
+
+    problems = []
+    names = iter_sources(public_dir, sources)
+    for name in names:
+        url = resolved.get(name)
+        if url is None:
+            problems.append(f"{name}: not in the manifest")
+        elif url != url_for(hashed_name(name, sha256_file(os.path.join(public_dir, name)))):
+            problems.append(f"{name}: published hash is stale")
+        elif not os.path.exists(os.path.join(public_dir, unquote_url(url))):
+            problems.append(f"{name}: {url} is missing")
+        if len(problems) >= limit:
+            return problems
+    for name in sorted(set(resolved) - set(names))[:limit]:
+        problems.append(f"{name}: in the manifest but no longer built")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish artifacts under content-hash names")
+    parser.add_argument("--public-dir", default=PUBLIC_DIR, help="Web root containing data/ and scholars.db")
+    parser.add_argument("--hardlink", action="store_true", help="Hard-link published files instead of copying")
+    parser.add_argument("--check", action="store_true", help="Verify the manifest against the current artifacts")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = check(args.public_dir)
+        for problem in problems:
+            print(f"   - {problem}")
+        if problems:
+            print(f"❌ {MANIFEST_NAME} is out of date")
+            return 1
+        print(f"✅ {MANIFEST_NAME} matches every published artifact")
+        return 0
+
+    with BuildRun('publish_artifacts', os.path.join(args.public_dir, 'data'), profile=args.profile) as run:
+        with run.stage('publish'):
+            stats = publish(args.public_dir, hardlink=args.hardlink)
+        run.count('files_read', stats['files'])
+        run.count('files_written', stats['published'])
+        run.count('bytes_written', stats['published_bytes'])
+        run.count('files_removed', stats['removed'])
+        run.metric('manifest_bytes', stats['manifest_bytes'])
+
+    unchanged = stats['files'] - stats['published']
+    print(f"Published {stats['files']} artifacts ({stats['bytes'] / 1e6:.1f} MB): "
+          f"{unchanged} unchanged kept their hash, {stats['published']} new "
+          f"({stats['published_bytes'] / 1e6:.1f} MB), {stats['removed']} old files removed")
+    print(f"{MANIFEST_NAME}: {stats['artifacts']} artifacts, {stats['families']} families, {stats['manifest_bytes'] / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
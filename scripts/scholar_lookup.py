@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Id-keyed scholar lookup artifact for resolving chain narrators.
+
+extract_enhanced_data.py writes public/data/scholar-lookup/ next to
+search-index.json:
+
+- index.json: header with shard size, row fields and the shards present
+- {n}.json: dense array of rows for scholar ids [n * SHARD_SIZE, (n + 1) * SHARD_SIZE),
+  null where no scholar has that id
+
+A row is [name, grade, reliability_grade, death_year], so resolving a
+narrator is one shard fetch (shared by every id in that range) and one array
+access instead of parsing and scanning all of search-index.json.
+
+Usage:
+    python scripts/scholar_lookup.py            # rebuild from search-index.json
+    python scripts/scholar_lookup.py --check    # parity check against search-index.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from artifact_io import atomic_write_bytes, atomic_write_json
+from build_metrics import BuildRun, add_profile_argument
+
+DATA_DIR = 'public/data'
+LOOKUP_DIR = os.path.join(DATA_DIR, 'scholar-lookup')
+SHARD_SIZE = 1024
+
+FIELDS = ['name', 'grade', 'reliability_grade', 'death_year']
+
+
+def write_scholar_lookup(search_index, output_dir=LOOKUP_DIR, shard_size=SHARD_SIZE):
+    """Write the sharded dense lookup for every search-index entry."""
+    shards = {}
+    for entry in search_index:
+        sid = int(entry['id'])
+        shard, slot = divmod(sid, shard_size)
+        rows = shards.setdefault(shard, [None] * shard_size)
+        rows[slot] = [entry.get(field, '') for field in FIELDS]
+
+    written = 0
+    for shard, rows in shards.items():
+        payload = json.dumps(rows, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        atomic_write_bytes(os.path.join(output_dir, f"{shard}.json"), payload)
+        written += len(payload)
+
+    header = {
+        "version": 1,
+        "shard_size": shard_size,
+        "fields": FIELDS,
+        "shards": sorted(shards),
+        "count": len(search_index),
+    }
+    atomic_write_json(os.path.join(output_dir, 'index.json'), header)
+    return {"shards": len(shards), "bytes": written}
+
+
+class ScholarLookup:
+    """Reader for the sharded lookup; shards are loaded on first access."""
+
+    def __init__(self, lookup_dir=LOOKUP_DIR):
+        self.lookup_dir = lookup_dir
+        with open(os.path.join(lookup_dir, 'index.json'), 'r', encoding='utf-8') as f:
+            self.header = json.load(f)
+        self.shard_size = self.header['shard_size']
+        self.present = set(self.header['shards'])
+        self.shards = {}
+
+    def _shard(self, shard):
+        if shard not in self.shards:
+            with open(os.path.join(self.lookup_dir, f"{shard}.json"), 'r', encoding='utf-8') as f:
+                self.shards[shard] = json.load(f)
+        return self.shards[shard]
+
+    def get(self, scholar_id):
+        """Return {"id", "name", "grade", ...} for scholar_id, or None."""
+        if not str(scholar_id).isdigit():
+            return None
+        shard, slot = divmod(int(scholar_id), self.shard_size)
+        if shard not in self.present:
+            return None
+        row = self._shard(shard)[slot]
+        if row is None:
+            return None
+        return {"id": str(scholar_id), **dict(zip(self.header['fields'], row))}
+
+    def ids(self):
+        """All scholar ids present in the lookup."""
+        for shard in sorted(self.present):
+            for slot, row in enumerate(self._shard(shard)):
+                if row is not None:
+                    yield str(shard * self.shard_size + slot)
+
+
+def check_parity(search_index, lookup):
+    """List of mismatches between search-index entries and the lookup (empty when in sync)."""
+    problems = []
+    expected = {}
+    for entry in search_index:
+        expected[entry['id']] = entry
+        row = lookup.get(entry['id'])
+        if row is None:
+            problems.append(f"{entry['id']}: missing from lookup")
+            continue
+        for field in FIELDS:
+            if row[field] != entry.get(field, ''):
+                problems.append(f"{entry['id']}: {field} {row[field]!r} != {entry.get(field, '')!r}")
+    for sid in lookup.ids():
+        if sid not in expected:
+            problems.append(f"{sid}: in lookup but not in search index")
+    if lookup.header['count'] != len(search_index):
+        problems.append(f"header count {lookup.header['count']} != {len(search_index)} search index entries")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or verify the id-keyed scholar lookup")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory containing search-index.json")
+    parser.add_argument("--check", action="store_true", help="Verify the lookup matches search-index.json")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(args.data_dir, 'search-index.json'), 'r', encoding='utf-8') as f:
+        search_index = json.load(f)
+    lookup_dir = os.path.join(args.data_dir, os.path.basename(LOOKUP_DIR))
+
+    if args.check:
+        problems = check_parity(search_index, ScholarLookup(lookup_dir))
+        for problem in problems[:20]:
+            print(f"   - {problem}")
+        if problems:
+            print(f"❌ {len(problems)} mismatches between {lookup_dir} and search-index.json")
+            return 1
+        print(f"✅ Scholar lookup matches search-index.json ({len(search_index)} scholars)")
+        return 0
+
+    with BuildRun('scholar_lookup', args.data_dir, profile=args.profile) as run:
+        with run.stage('write'):
+            stats = write_scholar_lookup(search_index, lookup_dir)
+            run.count('rows_read', len(search_index))
+            run.count('files_written', stats['shards'] + 1)
+            run.count('bytes_written', stats['bytes'])
+    print(f"Wrote {stats['shards']} shards ({stats['bytes'] / 1024:.0f} KB) to {lookup_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
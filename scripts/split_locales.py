@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Locale-partitioned variants of the scholar artifacts.
+
+The translation passes (update-translations*.js, then the ckb-locale
+migration) attach display objects keyed by locale to scholars, their
+relations and search-index entries:
+
+    "grade_display": {"en": "Companion (RA)", "ar": "...", "ckb": "..."}
+    "tags_display":  [{"en": "Ansar", "ar": "...", "ckb": "..."}, ...]
+
+so every page carries all three languages. This script splits them out:
+
+- scholars-core/{id}.json: the scholar with every localized object removed
+- locales/{locale}/scholars/{id}.json: overlay of [path, value] entries that
+  put back that locale's strings (only written when the scholar has any)
+- locales/{locale}/search-index.json: search index with each localized
+  object reduced to that locale
+
+Core + overlay yields the same shape the pages already read, with a single
+key per display object ({"ar": "..."}, English where the locale has no
+text), so `grade_display[locale]` keeps working. Only files whose bytes
+change are rewritten. The combined files stay in place for the rest of the
+build (convert_to_sqlite, migrations).
+
+Usage:
+    python scripts/split_locales.py            # write variants and print bytes per locale
+    python scripts/split_locales.py --check    # verify core + overlay == combined file per locale
+"""
+
+import argparse
+import copy
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from artifact_io import atomic_write_bytes, dump_json_bytes
+from build_metrics import BuildRun, add_profile_argument
+
+DATA_DIR = 'public/data'
+CORE_DIR = 'scholars-core'
+LOCALES_DIR = 'locales'
+
+# Locales served by i18n/routing.ts; display objects fall back to English
+LOCALES = ['en', 'ar', 'ckb']
+FALLBACK_LOCALE = 'en'
+
+
+def is_localized(value):
+    """True for display objects like {"en": ..., "ar": ..., "ckb": ...}."""
+    return (isinstance(value, dict) and bool(value) and set(value) <= set(LOCALES)
+            and all(text is None or isinstance(text, str) for text in value.values()))
+
+
+def is_localized_list(value):
+    """True for lists of display objects (tags_display, places_of_stay_display)."""
+    return isinstance(value, list) and bool(value) and all(is_localized(item) for item in value)
+
+
+def pick(value, locale):
+    """The text a locale shows for a display object (or list of them)."""
+    if isinstance(value, list):
+        return [pick(item, locale) for item in value]
+    return value.get(locale) or value.get(FALLBACK_LOCALE)
+
+
+def wrap(text, locale):
+    """Inverse of pick(): the single-locale display object the pages read."""
+    if isinstance(text, list):
+        return [{locale: item} for item in text]
+    return {locale: text}
+
+
+def split_localized(obj):
+    """(core, {locale: [[path, value], ...]}) for a parsed JSON document."""
+    overlays = {locale: [] for locale in LOCALES}
+
+    def walk(value, path):
+        if isinstance(value, dict):
+            core = {}
+            for key, item in value.items():
+                if is_localized(item) or is_localized_list(item):
+                    for locale in LOCALES:
+                        overlays[locale].append([path + [key], pick(item, locale)])
+                    continue
+                core[key] = walk(item, path + [key])
+            return core
+        if isinstance(value, list):
+            return [walk(item, path + [index]) for index, item in enumerate(value)]
+        return value
+
+    return walk(obj, []), overlays
+
+
+def localize(obj, locale):
+    """obj with every display object reduced to one locale."""
+    if isinstance(obj, dict):
+        return {key: wrap(pick(item, locale), locale) if is_localized(item) or is_localized_list(item)
+                else localize(item, locale) for key, item in obj.items()}
+    if isinstance(obj, list):
+        return [localize(item, locale) for item in obj]
+    return obj
+
+
+def apply_overlay(core, entries, locale):
+    """Core plus one locale's overlay (mirrors applyLocaleOverlay in lib/localizedData.ts)."""
+    merged = copy.deepcopy(core)
+    for path, text in entries:
+        target = merged
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = wrap(text, locale)
+    return merged
+
+
+def write_if_changed(path, payload):
+    """Atomically write payload unless the file already holds exactly these bytes."""
+    if os.path.exists(path) and os.path.getsize(path) == len(payload):
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+    atomic_write_bytes(path, payload)
+    return True
+
+
+def remove_if_exists(path):
+    if os.path.exists(path):
+        os.remove(path)
+        return True
+    return False
+
+
+def _split_scholar(args):
+    """Split one scholar file; returns (scholar id, sizes, files written)."""
+    path, data_dir = args
+    scholar_id = os.path.splitext(os.path.basename(path))[0]
+    with open(path, 'rb') as f:
+        raw = f.read()
+    core, overlays = split_localized(json.loads(raw))
+
+    core_bytes = dump_json_bytes(core)
+    written = write_if_changed(os.path.join(data_dir, CORE_DIR, f"{scholar_id}.json"), core_bytes)
+    sizes = {"combined": len(raw), "core": len(core_bytes)}
+    for locale, entries in overlays.items():
+        overlay_path = os.path.join(data_dir, LOCALES_DIR, locale, 'scholars', f"{scholar_id}.json")
+        if not entries:
+            remove_if_exists(overlay_path)
+            sizes[locale] = 0
+            continue
+        payload = dump_json_bytes(entries, indent=None)
+        written += write_if_changed(overlay_path, payload)
+        sizes[locale] = len(payload)
+    return scholar_id, sizes, written
+
+
+def split_scholars(data_dir=DATA_DIR, workers=None):
+    """Split every scholars/{id}.json; returns summed sizes and write counts."""
+    paths = sorted(glob.glob(os.path.join(data_dir, 'scholars', '*.json')))
+    totals = {"combined": 0, "core": 0, **{locale: 0 for locale in LOCALES}}
+    stats = {"scholars": len(paths), "files_written": 0, "files_removed": 0}
+    seen = set()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for scholar_id, sizes, written in pool.map(
+            _split_scholar, ((path, data_dir) for path in paths), chunksize=64
+        ):
+            seen.add(f"{scholar_id}.json")
+            stats["files_written"] += written
+            for key, size in sizes.items():
+                totals[key] += size
+
+    # Scholars dropped from the build would otherwise keep stale variants
+    stale_dirs = [os.path.join(data_dir, CORE_DIR)] + [
+        os.path.join(data_dir, LOCALES_DIR, locale, 'scholars') for locale in LOCALES
+    ]
+    for directory in stale_dirs:
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            if os.path.basename(path) not in seen:
+                stats["files_removed"] += remove_if_exists(path)
+    return totals, stats
+
+
+def split_search_index(data_dir=DATA_DIR):
+    """Write one search index per locale; returns {'combined': bytes, locale: bytes}."""
+    path = os.path.join(data_dir, 'search-index.json')
+    with open(path, 'rb') as f:
+        raw = f.read()
+    search_index = json.loads(raw)
+
+    sizes = {"combined": len(raw)}
+    for locale in LOCALES:
+        payload = dump_json_bytes(localize(search_index, locale))
+        write_if_changed(os.path.join(data_dir, LOCALES_DIR, locale, 'search-index.json'), payload)
+        sizes[locale] = len(payload)
+    return sizes
+
+
+def check(data_dir=DATA_DIR, limit=20):
+    """List of mismatches between the combined files and their locale variants."""
+    problems = []
+    for path in sorted(glob.glob(os.path.join(data_dir, 'scholars', '*.json'))):
+        name = os.path.basename(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            combined = json.load(f)
+        core_path = os.path.join(data_dir, CORE_DIR, name)
+        if not os.path.exists(core_path):
+            problems.append(f"{CORE_DIR}/{name}: missing")
+            continue
+        with open(core_path, 'r', encoding='utf-8') as f:
+            core = json.load(f)
+        for locale in LOCALES:
+            overlay_path = os.path.join(data_dir, LOCALES_DIR, locale, 'scholars', name)
+            entries = []
+            if os.path.exists(overlay_path):
+                with open(overlay_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            if apply_overlay(core, entries, locale) != localize(combined, locale):
+                problems.append(f"scholars/{name}: {locale} overlay does not match")
+        if len(problems) >= limit:
+            return problems
+
+    with open(os.path.join(data_dir, 'search-index.json'), 'r', encoding='utf-8') as f:
+        search_index = json.load(f)
+    for locale in LOCALES:
+        locale_path = os.path.join(data_dir, LOCALES_DIR, locale, 'search-index.json')
+        if not os.path.exists(locale_path):
+            problems.append(f"{LOCALES_DIR}/{locale}/search-index.json: missing")
+            continue
+        with open(locale_path, 'r', encoding='utf-8') as f:
+            if json.load(f) != localize(search_index, locale):
+                problems.append(f"{LOCALES_DIR}/{locale}/search-index.json does not match")
+    return problems
+
+
+def print_comparison(scholar_totals, scholar_count, index_sizes):
+    """Bytes a visitor of each locale loads, against today's combined files."""
+    def kb(size):
+        return f"{size / 1024:,.0f} KB"
+
+    per_page = scholar_totals['combined'] / max(scholar_count, 1)
+    print("\nBytes per locale (combined -> locale variant):")
+    print(f"   {'locale':<8}{'search-index.json':>36}{'avg scholar page':>34}")
+    for locale in LOCALES:
+        index_saved = 1 - index_sizes[locale] / max(index_sizes['combined'], 1)
+        page = (scholar_totals['core'] + scholar_totals[locale]) / max(scholar_count, 1)
+        page_saved = 1 - page / max(per_page, 1)
+        print(f"   {locale:<8}{kb(index_sizes['combined']):>12} -> {kb(index_sizes[locale]):>10} ({index_saved:6.1%})"
+              f"{per_page:>10,.0f} B -> {page:>7,.0f} B ({page_saved:6.1%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write locale-partitioned scholar artifacts")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory with the built data artifacts")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--check", action="store_true", help="Verify the variants match the combined files")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = check(args.data_dir)
+        for problem in problems:
+            print(f"   - {problem}")
+        if problems:
+            print(f"❌ Locale variants are out of sync with {args.data_dir}")
+            return 1
+        print(f"✅ Locale variants match the combined files for {', '.join(LOCALES)}")
+        return 0
+
+    with BuildRun('split_locales', args.data_dir, profile=args.profile) as run:
+        with run.stage('scholars'):
+            scholar_totals, stats = split_scholars(args.data_dir, args.workers)
+            run.count('rows_read', stats['scholars'])
+            run.count('files_written', stats['files_written'])
+            run.count('files_removed', stats['files_removed'])
+        with run.stage('search_index'):
+            index_sizes = split_search_index(args.data_dir)
+        for locale in LOCALES:
+            run.metric(f"{locale}_search_index_bytes", index_sizes[locale])
+            run.metric(f"{locale}_overlay_bytes", scholar_totals[locale])
+        run.metric('combined_search_index_bytes', index_sizes['combined'])
+        run.metric('combined_scholar_bytes', scholar_totals['combined'])
+        run.metric('core_scholar_bytes', scholar_totals['core'])
+
+    print(f"Split {stats['scholars']} scholars ({stats['files_written']} files written, "
+          f"{stats['files_removed']} stale removed)")
+    print_comparison(scholar_totals, stats['scholars'], index_sizes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Shared Arabic/English text normalization for the build scripts.
+
+Matching keys, search folding, slugs and CSV field cleanup used to be copied
+into each script, each copy recompiling its patterns or making several regex
+passes per string. Here every character-level step is one precompiled
+str.translate table (diacritic deletion, letter folding, presentation-form
+deletion) and the rest is at most one precompiled regex pass:
+
+- normalize_arabic / normalize_english: whitespace- and punctuation-free keys
+  for matching hadith text across sources (map_usc_msa_refs.py,
+  fill_missing_english.py); normalize_arabic(text, fold=True) additionally
+  folds alef, hamza-carrier and alef maqsura variants
+- normalize_search: the search tokenizer's folding (hadith_search.py,
+  mirrored by lib/hadithSearch.ts)
+- collapse_whitespace, clean_field, clean_name, slugify
+
+normalize_batch(values, normalizer) runs one normalizer over a list or pandas
+Series. Values are joined with a private-use separator, BATCH_SIZE at a time,
+and the character-level steps run as numpy lookups over the code points of
+the whole batch instead of one regex match per diacritic: fully vowelled
+matn alternates letters and marks, so per-value regex and translate calls
+spend their time on millions of one-character deletions. Outputs are
+identical to calling the normalizer on each value.
+
+benchmark_text_normalize.py checks every normalizer against the functions it
+replaced and reports throughput.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+
+def _chars(*ranges):
+    return ''.join(chr(code) for low, high in ranges for code in range(low, high + 1))
+
+
+# Harakat, tanween, shadda, sukun and the small Quranic marks above them
+TASHKEEL = _chars((0x0617, 0x061a), (0x064b, 0x0652))
+# Everything the search tokenizer drops: all Arabic combining marks, superscript alef and tatweel
+ARABIC_MARKS = _chars((0x0610, 0x061a), (0x064b, 0x065f), (0x0670, 0x0670), (0x06d6, 0x06ed), (0x0640, 0x0640))
+# Arabic presentation forms, including ligatures such as U+FDFA (salla allahu alayhi wa sallam)
+PRESENTATION_FORMS = _chars((0xfb50, 0xfdff), (0xfe70, 0xfeff))
+
+ALEF_FOLD = {'\u0623': '\u0627', '\u0625': '\u0627', '\u0622': '\u0627', '\u0671': '\u0627'}
+HAMZA_FOLD = {'\u0624': '\u0648', '\u0626': '\u064a'}
+YAA_FOLD = {'\u0649': '\u064a'}
+TAA_MARBUTA_FOLD = {'\u0629': '\u0647'}
+
+
+@lru_cache(maxsize=None)
+def fold_table(delete='', alef=False, hamza=False, yaa=False, taa_marbuta=False):
+    """str.translate table deleting `delete` and folding the chosen letter variants."""
+    mapping = dict.fromkeys(delete)
+    for enabled, fold in ((alef, ALEF_FOLD), (hamza, HAMZA_FOLD), (yaa, YAA_FOLD), (taa_marbuta, TAA_MARBUTA_FOLD)):
+        if enabled:
+            mapping.update(fold)
+    return str.maketrans(mapping)
+
+
+TASHKEEL_TABLE = fold_table(TASHKEEL)
+MATCH_FOLD_TABLE = fold_table(alef=True, hamza=True, yaa=True)
+SEARCH_TABLE = fold_table(ARABIC_MARKS, alef=True, yaa=True, taa_marbuta=True)
+_PRESENTATION_TABLE = fold_table(PRESENTATION_FORMS)
+
+# Joins batches; values containing it fall back to per-value calls
+SEPARATOR = '\ue000'
+BATCH_SIZE = 4096
+UNICODE_SIZE = 0x110000
+
+_TAG = re.compile(r'<[^>]+>')
+_NON_WORD = re.compile(r'\W+')
+# Tags first, then every other non-word run; a lone '<' is only dropped once
+# it cannot open a tag, so this one pass equals stripping tags, then \W
+_TAG_OR_NON_WORD = re.compile(r'<[^>]+>|[^\w<]+|<')
+_PARENTHESIZED = re.compile(r'\([^)]*\)')
+_SLUG_DROP = re.compile(r'[^\w\s-]')
+_SLUG_SEPARATORS = re.compile(r'[-\s]+')
+
+# Tags in SEPARATOR-joined batches never span two values
+_BATCH_TAG = re.compile(f'<[^>{SEPARATOR}]+>')
+
+
+def remove_tashkeel(text: str) -> str:
+    """Drop Arabic diacritics (harakat, tanween, shadda, sukun)."""
+    return text.translate(TASHKEEL_TABLE)
+
+
+def normalize_arabic(text, fold: bool = False) -> str:
+    """
+    Matching key for Arabic text: HTML tags, diacritics, whitespace and
+    punctuation removed. fold=True also maps alef, hamza-carrier and alef
+    maqsura variants to their base letters. Non-strings give "".
+    """
+    if not isinstance(text, str):
+        return ""
+    key = _TAG_OR_NON_WORD.sub('', text)
+    return key.translate(MATCH_FOLD_TABLE) if fold else key
+
+
+def normalize_english(text) -> str:
+    """
+    Matching key for English text: HTML tags and Arabic presentation forms
+    removed, Apostle read as Messenger, lowercased, only word characters kept.
+    Non-strings give "".
+    """
+    if not isinstance(text, str):
+        return ""
+    text = _TAG.sub('', text).translate(_PRESENTATION_TABLE)
+    text = text.replace('Apostle', 'Messenger').replace('apostle', 'messenger')
+    return _NON_WORD.sub('', text.lower())
+
+
+def normalize_search(text) -> str:
+    """Fold diacritics, letter variants and case the way the search client does."""
+    return (text or '').translate(SEARCH_TABLE).lower()
+
+
+def collapse_whitespace(text) -> str:
+    """Runs of whitespace (newlines, tabs) to single spaces, trimmed; non-strings give ""."""
+    if not isinstance(text, str):
+        return ""
+    return ' '.join(text.split())
+
+
+def clean_field(value) -> str:
+    """A CSV cell as trimmed text; missing values (None, NaN) give ""."""
+    if value is None or value != value:
+        return ""
+    return str(value).strip()
+
+
+def clean_name(name) -> str:
+    """Narrator name without parenthesized parts (Arabic script, honorifics)."""
+    return ' '.join(_PARENTHESIZED.sub('', str(name)).split())
+
+
+def slugify(text) -> str:
+    """Lowercase, punctuation dropped, whitespace and hyphen runs as single hyphens."""
+    text = _SLUG_DROP.sub('', str(text).lower())
+    return _SLUG_SEPARATORS.sub('-', text).strip('-')
+
+
+@lru_cache(maxsize=None)
+def _word_mask():
+    """Python's \\w (str.isalnum() or '_') for every code point, with SEPARATOR kept too."""
+    mask = np.fromiter((chr(code).isalnum() for code in range(UNICODE_SIZE)), dtype=bool, count=UNICODE_SIZE)
+    mask[[ord('_'), ord(SEPARATOR)]] = True
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _codepoint_table(delete='', alef=False, hamza=False, yaa=False, taa_marbuta=False):
+    """fold_table() as arrays: (mask of deleted code points, code point map)."""
+    deleted = np.zeros(UNICODE_SIZE, dtype=bool)
+    mapped = np.arange(UNICODE_SIZE, dtype=np.uint32)
+    for code, target in fold_table(delete, alef, hamza, yaa, taa_marbuta).items():
+        if target is None:
+            deleted[code] = True
+        else:
+            mapped[code] = ord(target)
+    return deleted, mapped
+
+
+def _codepoints(text):
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+
+def _text(codes):
+    return codes.tobytes().decode('utf-32-le', 'surrogatepass')
+
+
+def _word_characters(codes):
+    return codes[_word_mask()[codes]]
+
+
+def _batch_arabic(joined, fold=False):
+    if '<' in joined:
+        joined = _BATCH_TAG.sub('', joined)
+    codes = _word_characters(_codepoints(joined))
+    if fold:
+        codes = _codepoint_table(alef=True, hamza=True, yaa=True)[1][codes]
+    return _text(codes)
+
+
+def _batch_english(joined):
+    if '<' in joined:
+        joined = _BATCH_TAG.sub('', joined)
+    codes = _codepoints(joined)
+    text = _text(codes[~_codepoint_table(PRESENTATION_FORMS)[0][codes]])
+    text = text.replace('Apostle', 'Messenger').replace('apostle', 'messenger')
+    return _text(_word_characters(_codepoints(text.lower())))
+
+
+def _batch_search(joined):
+    deleted, mapped = _codepoint_table(ARABIC_MARKS, alef=True, yaa=True, taa_marbuta=True)
+    codes = _codepoints(joined)
+    return _text(mapped[codes[~deleted[codes]]]).lower()
+
+
+# Normalizers with a whole-batch form; each maps non-strings to ""
+_BATCHED = {
+    normalize_arabic: _batch_arabic,
+    normalize_english: _batch_english,
+    normalize_search: _batch_search,
+}
+
+
+def normalize_batch(values, normalizer, **options):
+    """
+    normalizer(value, **options) for every value of a list or pandas Series,
+    returned as the same kind of sequence (a Series keeps its index and name).
+    """
+    values_list = values.tolist() if hasattr(values, 'tolist') else list(values)
+    batch = _BATCHED.get(normalizer)
+    if batch is None:
+        result = [normalizer(value, **options) for value in values_list]
+    else:
+        result = []
+        for start in range(0, len(values_list), BATCH_SIZE):
+            chunk = [value if isinstance(value, str) else '' for value in values_list[start:start + BATCH_SIZE]]
+            joined = SEPARATOR.join(chunk)
+            if joined.count(SEPARATOR) == len(chunk) - 1:
+                result.extend(batch(joined, **options).split(SEPARATOR))
+            else:
+                result.extend(normalizer(value, **options) for value in chunk)
+    if hasattr(values, 'index') and hasattr(values, 'name'):
+        return type(values)(result, index=values.index, name=values.name, dtype=object)
+    return result
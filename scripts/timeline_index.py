@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Lifespan interval index for "narrators alive in year X" queries.
+
+Every narrator with a usable Hijri birth or death year gets one closed
+interval [start, end]. A missing end is filled in TYPICAL_LIFESPAN years
+from the other one (and flagged as estimated); spans over MAX_LIFESPAN or
+ending before they start are bad data and left out.
+
+The intervals are stored as arrays sorted by start, plus every end sorted on
+its own. Because no interval is longer than max_span, the narrators alive in
+year Y all start inside [Y - max_span, Y]: two binary searches find that
+window and only its rows are compared against Y, instead of every narrator.
+Counting needs no scan at all,
+
+    alive(Y) = #(start <= Y) - #(end < Y)
+
+Overlapping lifespans use the same window, widened to the other narrator's
+interval. Teacher/student pairs (extract_enhanced_data.get_learning_pairs)
+are classified against the index once at build time: plausible when the two
+lifespans share at least MIN_SHARED_YEARS, implausible when they do not,
+unknown when either one is missing or has an estimated end (a verdict on a
+guessed year would be stored as fact). isnad_analytics.py judges chain links
+with the same rule.
+
+Everything is written little-endian into one binary file described by a
+JSON header, like the isnad graph. convert_to_sqlite.py loads the same
+intervals into the indexed scholar_lifespans table and the pair verdicts
+into scholar_relationships.contemporary.
+
+Usage:
+    python scripts/timeline_index.py
+    python scripts/timeline_index.py --year 150      # narrators alive in 150 AH
+    python scripts/timeline_index.py --scholar 11    # narrators whose lifespan overlaps scholar 11
+    python scripts/timeline_index.py --check         # index queries vs. a full scan
+    python scripts/timeline_index.py --benchmark     # query latency, index vs. full scan
+    python scripts/timeline_index.py --benchmark --scale 4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from artifact_io import atomic_write_bytes, atomic_write_json
+from biography_parser import parse_biography
+from build_metrics import BuildRun, add_profile_argument
+from extract_enhanced_data import DATA_DIR, OUTPUT_DIR, get_learning_pairs, load_scholars
+
+TIMELINE_DIR = os.path.join(OUTPUT_DIR, 'timeline')
+TIMELINE_BIN = 'lifespans.bin'
+TIMELINE_HEADER = 'lifespans.json'
+
+# Years filled in for a missing birth or death
+TYPICAL_LIFESPAN = 70
+# Longer recorded spans are treated as bad data
+MAX_LIFESPAN = 120
+# Years two lifespans must share for a teacher/student pair to be plausible
+MIN_SHARED_YEARS = 5
+
+# Interval flags
+ESTIMATED_BIRTH = 1
+ESTIMATED_DEATH = 2
+
+# Teacher/student pair status codes
+IMPLAUSIBLE, PLAUSIBLE, UNKNOWN = 0, 1, 2
+PAIR_STATUSES = ['implausible', 'plausible', 'unknown']
+
+
+def lifespan(birth_year, death_year):
+    """(start, end, flags) for Hijri birth/death years (None when missing), or None."""
+    if birth_year is None and death_year is None:
+        return None
+    if birth_year is None:
+        return death_year - TYPICAL_LIFESPAN, death_year, ESTIMATED_BIRTH
+    if death_year is None:
+        return birth_year, birth_year + TYPICAL_LIFESPAN, ESTIMATED_DEATH
+    if not 0 <= death_year - birth_year <= MAX_LIFESPAN:
+        return None
+    return birth_year, death_year, 0
+
+
+def shared_years(a, b):
+    """Years two (start, end, ...) intervals have in common; negative when they are apart."""
+    return min(a[1], b[1]) - max(a[0], b[0])
+
+
+def pair_status(learner, teacher, min_shared=MIN_SHARED_YEARS):
+    """Status code for a learner/teacher pair of lifespan() results; UNKNOWN unless both are recorded."""
+    if learner is None or teacher is None or learner[2] or teacher[2]:
+        return UNKNOWN
+    return PLAUSIBLE if shared_years(learner, teacher) >= min_shared else IMPLAUSIBLE
+
+
+class LifespanIndex:
+    """Lifespans sorted by start year, with binary-searched alive/overlap queries."""
+
+    def __init__(self, ids, starts, ends, flags, ends_sorted, max_span,
+                 pair_learners=None, pair_teachers=None, pair_statuses=None):
+        self.ids = ids
+        self.starts = starts
+        self.ends = ends
+        self.flags = flags
+        self.ends_sorted = ends_sorted
+        self.max_span = int(max_span)
+        self.pair_keys = None
+        if pair_learners is not None:
+            self.pair_learners, self.pair_teachers = pair_learners, pair_teachers
+            self.pair_statuses = pair_statuses
+            self.pair_keys = _pair_keys(pair_learners, pair_teachers)
+        self._positions = None
+
+    @property
+    def num_scholars(self):
+        return int(self.ids.size)
+
+    @property
+    def num_pairs(self):
+        return 0 if self.pair_keys is None else int(self.pair_keys.size)
+
+    @classmethod
+    def from_scholars(cls, scholars):
+        """Index every scholar row with a usable lifespan, and classify their learning pairs."""
+        spans = {}
+        for scholar_id, person in scholars.items():
+            biography = parse_biography(person)
+            span = lifespan(biography['birth']['year_hijri'], biography['death']['year_hijri'])
+            if span is not None:
+                spans[int(scholar_id)] = span
+        ids = np.fromiter(spans, dtype=np.int32, count=len(spans))
+        values = np.array(list(spans.values()), dtype=np.int32).reshape(-1, 3)
+        order = np.lexsort((ids, values[:, 0]))
+        ids, values = ids[order], values[order]
+        starts, ends = values[:, 0], values[:, 1]
+        max_span = int((ends - starts).max()) if len(ids) else 0
+        index = cls(ids, starts, ends, values[:, 2].astype(np.uint8), np.sort(ends), max_span)
+
+        pairs = np.array(sorted({(int(learner), int(teacher)) for learner, teacher in get_learning_pairs(scholars)}),
+                         dtype=np.int32).reshape(-1, 2)
+        statuses = index.pair_statuses_for(pairs[:, 0], pairs[:, 1])
+        return cls(ids, starts, ends, index.flags, index.ends_sorted, max_span,
+                   pairs[:, 0].copy(), pairs[:, 1].copy(), statuses)
+
+    def position(self, scholar_id):
+        """Row of a scholar in the start-sorted arrays, or None."""
+        if self._positions is None:
+            self._positions = {scholar_id: row for row, scholar_id in enumerate(self.ids.tolist())}
+        return self._positions.get(int(scholar_id))
+
+    def span(self, scholar_id):
+        """(start, end, flags) for one scholar, or None."""
+        row = self.position(scholar_id)
+        if row is None:
+            return None
+        return int(self.starts[row]), int(self.ends[row]), int(self.flags[row])
+
+    def _window(self, low, high):
+        """Rows whose start lies in [low, high]."""
+        # int32 keys: a Python int would make searchsorted copy the whole array to int64
+        return (int(np.searchsorted(self.starts, np.int32(low), side='left')),
+                int(np.searchsorted(self.starts, np.int32(high), side='right')))
+
+    def count_alive(self, year):
+        return int(np.searchsorted(self.starts, np.int32(year), side='right')
+                   - np.searchsorted(self.ends_sorted, np.int32(year), side='left'))
+
+    def alive_in(self, year):
+        """Ids of the scholars alive in a Hijri year, by start year."""
+        first, last = self._window(year - self.max_span, year)
+        rows = first + np.flatnonzero(self.ends[first:last] >= year)
+        return self.ids[rows]
+
+    def overlapping(self, scholar_id, min_shared=0):
+        """Ids of the other scholars sharing at least min_shared years with one scholar's lifespan."""
+        span = self.span(scholar_id)
+        if span is None:
+            return self.ids[:0]
+        start, end, _ = span
+        first, last = self._window(start - self.max_span, end - min_shared)
+        if min_shared:
+            shared = np.minimum(self.ends[first:last], end) - np.maximum(self.starts[first:last], start)
+            rows = first + np.flatnonzero(shared >= min_shared)
+        else:
+            rows = first + np.flatnonzero(self.ends[first:last] >= start)
+        return self.ids[rows[self.ids[rows] != scholar_id]]
+
+    def pair_statuses_for(self, learners, teachers, min_shared=MIN_SHARED_YEARS):
+        """Vectorized pair_status() over id arrays."""
+        positions = self._positions_of(learners), self._positions_of(teachers)
+        known = (positions[0] >= 0) & (positions[1] >= 0)
+        known[known] = (self.flags[positions[0][known]] == 0) & (self.flags[positions[1][known]] == 0)
+        learner_rows, teacher_rows = positions[0][known], positions[1][known]
+        shared = (np.minimum(self.ends[learner_rows], self.ends[teacher_rows])
+                  - np.maximum(self.starts[learner_rows], self.starts[teacher_rows]))
+        statuses = np.full(len(learners), UNKNOWN, dtype=np.uint8)
+        statuses[known] = np.where(shared >= min_shared, PLAUSIBLE, IMPLAUSIBLE)
+        return statuses
+
+    def _positions_of(self, scholar_ids):
+        """Rows for an id array, -1 where a scholar has no lifespan."""
+        if not self.num_scholars:
+            return np.full(len(scholar_ids), -1, dtype=np.int64)
+        by_id = np.argsort(self.ids, kind='stable')
+        sorted_ids = self.ids[by_id]
+        slots = np.searchsorted(sorted_ids, scholar_ids).clip(max=len(sorted_ids) - 1)
+        return np.where(sorted_ids[slots] == scholar_ids, by_id[slots], -1)
+
+    def learning_pair_status(self, learner_id, teacher_id):
+        """Precomputed status of a (learner, teacher) pair from the narrator data, or None."""
+        if self.pair_keys is None:
+            return None
+        key = (int(learner_id) << 32) | int(teacher_id)
+        slot = int(np.searchsorted(self.pair_keys, np.int64(key)))
+        if slot < len(self.pair_keys) and self.pair_keys[slot] == key:
+            return int(self.pair_statuses[slot])
+        return None
+
+    def save(self, output_dir=TIMELINE_DIR):
+        """Write the binary arrays plus a JSON header describing their layout."""
+        arrays = [
+            ('ids', self.ids.astype('<i4')),
+            ('starts', self.starts.astype('<i4')),
+            ('ends', self.ends.astype('<i4')),
+            ('ends_sorted', self.ends_sorted.astype('<i4')),
+            ('pair_learners', self.pair_learners.astype('<i4')),
+            ('pair_teachers', self.pair_teachers.astype('<i4')),
+            # uint8 last so every int32 array stays 4-byte aligned
+            ('flags', self.flags.astype('u1')),
+            ('pair_statuses', self.pair_statuses.astype('u1')),
+        ]
+
+        layout, chunks, offset = {}, [], 0
+        for name, arr in arrays:
+            layout[name] = {"dtype": arr.dtype.str, "offset": offset, "length": int(arr.size)}
+            chunks.append(arr.tobytes())
+            offset += arr.nbytes
+
+        header = {
+            "version": 1,
+            "calendar": "hijri",
+            "num_scholars": self.num_scholars,
+            "num_pairs": self.num_pairs,
+            "max_span": self.max_span,
+            "typical_lifespan": TYPICAL_LIFESPAN,
+            "min_shared_years": MIN_SHARED_YEARS,
+            "flags": {"estimated_birth": ESTIMATED_BIRTH, "estimated_death": ESTIMATED_DEATH},
+            "pair_statuses": PAIR_STATUSES,
+            "file": TIMELINE_BIN,
+            "arrays": layout,
+        }
+        os.makedirs(output_dir, exist_ok=True)
+        atomic_write_bytes(os.path.join(output_dir, TIMELINE_BIN), b''.join(chunks))
+        atomic_write_json(os.path.join(output_dir, TIMELINE_HEADER), header)
+        return header
+
+    @classmethod
+    def load(cls, output_dir=TIMELINE_DIR):
+        with open(os.path.join(output_dir, TIMELINE_HEADER), 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        with open(os.path.join(output_dir, header["file"]), 'rb') as f:
+            blob = f.read()
+
+        def array(name):
+            spec = header["arrays"][name]
+            return np.frombuffer(blob, dtype=spec["dtype"], count=spec["length"], offset=spec["offset"])
+
+        return cls(array('ids'), array('starts'), array('ends'), array('flags'), array('ends_sorted'),
+                   header["max_span"], array('pair_learners'), array('pair_teachers'), array('pair_statuses'))
+
+
+def _pair_keys(learners, teachers):
+    return (learners.astype(np.int64) << 32) | teachers.astype(np.int64)
+
+
+def scan_alive(index, year):
+    """Reference: every interval compared against the year."""
+    return index.ids[(index.starts <= year) & (index.ends >= year)]
+
+
+def scan_overlapping(index, scholar_id, min_shared=0):
+    """Reference: every interval compared against one scholar's."""
+    span = index.span(scholar_id)
+    if span is None:
+        return index.ids[:0]
+    shared = np.minimum(index.ends, span[1]) - np.maximum(index.starts, span[0])
+    return index.ids[(shared >= min_shared) & (index.ids != scholar_id)]
+
+
+def sample_years(index, samples, seed=0):
+    rng = random.Random(seed)
+    if not index.num_scholars:
+        return []
+    low, high = int(index.starts.min()) - 5, int(index.ends.max()) + 5
+    return [rng.randint(low, high) for _ in range(samples)]
+
+
+def check(index, samples=500, seed=0):
+    """Alive/overlap queries and pair statuses against full scans; returns problem descriptions."""
+    problems = []
+    for year in sample_years(index, samples, seed):
+        expected = set(scan_alive(index, year).tolist())
+        if set(index.alive_in(year).tolist()) != expected:
+            problems.append(f"alive in {year}: index differs from a full scan")
+        if index.count_alive(year) != len(expected):
+            problems.append(f"alive in {year}: count {index.count_alive(year)} != {len(expected)}")
+    ids = index.ids.tolist()
+    rng = random.Random(seed)
+    for scholar_id in rng.sample(ids, min(samples, len(ids))):
+        for min_shared in (0, MIN_SHARED_YEARS):
+            if set(index.overlapping(scholar_id, min_shared).tolist()) != \
+                    set(scan_overlapping(index, scholar_id, min_shared).tolist()):
+                problems.append(f"overlapping {scholar_id} (>= {min_shared} years): index differs from a full scan")
+    for learner, teacher, status in zip(index.pair_learners.tolist(), index.pair_teachers.tolist(),
+                                        index.pair_statuses.tolist()):
+        expected = pair_status(index.span(learner), index.span(teacher))
+        if status != expected:
+            problems.append(f"pair {learner} <- {teacher}: {PAIR_STATUSES[status]} != {PAIR_STATUSES[expected]}")
+    return problems
+
+
+def scaled(index, scale):
+    """
+    The index `scale` times over, each copy shifted past the previous one's
+    years: the synthetic corpora cover about four centuries, the real one
+    fourteen, and the scan cost grows with the range while the window does not.
+    """
+    if scale == 1 or not index.num_scholars:
+        return index
+    low, high = int(index.starts.min()), int(index.ends.max())
+    shifts = np.repeat(np.arange(scale, dtype=np.int32) * (high - low + 1), index.num_scholars)
+    ids = np.arange(index.num_scholars * scale, dtype=np.int32)
+    ends = np.tile(index.ends, scale) + shifts
+    return LifespanIndex(ids, np.tile(index.starts, scale) + shifts, ends,
+                         np.tile(index.flags, scale), np.sort(ends), index.max_span)
+
+
+def _percentiles(timings):
+    timings = sorted(timings)
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+
+def benchmark(index, samples=2000, seed=0):
+    """Alive-in-year / overlap latency, index vs. full scan."""
+    years = sample_years(index, samples, seed)
+    scholar_ids = random.Random(seed).choices(index.ids.tolist(), k=samples)
+    queries = [
+        ('alive in year', years, index.alive_in, lambda year: scan_alive(index, year)),
+        ('alive count', years, index.count_alive, lambda year: scan_alive(index, year).size),
+        ('overlapping', scholar_ids, index.overlapping, lambda scholar_id: scan_overlapping(index, scholar_id)),
+    ]
+    print(f"Timeline queries over {index.num_scholars} lifespans (max span {index.max_span} years, "
+          f"{samples} samples):")
+    for label, arguments, indexed, scan in queries:
+        results = {}
+        for name, query in (('index', indexed), ('scan', scan)):
+            timings = []
+            for argument in arguments:
+                start = time.perf_counter()
+                query(argument)
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = _percentiles(timings)
+        print(f"   - {label:<14} index p50 {results['index'][0]:.4f} ms / p99 {results['index'][1]:.4f} ms, "
+              f"scan p50 {results['scan'][0]:.4f} ms / p99 {results['scan'][1]:.4f} ms "
+              f"({results['scan'][0] / max(results['index'][0], 1e-9):.1f}x)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the narrator lifespan interval index")
+    parser.add_argument("--scholars-csv", default=os.path.join(DATA_DIR, 'all_rawis.csv'))
+    parser.add_argument("--output-dir", default=TIMELINE_DIR)
+    parser.add_argument("--year", type=int, help="List the narrators alive in this Hijri year")
+    parser.add_argument("--scholar", type=int, help="List the narrators whose lifespan overlaps this scholar's")
+    parser.add_argument("--check", action="store_true", help="Compare index queries with full scans")
+    parser.add_argument("--benchmark", action="store_true", help="Time index queries against full scans")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Benchmark over this many copies of the lifespans, laid end to end in time")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+
+    if args.year is not None or args.scholar is not None:
+        index = LifespanIndex.load(args.output_dir)
+        if args.year is not None:
+            alive = index.alive_in(args.year)
+            print(f"📊 {alive.size} narrators alive in {args.year} AH")
+            print(' '.join(str(scholar_id) for scholar_id in sorted(alive.tolist())[:200]))
+        if args.scholar is not None:
+            span = index.span(args.scholar)
+            if span is None:
+                print(f"❌ No lifespan for scholar {args.scholar}")
+                return 1
+            overlapping = index.overlapping(args.scholar)
+            print(f"📊 {overlapping.size} narrators overlap scholar {args.scholar} ({span[0]}-{span[1]} AH)")
+            print(' '.join(str(scholar_id) for scholar_id in sorted(overlapping.tolist())[:200]))
+        return 0
+
+    with BuildRun('timeline_index', args.output_dir, profile=args.profile) as run:
+        with run.stage('load_scholars'):
+            print("📚 Loading Scholars Database...")
+            scholars = load_scholars(args.scholars_csv)
+            run.count('rows_read', len(scholars))
+
+        print("📅 Building lifespan index...")
+        start = time.perf_counter()
+        with run.stage('build_index'):
+            index = LifespanIndex.from_scholars(scholars)
+            run.count('lifespans', index.num_scholars)
+            run.count('learning_pairs', index.num_pairs)
+        with run.stage('write'):
+            header = index.save(args.output_dir)
+            run.count('files_written', 2)
+            run.count('bytes_written', os.path.getsize(os.path.join(args.output_dir, TIMELINE_BIN)))
+        elapsed = time.perf_counter() - start
+
+    statuses = np.bincount(index.pair_statuses, minlength=len(PAIR_STATUSES))
+    estimated = int(np.count_nonzero(index.flags))
+    print(f"\n✅ Timeline Index Complete!")
+    print(f"   - Lifespans: {header['num_scholars']} of {len(scholars)} narrators "
+          f"({estimated} with an estimated birth or death), max span {header['max_span']} years")
+    print(f"   - Teacher/student pairs: {header['num_pairs']} "
+          f"({', '.join(f'{count} {name}' for name, count in zip(PAIR_STATUSES, statuses.tolist()))})")
+    print(f"   - Built in {elapsed:.2f}s")
+    print(f"   - Location: {args.output_dir}")
+
+    if args.check:
+        problems = check(index)
+        for problem in problems[:20]:
+            print(f"   - {problem}")
+        if problems:
+            print(f"❌ {len(problems)} timeline queries differ from a full scan")
+            return 1
+        print("✅ Index queries and pair statuses match a full scan")
+    if args.benchmark:
+        benchmark(scaled(index, args.scale))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())